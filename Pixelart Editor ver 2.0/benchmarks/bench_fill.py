@@ -0,0 +1,116 @@
+# ========================================
+# benchmarks/bench_fill.py
+# ========================================
+"""
+Сравнение заливки: прежний алгоритм (стек соседей + множество
+посещенных) и построчная заливка tools.flood_fill
+
+Запуск: python benchmarks/bench_fill.py [размер ...]
+"""
+
+import os
+import sys
+import time
+from typing import Callable, Set, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Grid
+from tools.flood_fill import scanline_fill, np
+
+
+FILL_COLOR = (255, 0, 0)
+
+
+def legacy_flood_fill(grid, start_x: int, start_y: int, fill_color: Tuple[int, int, int]):
+    """Прежняя реализация FillTool._flood_fill_iterative (для сравнения)"""
+    target_color = grid.get_cell_color(start_x, start_y)
+    if not target_color or target_color == fill_color:
+        return
+    
+    stack = [(start_x, start_y)]
+    visited: Set[Tuple[int, int]] = set()
+    
+    while stack:
+        x, y = stack.pop()
+        
+        if (x, y) in visited:
+            continue
+        if not grid.is_valid_position(x, y):
+            continue
+        if grid.get_cell_color(x, y) != target_color:
+            continue
+        
+        grid.set_cell_color(x, y, fill_color)
+        visited.add((x, y))
+        
+        stack.append((x + 1, y))
+        stack.append((x - 1, y))
+        stack.append((x, y + 1))
+        stack.append((x, y - 1))
+
+
+def make_empty(size: int) -> Grid:
+    """Пустой холст - заливка всего фона"""
+    return Grid(size, size, 1)
+
+
+def make_maze(size: int) -> Grid:
+    """Змейка из стен - длинная извилистая область"""
+    grid = Grid(size, size, 1)
+    wall = (0, 0, 0)
+    for y in range(1, size, 2):
+        gap = size - 1 if (y // 2) % 2 == 0 else 0
+        for x in range(size):
+            if x != gap:
+                grid.set_cell_color(x, y, wall)
+    return grid
+
+
+def make_noise(size: int) -> Grid:
+    """Редкие точки - много коротких участков"""
+    grid = Grid(size, size, 1)
+    for y in range(size):
+        for x in range((y * 7) % 13, size, 13):
+            grid.set_cell_color(x, y, (0, 0, 255))
+    return grid
+
+
+def measure(fill: Callable[[Grid], None], make: Callable[[int], Grid], size: int) -> Tuple[float, Grid]:
+    """Время одной заливки (без подготовки холста)"""
+    grid = make(size)
+    started = time.perf_counter()
+    fill(grid)
+    return time.perf_counter() - started, grid
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [128, 256, 512]
+    fills = [
+        ("legacy", lambda grid: legacy_flood_fill(grid, 1, 0, FILL_COLOR)),
+        ("scanline", lambda grid: scanline_fill(grid, 1, 0, 0xFF0000, use_numpy=False)),
+    ]
+    if np is not None:
+        fills.append(("scanline+numpy", lambda grid: scanline_fill(grid, 1, 0, 0xFF0000, use_numpy=True)))
+    
+    print(f"{'холст':>12} {'размер':>7} " + " ".join(f"{name:>15}" for name, _ in fills))
+    for make in (make_empty, make_maze, make_noise):
+        for size in sizes:
+            times = []
+            reference = None
+            for name, fill in fills:
+                elapsed, grid = measure(fill, make, size)
+                times.append(elapsed)
+                
+                # Все реализации должны дать одинаковый результат
+                if reference is None:
+                    reference = grid.pixels
+                elif grid.pixels != reference:
+                    raise AssertionError(f"{name}: результат отличается от legacy")
+            
+            row = " ".join(f"{elapsed * 1000:>13.1f}мс" for elapsed in times)
+            print(f"{make.__name__[5:]:>12} {size:>7} {row}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,409 @@
+# ========================================
+# benchmarks/bench_suite.py
+# ========================================
+"""
+Набор замеров горячих путей: сетка, инструменты, история,
+файлы и отрисовка. Работает без окна (SDL_VIDEODRIVER=dummy)
+
+Результаты пишутся в JSON и сравниваются с сохраненным эталоном:
+    
+    python benchmarks/bench_suite.py --output baseline.json
+    python benchmarks/bench_suite.py --baseline baseline.json --output run.json
+
+При сравнении замеры, замедлившиеся больше порога (--threshold),
+отмечаются, и скрипт завершается с кодом 1
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame as pg
+
+from core import Config
+from models import Grid, TiledGrid
+from tools import BrushTool, FillTool
+from ui import GridRenderer
+from utils import save_grid_to_file, load_grid_from_file, save_project_file, load_project_file
+
+
+# Версия формата файла результатов
+RESULTS_VERSION = 1
+
+# Размеры холста по умолчанию (сторона квадрата)
+DEFAULT_SIZES = [64, 256, 1024, 2048]
+
+# Размеры кисти по умолчанию (от 1 до Config.MAX_TOOL_SIZE)
+DEFAULT_BRUSH_SIZES = [1, 2, 4, 8, 16, 32, 64]
+
+# Текстовый формат хранит ячейку строкой "R,G,B" - большие
+# холсты в нем не замеряются (минуты и сотни мегабайт)
+MAX_TEXT_FILE_SIZE = 512
+
+# Окно, в которое выводится холст при замере отрисовки
+RENDER_VIEW_SIZE = 768
+
+# Сколько ячеек меняется в замерах точечной записи и частичной отрисовки
+SCATTER_CELLS = 10000
+DIRTY_CELLS = 100
+
+# Замедление меньше этого (секунды) не считается - у замеров в доли
+# миллисекунды разброс между запусками больше порога в разах
+NOISE_FLOOR = 0.0001
+
+RED = (255, 0, 0)
+WALL = 0x000000
+PAINT = 0xFF0000
+
+
+class Case(NamedTuple):
+    """
+    Один замер
+    
+    Attributes:
+        name: уникальное имя (группа/параметры)
+        setup: подготовка, не входит в замер; результат передается в run
+        run: замеряемое действие
+        ops: число операций за один run (для операций в секунду)
+    """
+    name: str
+    setup: Callable[[], Any]
+    run: Callable[[Any], Any]
+    ops: int = 1
+
+
+# ---------- Подготовка холстов ----------
+
+def make_empty(size: int) -> Grid:
+    """Пустой холст - заливка всего фона"""
+    return Grid(size, size, 1)
+
+
+def make_maze(size: int) -> Grid:
+    """Змейка из стен - самая длинная извилистая область для заливки"""
+    grid = Grid(size, size, 1)
+    for y in range(1, size, 2):
+        if (y // 2) % 2 == 0:
+            grid.fill_span(0, y, size - 1, WALL)
+        else:
+            grid.fill_span(1, y, size - 1, WALL)
+    grid.pop_dirty_rects()
+    return grid
+
+
+def make_noise(size: int) -> Grid:
+    """Редкие точки - много коротких участков"""
+    grid = Grid(size, size, 1)
+    for y in range(size):
+        for x in range((y * 7) % 13, size, 13):
+            grid.set_pixel(x, y, 0x0000FF)
+    grid.pop_dirty_rects()
+    return grid
+
+
+def scatter_points(size: int, count: int) -> List[tuple]:
+    """Псевдослучайные (детерминированные) точки холста"""
+    return [((i * 7919) % size, (i * 104729 + i // size) % size) for i in range(count)]
+
+
+# ---------- Замеры ----------
+
+def grid_cases(size: int) -> Iterator[Case]:
+    """Создание сетки и запись ячеек"""
+    yield Case(f"grid/create/{size}", lambda: None, lambda _: Grid(size, size, 1))
+    yield Case(f"grid/create_tiled/{size}", lambda: None,
+               lambda _: TiledGrid(size, size, 1, tile_size=Config.TILE_SIZE))
+    
+    points = scatter_points(size, SCATTER_CELLS)
+    
+    def set_cells(grid: Grid):
+        for x, y in points:
+            grid.set_cell_color(x, y, RED)
+    
+    yield Case(f"grid/set_cell_color/{size}", lambda: Grid(size, size, 1), set_cells, len(points))
+
+
+def brush_cases(size: int, brush_sizes: List[int]) -> Iterator[Case]:
+    """Отпечатки и штрих кисти каждого размера"""
+    points = scatter_points(size, 1000)
+    for brush_size in brush_sizes:
+        brush = BrushTool()
+        brush.size = brush_size
+        
+        def stamps(grid: Grid, brush=brush):
+            for x, y in points:
+                brush.use(grid, x, y, RED)
+        
+        def stroke(grid: Grid, brush=brush):
+            # Диагональ через весь холст - соседние отпечатки перекрываются
+            brush.begin_stroke(grid, 0, 0, RED)
+            for i in range(1, size, 4):
+                brush.stroke_to(grid, i, i, RED)
+            brush.end_stroke()
+        
+        yield Case(f"brush/use/{size}/size{brush_size}", lambda: Grid(size, size, 1),
+                   stamps, len(points))
+        yield Case(f"brush/stroke/{size}/size{brush_size}", lambda: Grid(size, size, 1),
+                   stroke, size)
+
+
+def fill_cases(size: int) -> Iterator[Case]:
+    """Заливка на холстах разной сложности (из фоновой ячейки (1, 0))"""
+    fill = FillTool()
+    for make in (make_empty, make_maze, make_noise):
+        yield Case(f"fill/{make.__name__[5:]}/{size}", lambda make=make: make(size),
+                   lambda grid: fill.use(grid, 1, 0, RED), size * size)
+
+
+def history_cases(size: int) -> Iterator[Case]:
+    """Запись действия, отмена и повтор (действие - полосы на четверти строк)"""
+    rows = range(0, size, 4)
+    
+    def paint(grid: Grid):
+        history = grid.history
+        history.begin_action()
+        for y in rows:
+            grid.fill_span(0, y, size, PAINT)
+        history.end_action()
+    
+    def painted() -> Grid:
+        grid = Grid(size, size, 1)
+        paint(grid)
+        return grid
+    
+    def undone() -> Grid:
+        grid = painted()
+        grid.history.undo()
+        return grid
+    
+    cells = len(rows) * size
+    yield Case(f"history/record/{size}", lambda: Grid(size, size, 1), paint, cells)
+    yield Case(f"history/undo/{size}", painted, lambda grid: grid.history.undo(), cells)
+    yield Case(f"history/redo/{size}", undone, lambda grid: grid.history.redo(), cells)
+
+
+def file_cases(size: int, folder: str) -> Iterator[Case]:
+    """Запись и чтение проекта: текстовый формат и бинарный .pxp"""
+    cells = size * size
+    binary_path = os.path.join(folder, f"bench_{size}.pxp")
+    text_path = os.path.join(folder, f"bench_{size}.txt")
+    
+    yield Case(f"io/pxp_save/{size}", lambda: make_noise(size),
+               lambda grid: save_project_file(binary_path, size, size, pixels=grid.pixels), cells)
+    yield Case(f"io/pxp_load/{size}",
+               lambda: save_project_file(binary_path, size, size, pixels=make_noise(size).pixels),
+               lambda _: load_project_file(binary_path), cells)
+    
+    if size > MAX_TEXT_FILE_SIZE:
+        return
+    yield Case(f"io/txt_save/{size}", lambda: make_noise(size).get_columns(),
+               lambda columns: save_grid_to_file(columns, text_path), cells)
+    yield Case(f"io/txt_load/{size}",
+               lambda: save_grid_to_file(make_noise(size).get_columns(), text_path),
+               lambda _: load_grid_from_file(text_path, size, size), cells)
+
+
+def render_cases(size: int) -> Iterator[Case]:
+    """
+    Отрисовка холста в окно RENDER_VIEW_SIZE: полная (смена
+    масштаба или сдвиг) и частичная (изменено DIRTY_CELLS ячеек)
+    """
+    view = min(size, RENDER_VIEW_SIZE)
+    points = scatter_points(view, DIRTY_CELLS)
+    
+    def prepared(dirty: bool):
+        def setup():
+            grid = make_noise(size)
+            renderer = GridRenderer.for_grid(grid)
+            screen = pg.Surface((RENDER_VIEW_SIZE, RENDER_VIEW_SIZE))
+            renderer.render(screen, full=True, cell_size=1, visible_rect=(0, 0, view, view))
+            if dirty:
+                for x, y in points:
+                    grid.set_cell_color(x, y, RED)
+            return renderer, screen
+        return setup
+    
+    def render(state, full: bool):
+        renderer, screen = state
+        renderer.render(screen, full=full, cell_size=1, visible_rect=(0, 0, view, view))
+    
+    yield Case(f"render/first/{size}",
+               lambda: (GridRenderer.for_grid(make_noise(size)),
+                        pg.Surface((RENDER_VIEW_SIZE, RENDER_VIEW_SIZE))),
+               lambda state: render(state, True), view * view)
+    yield Case(f"render/full/{size}", prepared(False), lambda state: render(state, True), view * view)
+    yield Case(f"render/dirty/{size}", prepared(True), lambda state: render(state, False), DIRTY_CELLS)
+
+
+def collect_cases(sizes: List[int], brush_sizes: List[int], folder: str) -> List[Case]:
+    """Все замеры для заданных размеров холста и кисти"""
+    cases: List[Case] = []
+    for size in sizes:
+        cases.extend(grid_cases(size))
+        cases.extend(brush_cases(size, brush_sizes))
+        cases.extend(fill_cases(size))
+        cases.extend(history_cases(size))
+        cases.extend(file_cases(size, folder))
+        cases.extend(render_cases(size))
+    return cases
+
+
+# ---------- Запуск и сравнение ----------
+
+def time_case(case: Case) -> float:
+    """
+    Один прогон замера (подготовка не учитывается)
+    
+    Сборщик мусора на время прогона выключается (как в timeit)
+    
+    Returns:
+        Время прогона в секундах
+    """
+    state = case.setup()
+    gc.collect()
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        case.run(state)
+        return time.perf_counter() - started
+    finally:
+        gc.enable()
+
+
+def run_cases(cases: List[Case], repeat: int) -> Dict[str, Dict[str, Any]]:
+    """
+    Выполнить замеры repeat проходами
+    
+    Каждый проход выполняет все замеры по разу, поэтому кратковременная
+    посторонняя нагрузка на машину портит не больше одного повтора
+    каждого замера. Первый проход разогревочный и не учитывается:
+    кэши, выделение памяти и первые вызовы не попадают в результат
+    
+    Returns:
+        Для каждого замера: минимальное и медианное время (секунды),
+        повторы и операции в секунду
+    """
+    times: Dict[str, List[float]] = {case.name: [] for case in cases}
+    for round_index in range(repeat + 1):
+        if round_index:
+            print(f"Проход {round_index}/{repeat}", file=sys.stderr, flush=True)
+        for case in cases:
+            elapsed = time_case(case)
+            if round_index:
+                times[case.name].append(elapsed)
+    
+    results = {}
+    for case in cases:
+        best = min(times[case.name])
+        results[case.name] = {
+            "min": best,
+            "median": statistics.median(times[case.name]),
+            "repeat": repeat,
+            "ops": case.ops,
+            "ops_per_sec": case.ops / best if best > 0 else None,
+        }
+    return results
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            threshold: float) -> List[str]:
+    """
+    Сравнить минимальное время с эталоном и напечатать таблицу
+    
+    Минимум меньше всего зависит от посторонней нагрузки на машину,
+    медиана при нескольких повторах заметно гуляет от запуска к запуску
+    
+    Returns:
+        Имена замеров, замедлившихся больше чем в threshold раз
+        (и больше чем на NOISE_FLOOR)
+    """
+    regressions = []
+    print(f"\n{'замер':48} {'эталон':>10} {'сейчас':>10} {'x':>7}")
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            print(f"{name:48} {'-':>10} {result['min'] * 1000:>8.2f}мс {'new':>7}")
+            continue
+        
+        ratio = result['min'] / reference['min'] if reference['min'] > 0 else 1.0
+        mark = ""
+        if ratio > threshold and result['min'] - reference['min'] > NOISE_FLOOR:
+            mark = "  <-- медленнее"
+            regressions.append(name)
+        print(f"{name:48} {reference['min'] * 1000:>8.2f}мс "
+              f"{result['min'] * 1000:>8.2f}мс {ratio:>7.2f}{mark}")
+    return regressions
+
+
+def environment() -> Dict[str, Any]:
+    """Описание окружения для файла результатов"""
+    return {
+        "python": platform.python_version(),
+        "pygame": pg.version.ver,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Разобрать аргументы командной строки"""
+    parser = argparse.ArgumentParser(description="Замеры горячих путей Pixelart Editor")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="стороны холста (по умолчанию %(default)s)")
+    parser.add_argument('--brush-sizes', type=int, nargs='+', default=DEFAULT_BRUSH_SIZES,
+                        help=f"размеры кисти, 1..{Config.MAX_TOOL_SIZE} (по умолчанию %(default)s)")
+    parser.add_argument('--repeat', type=int, default=5, help="повторов каждого замера")
+    parser.add_argument('--filter', default="", help="только замеры, имя которых содержит строку")
+    parser.add_argument('--output', help="записать результаты в JSON")
+    parser.add_argument('--baseline', help="сравнить с результатами из JSON")
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help="допустимое замедление относительно эталона (раз)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    pg.init()
+    
+    with tempfile.TemporaryDirectory() as folder:
+        cases = [case for case in collect_cases(args.sizes, args.brush_sizes, folder) if args.filter in case.name]
+        results = run_cases(cases, args.repeat)
+    
+    for name, result in results.items():
+        rate = result['ops_per_sec']
+        rate_text = f"{rate:>14,.0f} оп/с" if rate else ""
+        print(f"{name:48} {result['min'] * 1000:>10.2f}мс {rate_text}")
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump({"version": RESULTS_VERSION, "environment": environment(),
+                       "sizes": args.sizes, "brush_sizes": args.brush_sizes,
+                       "results": results}, file, indent=2)
+        print(f"\nРезультаты записаны в {args.output}")
+    
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline.get("results", {}), args.threshold)
+        if regressions:
+            print(f"\nЗамедлились ({len(regressions)}): {', '.join(regressions)}")
+            return 1
+        print("\nЗамедлений нет")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
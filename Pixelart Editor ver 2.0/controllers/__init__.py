@@ -6,16 +6,21 @@
 
 Реализует Controller часть MVC паттерна:
 - InputController: обработка ввода (мышь, клавиатура)
+- MouseSample: положение мыши со временем (InputController.mouse_samples)
+- record_event, replay_event: события pygame в записи ввода и обратно
 - FileController: работа с файлами (save, load, export)
 - CanvasController: управление холстом и рисованием
 """
 
-from .input_controller import InputController
+from .input_controller import InputController, MouseSample, record_event, replay_event
 from .file_controller import FileController
 from .canvas_controller import CanvasController
 
 __all__ = [
     'InputController',
+    'MouseSample',
+    'record_event',
+    'replay_event',
     'FileController',
     'CanvasController',
 ]
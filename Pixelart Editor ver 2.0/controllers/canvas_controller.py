@@ -3,7 +3,8 @@
 # ========================================
 """Контроллер управления холстом"""
 
-from typing import Tuple, TYPE_CHECKING
+from typing import Optional, Tuple, TYPE_CHECKING
+from models.color import ColorLike, PackedColor, to_packed, unpack_rgb
 
 if TYPE_CHECKING:
     from models import Grid
@@ -26,7 +27,11 @@ class CanvasController:
         self._grid = grid
         self._tool_manager = tool_manager
         self._is_drawing = False
-        self._current_color = (0, 0, 0)
+        # Цвет рисования хранится упакованным - в таком виде его
+        # получают инструменты; кортеж собирается только для UI
+        self._current_value: PackedColor = 0x000000
+        self._stroke_tool = None
+        self._last_point: Optional[Tuple[int, int]] = None
     
     @property
     def grid(self) -> 'Grid':
@@ -35,23 +40,78 @@ class CanvasController:
     
     @property
     def current_color(self) -> Tuple[int, int, int]:
-        """Текущий цвет рисования"""
-        return self._current_color
+        """Текущий цвет рисования (R, G, B)"""
+        return unpack_rgb(self._current_value)
     
     @current_color.setter
-    def current_color(self, color: Tuple[int, int, int]):
+    def current_color(self, color: ColorLike):
         """Установить цвет рисования"""
-        self._current_color = color
+        self._current_value = to_packed(color)
+    
+    @property
+    def current_value(self) -> PackedColor:
+        """Текущий цвет рисования в упакованном виде"""
+        return self._current_value
+    
+    @property
+    def is_drawing(self) -> bool:
+        """Идет ли рисование (кнопка мыши нажата на холсте)"""
+        return self._is_drawing
     
     def start_drawing(self):
         """Начать рисование"""
         self._is_drawing = True
-        # Сохраняем состояние для Undo
-        self._grid.history.save_state()
+        self._stroke_tool = None
+        self._last_point = None
+        # Все изменения штриха записываются в одно действие для Undo
+        self._grid.history.begin_action()
     
     def stop_drawing(self):
         """Закончить рисование"""
+        self._end_stroke()
+        self._last_point = None
         self._is_drawing = False
+        self._grid.history.end_action()
+    
+    def stroke_to(self, grid_x: int, grid_y: int):
+        """
+        Продолжить штрих текущим инструментом до указанной позиции
+        
+        Вызывается для каждого положения мыши: кисть и ластик соединяют
+        его с предыдущим отрезком, остальные инструменты применяются
+        в точке. Повтор той же позиции пропускается
+        
+        Args:
+            grid_x, grid_y: координаты в сетке
+        """
+        point = (grid_x, grid_y)
+        if point == self._last_point:
+            return
+        connect = self._last_point is not None
+        self._last_point = point
+        
+        current_tool = self._tool_manager.current_tool
+        if current_tool.name == "EyeDropper":
+            self.draw_at(grid_x, grid_y)
+            return
+        
+        # Инструмент сменили посреди штриха - начинаем новый штрих
+        if current_tool is not self._stroke_tool:
+            self._end_stroke()
+            self._stroke_tool = current_tool
+            current_tool.begin_stroke(self._grid, grid_x, grid_y, self._current_value)
+        else:
+            current_tool.stroke_to(self._grid, grid_x, grid_y, self._current_value, connect)
+    
+    def lift_pen(self):
+        """Курсор покинул холст: следующая позиция не соединяется с предыдущей"""
+        self._last_point = None
+    
+    def _end_stroke(self):
+        """Закончить штрих инструмента"""
+        if self._stroke_tool is not None:
+            self._stroke_tool.end_stroke()
+            self._stroke_tool = None
     
     def draw_at(self, grid_x: int, grid_y: int):
         """
@@ -64,18 +124,19 @@ class CanvasController:
         
         # Если пипетка - берем цвет с холста
         if current_tool.name == "EyeDropper":
-            current_tool.use(self._grid, grid_x, grid_y, self._current_color)
-            if current_tool.picked_color:
-                self._current_color = current_tool.picked_color
+            current_tool.use(self._grid, grid_x, grid_y, self._current_value)
+            if current_tool.picked_value is not None:
+                self._current_value = current_tool.picked_value
             return
         
         # Остальные инструменты
-        current_tool.use(self._grid, grid_x, grid_y, self._current_color)
+        current_tool.use(self._grid, grid_x, grid_y, self._current_value)
     
     def clear_canvas(self):
         """Очистить холст"""
-        self._grid.history.save_state()
+        self._grid.history.begin_action()
         self._grid.clear()
+        self._grid.history.end_action()
     
     def undo(self) -> bool:
         """
@@ -115,11 +176,10 @@ class CanvasController:
         Returns:
             Цвет ячейки
         """
-        color = self._grid.get_cell_color(grid_x, grid_y)
-        if color:
-            self._current_color = color
-            return color
-        return self._current_color
+        value = self._grid.get_pixel(grid_x, grid_y)
+        if value is not None:
+            self._current_value = value
+        return unpack_rgb(self._current_value)
     
     def __repr__(self) -> str:
-        return f"CanvasController(grid={self._grid}, color={self._current_color})"
\ No newline at end of file
+        return f"CanvasController(grid={self._grid}, color={self.current_color})"
\ No newline at end of file
@@ -116,31 +116,71 @@ class InputController:
 # ========================================
 """Контроллер работы с файлами"""
 
-from typing import Optional, TYPE_CHECKING
+import math
+from array import array
+from typing import Dict, List, Optional, Set, Tuple, TYPE_CHECKING
 from utils import (
     save_grid_to_file,
     load_grid_from_file,
+    save_project_file,
+    load_project_file,
+    is_project_file,
     export_to_png,
     open_file_dialog,
     save_file_dialog,
-    get_filename_from_path
+    get_filename_from_path,
+    PROJECT_EXTENSION,
+    ProjectImage,
+    BackgroundWorker,
+    TaskResult
 )
+from core import Config
+from models.color import unpack_rgb
+from ui import grid_to_surface
 
 if TYPE_CHECKING:
     from models import Grid
+    from models.tiled_grid import TileKey
     import pygame as pg
 
 
+# Типы файлов проекта для диалогов: бинарный формат и старый текстовый
+PROJECT_FILE_TYPES = [("Pixelart project", "*.pxp"), ("Text files", "*.txt")]
+
+# Имена фоновых задач
+TASK_SAVE = "save"
+TASK_LOAD = "load"
+TASK_EXPORT = "export"
+
+
 class FileController:
     """
     Контроллер для работы с файлами
     Управляет сохранением, загрузкой и экспортом
+    
+    Методы request_* выполняют диалог и работу с диском в фоновом
+    потоке: в главном потоке снимается только копия холста, а
+    результат применяется в process_results() следующих кадров.
+    save_project/load_project/export_image делают то же синхронно
     """
     
-    def __init__(self):
-        """Инициализация контроллера"""
+    def __init__(self, worker: Optional[BackgroundWorker] = None):
+        """
+        Инициализация контроллера
+        
+        Args:
+            worker: фоновый поток для диалогов и файлов (None - свой)
+        """
         self._current_filename: Optional[str] = None
         self._last_save_path: Optional[str] = None
+        self._worker = worker if worker is not None else BackgroundWorker("file-io")
+        
+        # Копии тайлов последнего снимка разреженной сетки: следующий
+        # снимок копирует заново только тайлы, измененные с тех пор
+        self._tile_copies: Dict['TileKey', array] = {}
+        self._tile_copies_grid: Optional['Grid'] = None
+        # Тайлы, отданные в еще не завершенные сохранения
+        self._saving_tiles: Set['TileKey'] = set()
     
     @property
     def current_filename(self) -> Optional[str]:
@@ -152,6 +192,21 @@ class FileController:
         """Открыт ли файл"""
         return self._current_filename is not None
     
+    @property
+    def busy(self) -> bool:
+        """Выполняется ли фоновая операция с файлами"""
+        return self._worker.busy
+    
+    @property
+    def current_task(self) -> Optional[str]:
+        """Текущая фоновая операция (TASK_SAVE, TASK_LOAD, TASK_EXPORT или None)"""
+        return self._worker.current_task
+    
+    @property
+    def worker(self) -> BackgroundWorker:
+        """Фоновый поток операций с файлами"""
+        return self._worker
+    
     def save_project(self, grid: 'Grid', filepath: Optional[str] = None) -> bool:
         """
         Сохранить проект
@@ -163,21 +218,21 @@ class FileController:
         Returns:
             True если успешно сохранено
         """
-        # Если путь не указан - открываем диалог
-        if filepath is None:
-            filepath = save_file_dialog([("Text files", "*.txt")])
-            if not filepath:
-                return False
-        
-        # Сохраняем
-        state = grid.save_state()
-        success = save_grid_to_file(state, filepath)
+        return self._apply_save(grid, _save_image(filepath, self._snapshot(grid),
+                                                  grid.background_packed))
+    
+    def request_save(self, grid: 'Grid', filepath: Optional[str] = None):
+        """
+        Сохранить проект в фоновом потоке
         
-        if success:
-            self._current_filename = get_filename_from_path(filepath)
-            self._last_save_path = filepath
+        Сохраняется состояние холста на момент вызова
         
-        return success
+        Args:
+            grid: сетка для сохранения
+            filepath: путь для сохранения (None = показать диалог)
+        """
+        self._worker.submit(TASK_SAVE, _save_image, filepath, self._snapshot(grid),
+                            grid.background_packed)
     
     def load_project(self, grid: 'Grid', filepath: Optional[str] = None) -> bool:
         """
@@ -190,45 +245,74 @@ class FileController:
         Returns:
             True если успешно загружено
         """
-        # Если путь не указан - открываем диалог
-        if filepath is None:
-            filepath = open_file_dialog([("Text files", "*.txt")])
-            if not filepath:
-                return False
-        
-        # Загружаем
-        state = load_grid_from_file(filepath, grid.width, grid.height)
-        
-        if state:
-            grid.restore_state(state)
-            self._current_filename = get_filename_from_path(filepath)
-            self._last_save_path = filepath
-            return True
+        return self._apply_load(grid, _load_state(filepath, *_grid_shape(grid)))
+    
+    def request_load(self, grid: 'Grid', filepath: Optional[str] = None):
+        """
+        Загрузить проект в фоновом потоке
         
-        return False
+        Args:
+            grid: сетка для загрузки (только размеры; содержимое
+                  меняется в process_results)
+            filepath: путь к файлу (None = показать диалог)
+        """
+        self._worker.submit(TASK_LOAD, _load_state, filepath, *_grid_shape(grid))
     
-    def export_image(self, screen: 'pg.Surface', region: tuple, filepath: Optional[str] = None) -> bool:
+    def export_image(self, grid: 'Grid', scale: int = 1, filepath: Optional[str] = None) -> bool:
         """
-        Экспортировать область экрана в PNG
+        Экспортировать холст в PNG
+        
+        Изображение строится из данных сетки, а не снимается с экрана,
+        поэтому не зависит от масштаба просмотра и положения холста
         
         Args:
-            screen: поверхность pygame
-            region: область для экспорта (x, y, width, height)
+            grid: сетка для экспорта
+            scale: целый масштаб (пикселей PNG на ячейку; уменьшается,
+                   если PNG больше Config.EXPORT_MAX_PIXELS)
             filepath: путь для сохранения (None = показать диалог)
         
         Returns:
             True если успешно экспортировано
         """
-        # Если путь не указан - открываем диалог
-        if filepath is None:
-            filepath = save_file_dialog([("PNG Image", "*.png")])
-            if not filepath:
-                return False
+        scale = _limit_export_scale(grid.width, grid.height, scale)
+        return _export_surface(filepath, grid_to_surface(grid), scale) is not None
+    
+    def request_export(self, grid: 'Grid', scale: int = 1, filepath: Optional[str] = None):
+        """
+        Экспортировать холст в PNG в фоновом потоке
         
-        # Экспортируем
-        success = export_to_png(screen, region, filepath)
+        Изображение холста снимается сразу, масштабирование
+        и запись выполняются в фоне
         
-        return success
+        Args:
+            grid: сетка для экспорта
+            scale: целый масштаб (см. export_image)
+            filepath: путь для сохранения (None = показать диалог)
+        """
+        scale = _limit_export_scale(grid.width, grid.height, scale)
+        self._worker.submit(TASK_EXPORT, _export_surface, filepath, grid_to_surface(grid), scale)
+    
+    def process_results(self, grid: 'Grid') -> List[TaskResult]:
+        """
+        Применить результаты завершенных фоновых операций
+        
+        Вызывается из главного цикла каждый кадр
+        
+        Args:
+            grid: сетка, в которую загружаются проекты
+        
+        Returns:
+            Результаты завершенных операций
+        """
+        results = self._worker.poll()
+        for result in results:
+            self._apply_result(grid, result)
+        return results
+    
+    def finish_pending(self, grid: 'Grid'):
+        """Дождаться фоновых операций (перед выходом) и применить результаты"""
+        for result in self._worker.wait():
+            self._apply_result(grid, result)
     
     def quick_save(self, grid: 'Grid') -> bool:
         """
@@ -245,11 +329,210 @@ class FileController:
         else:
             return self.save_project(grid, None)
     
+    def request_quick_save(self, grid: 'Grid'):
+        """
+        Быстрое сохранение в фоновом потоке (см. quick_save)
+        
+        Разреженная сетка без изменений после сохранения не записывается
+        """
+        if self._last_save_path and not getattr(grid, 'has_unsaved_changes', True):
+            return
+        self.request_save(grid, self._last_save_path)
+    
     def new_project(self):
         """Создать новый проект (сбросить имя файла)"""
         self._current_filename = "unnamed"
         self._last_save_path = None
     
+    def _apply_result(self, grid: 'Grid', result: TaskResult):
+        """Применить результат фоновой операции"""
+        if not result.ok:
+            print(f"Ошибка фоновой операции '{result.name}': {result.error}")
+        
+        if result.name == TASK_SAVE:
+            self._apply_save(grid, result.value if result.ok else None)
+        elif result.name == TASK_LOAD and result.ok:
+            self._apply_load(grid, result.value)
+    
+    def _apply_save(self, grid: 'Grid', filepath: Optional[str]) -> bool:
+        """Запомнить сохраненный файл (None - сохранение не состоялось)"""
+        saving_tiles = self._saving_tiles
+        self._saving_tiles = set()
+        if not filepath:
+            # Тайлы снимка так и остались несохраненными
+            if saving_tiles and hasattr(grid, 'mark_unsaved'):
+                grid.mark_unsaved(saving_tiles)
+            return False
+        self._current_filename = get_filename_from_path(filepath)
+        self._last_save_path = filepath
+        return True
+    
+    def _apply_load(self, grid: 'Grid', loaded: Optional[Tuple[str, object]]) -> bool:
+        """Перенести загруженное состояние в сетку (None - загрузка не состоялась)"""
+        if not loaded:
+            return False
+        
+        filepath, state = loaded
+        grid.restore_state(state)
+        # Загруженный файл - новая отправная точка истории
+        grid.history.clear_history()
+        # и совпадает с содержимым сетки
+        if hasattr(grid, 'pop_unsaved_tiles'):
+            grid.pop_unsaved_tiles()
+            self._tile_copies_grid = None
+        self._current_filename = get_filename_from_path(filepath)
+        self._last_save_path = filepath
+        return True
+    
+    def _snapshot(self, grid: 'Grid') -> ProjectImage:
+        """
+        Копия содержимого сетки для записи в фоне (снимается в главном потоке)
+        
+        У разреженной сетки копируются только тайлы, измененные после
+        прошлого снимка; остальные берутся из него (копии не меняются,
+        поэтому их можно отдавать нескольким снимкам)
+        """
+        if not hasattr(grid, 'iter_tiles'):
+            return ProjectImage(grid.width, grid.height, pixels=grid.save_state())
+        
+        changed = grid.pop_unsaved_tiles()
+        self._saving_tiles |= changed
+        if grid is not self._tile_copies_grid:
+            self._tile_copies = grid.save_state()
+            self._tile_copies_grid = grid
+        else:
+            copies = self._tile_copies
+            for key in changed:
+                tile = grid.get_tile(*key)
+                if tile is None:
+                    copies.pop(key, None)
+                else:
+                    copies[key] = array(tile.typecode, tile)
+        return ProjectImage(grid.width, grid.height, tiles=dict(self._tile_copies),
+                            tile_size=grid.tile_size)
+    
     def __repr__(self) -> str:
         return f"FileController(file='{self._current_filename}')"
 
+
+def _limit_export_scale(width: int, height: int, scale: int) -> int:
+    """
+    Ограничить масштаб экспорта размером PNG
+    
+    Увеличенное изображение строится в памяти целиком, поэтому для
+    больших холстов масштаб уменьшается до Config.EXPORT_MAX_PIXELS
+    
+    Args:
+        width, height: размеры сетки в ячейках
+        scale: запрошенный масштаб
+    
+    Returns:
+        Масштаб не больше запрошенного и не меньше 1
+    """
+    scale = max(1, int(scale))
+    limit = max(1, math.isqrt(Config.EXPORT_MAX_PIXELS // max(1, width * height)))
+    if scale > limit:
+        print(f"Масштаб экспорта уменьшен до x{limit}: PNG {width * scale}x{height * scale} "
+              f"больше предела {Config.EXPORT_MAX_PIXELS} пикселей")
+        return limit
+    return scale
+
+
+# Функции ниже выполняются в фоновом потоке: сетку они не трогают,
+# а получают ее снимок или размеры
+
+
+def _grid_shape(grid: 'Grid') -> Tuple[int, int, int, int]:
+    """Размеры сетки для загрузки: (ширина, высота, размер тайла, фон)"""
+    return grid.width, grid.height, getattr(grid, 'tile_size', 0), grid.background_packed
+
+
+def _save_image(filepath: Optional[str], image: ProjectImage, background: int) -> Optional[str]:
+    """
+    Записать снимок сетки в файл
+    
+    Args:
+        filepath: путь (None = показать диалог)
+        image: снимок сетки
+        background: упакованный цвет фона
+    
+    Returns:
+        Путь сохраненного файла или None (отмена или ошибка)
+    """
+    if filepath is None:
+        filepath = save_file_dialog(PROJECT_FILE_TYPES)
+        if not filepath:
+            return None
+    
+    # .txt - старый текстовый формат, иначе бинарный .pxp; расширение
+    # добавляется здесь, чтобы вернуть путь действительно записанного файла
+    if not filepath.endswith(('.txt', PROJECT_EXTENSION)):
+        filepath = filepath + PROJECT_EXTENSION
+    
+    if filepath.endswith('.txt'):
+        width, height = image.width, image.height
+        pixels = image.to_pixels(width, height, background)
+        columns = [[unpack_rgb(pixels[y * width + x]) for y in range(height)]
+                   for x in range(width)]
+        success = save_grid_to_file(columns, filepath)
+    else:
+        success = save_project_file(filepath, image.width, image.height, pixels=image.pixels,
+                                    tiles=image.tiles, tile_size=image.tile_size)
+    
+    return filepath if success else None
+
+
+def _load_state(filepath: Optional[str], width: int, height: int,
+                tile_size: int, background: int) -> Optional[Tuple[str, object]]:
+    """
+    Прочитать файл проекта и подготовить его для grid.restore_state()
+    
+    Args:
+        filepath: путь (None = показать диалог)
+        width, height, tile_size, background: параметры сетки (см. _grid_shape)
+    
+    Returns:
+        (путь, состояние) или None (отмена или ошибка)
+    """
+    if filepath is None:
+        filepath = open_file_dialog(PROJECT_FILE_TYPES)
+        if not filepath:
+            return None
+    
+    # Формат определяется по сигнатуре, а не по расширению
+    if is_project_file(filepath):
+        image = load_project_file(filepath)
+        state = _image_to_state(image, width, height, tile_size, background) if image else None
+    else:
+        state = load_grid_from_file(filepath, width, height)
+    
+    return (filepath, state) if state else None
+
+
+def _image_to_state(image: ProjectImage, width: int, height: int,
+                    tile_size: int, background: int):
+    """
+    Подготовить содержимое файла для grid.restore_state()
+    
+    Тайлы подходящего размера передаются разреженной сетке как есть,
+    иначе собирается плоский буфер размера сетки
+    """
+    if (image.tiles is not None and tile_size == image.tile_size
+            and (image.width, image.height) == (width, height)):
+        return image.tiles
+    return image.to_pixels(width, height, background)
+
+
+def _export_surface(filepath: Optional[str], surface: 'pg.Surface', scale: int) -> Optional[str]:
+    """
+    Сохранить изображение холста в PNG
+    
+    Returns:
+        Путь файла или None (отмена или ошибка)
+    """
+    if filepath is None:
+        filepath = save_file_dialog([("PNG Image", "*.png")])
+        if not filepath:
+            return None
+    
+    return filepath if export_to_png(surface, filepath, scale) else None
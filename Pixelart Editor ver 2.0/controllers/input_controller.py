@@ -4,11 +4,102 @@
 """Контроллер обработки пользовательского ввода"""
 
 import pygame as pg
-from typing import Tuple, Optional, TYPE_CHECKING
+from typing import Iterable, List, NamedTuple, Tuple, Optional, TYPE_CHECKING
+from core import Config
+from utils.input_recording import (RecordedEvent, EVENT_QUIT, EVENT_MOUSE_DOWN, EVENT_MOUSE_UP,
+                                   EVENT_MOUSE_MOTION, EVENT_MOUSE_WHEEL, EVENT_KEY_DOWN, EVENT_KEY_UP)
 
 if TYPE_CHECKING:
     from models import Grid
     from utils import Vector2D
+    from ui import Viewport
+
+
+# События, которые обрабатывает контроллер ввода
+INPUT_EVENTS = (
+    pg.MOUSEBUTTONDOWN,
+    pg.MOUSEBUTTONUP,
+    pg.MOUSEMOTION,
+    pg.MOUSEWHEEL,
+    pg.KEYDOWN,
+    pg.KEYUP,
+)
+
+# Типы событий, которые порождают SDL (0x100-0x20FF) и pygame (от
+# ACTIVEEVENT до USEREVENT); остальные номера SDL не использует
+SYSTEM_EVENT_TYPES = (*range(pg.QUIT, 0x2100), *range(pg.ACTIVEEVENT, pg.USEREVENT))
+
+# Соответствие событий pygame и видов событий записи ввода
+_RECORDED_KINDS = {
+    pg.QUIT: EVENT_QUIT,
+    pg.MOUSEBUTTONDOWN: EVENT_MOUSE_DOWN,
+    pg.MOUSEBUTTONUP: EVENT_MOUSE_UP,
+    pg.MOUSEMOTION: EVENT_MOUSE_MOTION,
+    pg.MOUSEWHEEL: EVENT_MOUSE_WHEEL,
+    pg.KEYDOWN: EVENT_KEY_DOWN,
+    pg.KEYUP: EVENT_KEY_UP,
+}
+_EVENT_TYPES = {kind: event_type for event_type, kind in _RECORDED_KINDS.items()}
+
+
+def record_event(event: pg.event.Event) -> Optional[RecordedEvent]:
+    """
+    Преобразовать событие pygame для записи ввода
+    
+    Args:
+        event: событие pygame
+    
+    Returns:
+        Событие записи или None, если событие не относится к вводу
+    """
+    kind = _RECORDED_KINDS.get(event.type)
+    if kind is None:
+        return None
+    if kind in (EVENT_MOUSE_DOWN, EVENT_MOUSE_UP):
+        return RecordedEvent(kind, event.pos[0], event.pos[1], event.button)
+    if kind == EVENT_MOUSE_MOTION:
+        return RecordedEvent(kind, event.pos[0], event.pos[1], event.rel[0], event.rel[1])
+    if kind == EVENT_MOUSE_WHEEL:
+        return RecordedEvent(kind, event.x, event.y)
+    if kind in (EVENT_KEY_DOWN, EVENT_KEY_UP):
+        return RecordedEvent(kind, event.key, event.mod)
+    return RecordedEvent(kind)
+
+
+def replay_event(recorded: RecordedEvent) -> pg.event.Event:
+    """
+    Восстановить событие pygame из записи ввода
+    
+    Args:
+        recorded: событие записи
+    
+    Returns:
+        Событие pygame с теми полями, которые читает приложение
+    """
+    kind, a, b, c, d = recorded
+    event_type = _EVENT_TYPES[kind]
+    if kind in (EVENT_MOUSE_DOWN, EVENT_MOUSE_UP):
+        return pg.event.Event(event_type, pos=(a, b), button=c)
+    if kind == EVENT_MOUSE_MOTION:
+        return pg.event.Event(event_type, pos=(a, b), rel=(c, d))
+    if kind == EVENT_MOUSE_WHEEL:
+        return pg.event.Event(event_type, x=a, y=b)
+    if kind in (EVENT_KEY_DOWN, EVENT_KEY_UP):
+        return pg.event.Event(event_type, key=a, mod=b)
+    return pg.event.Event(event_type)
+
+
+class MouseSample(NamedTuple):
+    """
+    Положение мыши из события нажатия или движения
+    
+    Attributes:
+        x, y: координаты в пикселях
+        time: время в миллисекундах (pg.time.get_ticks)
+    """
+    x: int
+    y: int
+    time: int
 
 
 class InputController:
@@ -17,11 +108,22 @@ class InputController:
     Преобразует события pygame в игровые действия
     """
     
-    def __init__(self):
-        """Инициализация контроллера"""
+    def __init__(self, viewport: Optional['Viewport'] = None):
+        """
+        Инициализация контроллера
+        
+        Args:
+            viewport: окно просмотра холста для преобразования координат
+        """
+        self._viewport = viewport
         self._mouse_pos = (0, 0)
         self._mouse_pressed = [False, False, False]  # Left, Middle, Right
         self._mouse_clicked = [False, False, False]
+        self._mouse_rel = (0, 0)
+        self._mouse_samples: List[MouseSample] = []
+        self._mouse_path: List[Tuple[int, int]] = []
+        self._last_update_time = 0
+        self._wheel = 0
         self._keys_pressed = {}
         self._keys_down = {}
         self._keys_up = {}
@@ -41,25 +143,86 @@ class InputController:
         """Правая кнопка мыши нажата"""
         return self._mouse_pressed[2]
     
+    @property
+    def any_mouse_pressed(self) -> bool:
+        """Нажата ли хотя бы одна кнопка мыши"""
+        return any(self._mouse_pressed)
+    
     @property
     def left_mouse_clicked(self) -> bool:
         """Левая кнопка мыши кликнута (одиночный клик)"""
         return self._mouse_clicked[0]
     
-    def update(self, events: list):
+    @property
+    def middle_mouse_pressed(self) -> bool:
+        """Средняя кнопка мыши нажата"""
+        return self._mouse_pressed[1]
+    
+    @property
+    def mouse_rel(self) -> Tuple[int, int]:
+        """Смещение мыши за кадр (dx, dy)"""
+        return self._mouse_rel
+    
+    @property
+    def mouse_samples(self) -> List[MouseSample]:
+        """
+        Путь мыши с нажатой левой кнопкой за кадр по порядку со временем
+        
+        Начинается с положения нажатия (или с начала кадра, если кнопку
+        не отпускали) и заканчивается при отпускании; движения без
+        нажатой кнопки не попадают. Пусто, если путь не менялся
+        """
+        return self._mouse_samples
+    
+    @property
+    def mouse_path(self) -> List[Tuple[int, int]]:
+        """Путь мыши с нажатой левой кнопкой без времени (см. mouse_samples)"""
+        return self._mouse_path
+    
+    @property
+    def wheel(self) -> int:
+        """Прокрутка колеса мыши за кадр (> 0 - от себя)"""
+        return self._wheel
+    
+    @staticmethod
+    def restrict_event_queue(extra_events: Iterable[int] = ()):
+        """
+        Пропускать в очередь только используемые события
+        
+        Остальные (ввод текста, джойстики, касания и т.п.) отбрасываются
+        еще до очереди, и она не разрастается между кадрами
+        
+        Блокируются только диапазоны, где лежат события SDL и pygame:
+        set_blocked(None) перебирает все 65535 типов и заметно
+        задерживает запуск. Пользовательские типы (от USEREVENT)
+        не генерируются сами и остаются разрешенными
+        
+        Args:
+            extra_events: события, которые обрабатываются вне контроллера
+        """
+        pg.event.set_blocked(list(SYSTEM_EVENT_TYPES))
+        pg.event.set_allowed(list(INPUT_EVENTS) + list(extra_events))
+    
+    def update(self, events: list, mouse_pos: Optional[Tuple[int, int]] = None,
+               time: Optional[int] = None):
         """
         Обновить состояние ввода на основе событий
         
         Args:
             events: список pygame событий
+            mouse_pos: положение мыши (по умолчанию - текущее)
+            time: время кадра в миллисекундах (по умолчанию - pg.time.get_ticks)
         """
         # Сбрасываем одиночные события
         self._mouse_clicked = [False, False, False]
         self._keys_down = {}
         self._keys_up = {}
+        self._wheel = 0
+        positions: List[Tuple[int, int]] = []
+        rel_x, rel_y = 0, 0
         
         # Обновляем позицию мыши
-        self._mouse_pos = pg.mouse.get_pos()
+        self._mouse_pos = pg.mouse.get_pos() if mouse_pos is None else mouse_pos
         
         # Обрабатываем события
         for event in events:
@@ -67,11 +230,25 @@ class InputController:
                 if event.button <= 3:
                     self._mouse_pressed[event.button - 1] = True
                     self._mouse_clicked[event.button - 1] = True
+                # Новый штрих: путь начинается с точки нажатия, а не
+                # с положений курсора до него
+                if event.button == 1:
+                    positions = [event.pos]
             
             elif event.type == pg.MOUSEBUTTONUP:
                 if event.button <= 3:
                     self._mouse_pressed[event.button - 1] = False
             
+            elif event.type == pg.MOUSEMOTION:
+                rel_x += event.rel[0]
+                rel_y += event.rel[1]
+                # Состояние кнопки - на момент события (события по порядку)
+                if self._mouse_pressed[0]:
+                    positions.append(event.pos)
+            
+            elif event.type == pg.MOUSEWHEEL:
+                self._wheel += event.y
+            
             elif event.type == pg.KEYDOWN:
                 self._keys_pressed[event.key] = True
                 self._keys_down[event.key] = True
@@ -79,6 +256,25 @@ class InputController:
             elif event.type == pg.KEYUP:
                 self._keys_pressed[event.key] = False
                 self._keys_up[event.key] = True
+        
+        self._mouse_rel = (rel_x, rel_y)
+        self._mouse_path = positions
+        self._mouse_samples = self._timestamp(positions, pg.time.get_ticks() if time is None else time)
+    
+    def _timestamp(self, positions: List[Tuple[int, int]], now: int) -> List[MouseSample]:
+        """
+        Привязать положения мыши ко времени
+        
+        События pygame не содержат времени, а очередь разбирается раз
+        в кадр, поэтому положения равномерно распределяются по интервалу
+        от предыдущего разбора очереди до текущего (now)
+        """
+        start = min(self._last_update_time, now)
+        self._last_update_time = now
+        
+        count = len(positions)
+        return [MouseSample(x, y, start + (now - start) * (i + 1) // count)
+                for i, (x, y) in enumerate(positions)]
     
     def is_key_pressed(self, key: int) -> bool:
         """Проверить нажата ли клавиша (удерживается)"""
@@ -92,17 +288,27 @@ class InputController:
         """Проверить была ли клавиша отпущена"""
         return self._keys_up.get(key, False)
     
-    def pixel_to_grid(self, pixel_x: int, pixel_y: int, cell_size: int) -> Tuple[int, int]:
+    def pixel_to_grid(self, pixel_x: int, pixel_y: int,
+                      cell_size: Optional[int] = None) -> Tuple[int, int]:
         """
         Преобразовать пиксельные координаты в координаты сетки
         
+        Используется то же преобразование окна просмотра (масштаб и сдвиг),
+        что и при отрисовке холста
+        
         Args:
             pixel_x, pixel_y: координаты в пикселях
-            cell_size: размер ячейки
+            cell_size: размер ячейки (без окна просмотра: холст в точке (0, 0);
+                       None и окна просмотра нет - Config.CELL_SIZE)
         
         Returns:
             Координаты в сетке (grid_x, grid_y)
         """
+        if cell_size is None:
+            if self._viewport is not None:
+                return self._viewport.screen_to_grid(pixel_x, pixel_y)
+            cell_size = Config.CELL_SIZE
+        
         grid_x = pixel_x // cell_size
         grid_y = pixel_y // cell_size
         return (grid_x, grid_y)
@@ -0,0 +1,286 @@
+# ========================================
+# convert.py
+# ========================================
+"""
+Пакетное преобразование проектов без окна: .txt, .pxp и .png
+
+Файлы (шаблоны glob раскрываются самим скриптом) распределяются
+по процессам; строка о каждом файле выводится сразу по готовности:
+    
+    python convert.py "projects/*.txt" --to png --scales 1 4 8
+    python convert.py "export/**/*.png" --to pxp --from-scale 4 --out-dir projects
+    python convert.py dragon.pxp --to txt
+
+Формат входного файла определяется по сигнатуре (.pxp) и расширению
+(.png), остальное читается как текстовый формат. В текстовом формате
+нет размеров - они задаются --size (по умолчанию размер сетки из Config).
+pygame загружается только для чтения и записи PNG
+"""
+
+import argparse
+import glob
+import multiprocessing
+import os
+import sys
+import time
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+# Дочерние процессы не должны печатать приветствие pygame
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from core import Config
+from models import Grid
+from utils import (
+    save_grid_to_file,
+    load_grid_from_file,
+    save_project_file,
+    load_project_file,
+    is_project_file,
+    export_to_png
+)
+
+
+# Форматы результата
+FORMATS = ('png', 'txt', 'pxp')
+
+
+class ConvertJob(NamedTuple):
+    """
+    Задание на преобразование одного файла
+    
+    Attributes:
+        source: входной файл
+        target_format: формат результата (см. FORMATS)
+        scales: масштабы PNG (для остальных форматов не используются)
+        size: размеры сетки для текстового формата (ширина, высота)
+        from_scale: масштаб входного PNG (пикселей на ячейку)
+        out_dir: папка результатов (None - рядом с входным файлом)
+    """
+    source: str
+    target_format: str
+    scales: Tuple[int, ...]
+    size: Tuple[int, int]
+    from_scale: int
+    out_dir: Optional[str]
+
+
+class ConvertResult(NamedTuple):
+    """Итог преобразования: созданные файлы или текст ошибки"""
+    source: str
+    outputs: List[str]
+    error: Optional[str]
+    seconds: float
+
+
+def read_grid(filepath: str, size: Tuple[int, int], from_scale: int = 1) -> Grid:
+    """
+    Прочитать файл проекта или изображение в сетку
+    
+    Args:
+        filepath: путь к .pxp, .png или .txt
+        size: размеры сетки для текстового формата
+        from_scale: масштаб PNG (пикселей на ячейку)
+    
+    Returns:
+        Сетка с содержимым файла (размер ячейки 1)
+    
+    Raises:
+        ValueError: файл не удалось прочитать
+    """
+    if is_project_file(filepath):
+        image = load_project_file(filepath)
+        if image is None:
+            raise ValueError("не удалось прочитать проект")
+        grid = Grid(image.width, image.height, 1)
+        grid.restore_state(image.to_pixels(image.width, image.height, grid.background_packed))
+        return grid
+    
+    if filepath.lower().endswith('.png'):
+        return _read_png(filepath, from_scale)
+    
+    width, height = size
+    columns = load_grid_from_file(filepath, width, height)
+    if columns is None:
+        raise ValueError("не удалось прочитать текстовый файл")
+    grid = Grid(width, height, 1)
+    grid.restore_state(columns)
+    return grid
+
+
+def _read_png(filepath: str, scale: int) -> Grid:
+    """Прочитать PNG: ячейка - левый верхний пиксель каждого квадрата scale x scale"""
+    import pygame as pg
+    
+    image = pg.image.load(filepath)
+    image_width, image_height = image.get_size()
+    width, height = image_width // scale, image_height // scale
+    if width == 0 or height == 0:
+        raise ValueError(f"изображение {image_width}x{image_height} меньше масштаба {scale}")
+    
+    data = pg.image.tobytes(image, 'RGB')
+    row_bytes = image_width * 3
+    step = scale * 3
+    pixels = []
+    for y in range(height):
+        start = y * scale * row_bytes
+        row = data[start:start + width * step]
+        pixels.extend((r << 16) | (g << 8) | b
+                      for r, g, b in zip(row[0::step], row[1::step], row[2::step]))
+    
+    grid = Grid(width, height, 1)
+    grid.restore_state(pixels)
+    return grid
+
+
+def write_grid(grid: Grid, filepath: str, target_format: str, scale: int = 1) -> bool:
+    """
+    Записать сетку в файл
+    
+    Args:
+        grid: сетка
+        filepath: путь результата
+        target_format: 'png', 'txt' или 'pxp'
+        scale: масштаб PNG
+    
+    Returns:
+        True если успешно записано
+    """
+    if target_format == 'png':
+        from ui import grid_to_surface
+        return export_to_png(grid_to_surface(grid), filepath, scale)
+    if target_format == 'txt':
+        return save_grid_to_file(grid.get_columns(), filepath)
+    return save_project_file(filepath, grid.width, grid.height, pixels=grid.pixels)
+
+
+def output_paths(job: ConvertJob) -> List[Tuple[str, int]]:
+    """
+    Пути результатов задания
+    
+    PNG с масштабом больше 1 получает суффикс _x<масштаб>
+    
+    Returns:
+        Список (путь, масштаб)
+    """
+    folder = job.out_dir if job.out_dir is not None else os.path.dirname(job.source)
+    stem = os.path.splitext(os.path.basename(job.source))[0]
+    if job.target_format != 'png':
+        return [(os.path.join(folder, f"{stem}.{job.target_format}"), 1)]
+    return [(os.path.join(folder, f"{stem}_x{scale}.png" if scale > 1 else f"{stem}.png"), scale)
+            for scale in job.scales]
+
+
+def convert_file(job: ConvertJob) -> ConvertResult:
+    """
+    Выполнить задание (вызывается в дочернем процессе)
+    
+    Returns:
+        Итог; исключения не выходят наружу, а попадают в error
+    """
+    start = time.perf_counter()
+    outputs = []
+    try:
+        targets = output_paths(job)
+        if any(os.path.abspath(path) == os.path.abspath(job.source) for path, _ in targets):
+            raise ValueError("результат совпадает с входным файлом")
+        
+        grid = read_grid(job.source, job.size, job.from_scale)
+        for path, scale in targets:
+            if not write_grid(grid, path, job.target_format, scale):
+                raise ValueError(f"не удалось записать {path}")
+            outputs.append(path)
+        error = None
+    except Exception as e:
+        error = str(e) or type(e).__name__
+    return ConvertResult(job.source, outputs, error, time.perf_counter() - start)
+
+
+def expand_inputs(patterns: List[str]) -> List[str]:
+    """
+    Раскрыть шаблоны glob (в том числе **) без повторов
+    
+    Строка без совпадений остается как есть - ошибка чтения
+    попадет в итог ее задания
+    """
+    paths: List[str] = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            if path not in paths and not os.path.isdir(path):
+                paths.append(path)
+    return paths
+
+
+def run_jobs(jobs: List[ConvertJob], processes: int) -> Iterator[ConvertResult]:
+    """
+    Выполнить задания, выдавая итоги по мере готовности
+    
+    Args:
+        jobs: задания
+        processes: число процессов (1 - без пула, в текущем процессе)
+    """
+    if processes <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            yield convert_file(job)
+        return
+    
+    with multiprocessing.Pool(min(processes, len(jobs))) as pool:
+        yield from pool.imap_unordered(convert_file, jobs)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Пакетное преобразование проектов Pixelart Editor")
+    parser.add_argument('inputs', nargs='+', help="файлы или шаблоны glob (\"projects/*.txt\")")
+    parser.add_argument('--to', dest='target_format', choices=FORMATS, required=True,
+                        help="формат результата")
+    parser.add_argument('--scales', type=int, nargs='+', default=[Config.EXPORT_SCALE],
+                        help="масштабы PNG, пикселей на ячейку")
+    parser.add_argument('--size', type=int, nargs=2, metavar=('WIDTH', 'HEIGHT'),
+                        default=[Config.GRID_WIDTH, Config.GRID_HEIGHT],
+                        help="размеры сетки текстовых файлов")
+    parser.add_argument('--from-scale', type=int, default=1,
+                        help="масштаб входных PNG, пикселей на ячейку")
+    parser.add_argument('--out-dir', help="папка результатов (по умолчанию - рядом с входными)")
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                        help="число процессов")
+    args = parser.parse_args(argv)
+    
+    if min(args.scales) < 1 or args.from_scale < 1:
+        parser.error("масштаб должен быть не меньше 1")
+    if min(args.size) < 1:
+        parser.error("размеры сетки должны быть не меньше 1")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    sources = expand_inputs(args.inputs)
+    if not sources:
+        print("Нет файлов для преобразования")
+        return 1
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+    
+    jobs = [ConvertJob(source, args.target_format, tuple(args.scales), tuple(args.size),
+                       args.from_scale, args.out_dir) for source in sources]
+    
+    start = time.perf_counter()
+    failed = 0
+    width = len(str(len(jobs)))
+    for done, result in enumerate(run_jobs(jobs, args.jobs), 1):
+        prefix = f"[{done:>{width}}/{len(jobs)}]"
+        if result.error is not None:
+            failed += 1
+            print(f"{prefix} ✗ {result.source}: {result.error}", flush=True)
+        else:
+            outputs = ", ".join(os.path.basename(path) for path in result.outputs)
+            print(f"{prefix} {result.source} -> {outputs} ({result.seconds * 1000:.0f} мс)", flush=True)
+    
+    print(f"\nГотово: {len(jobs) - failed} из {len(jobs)} файлов за {time.perf_counter() - start:.1f} с")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
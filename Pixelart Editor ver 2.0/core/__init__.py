@@ -7,16 +7,37 @@
 Содержит:
 - Config: конфигурация приложения
 - Application: главный класс приложения (Singleton)
+- StartupProfile: профиль запуска (время импорта и инициализации)
+- FrameProfiler: профиль кадров (фазы главного цикла, трасса)
+- ReplayReport, canvas_hash: итоги воспроизведения записи ввода
+
+Application импортируется при первом обращении: вместе с ним
+загружаются pygame и весь UI, а Config и профили нужны раньше
 """
 
 from .config import Config
-from .application import Application
+from .startup_profile import StartupProfile
+from .frame_profiler import FrameProfiler, FrameStats
+from .replay import ReplayReport, canvas_hash
 
 __all__ = [
     'Config',
     'Application',
+    'StartupProfile',
+    'FrameProfiler',
+    'FrameStats',
+    'ReplayReport',
+    'canvas_hash',
 ]
 
+
+def __getattr__(name: str):
+    """Отложенный импорт Application (PEP 562)"""
+    if name == 'Application':
+        from .application import Application
+        return Application
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 __version__ = '1.0.0'
 __author__ = 'Pixelart Editor Team'
 __description__ = 'Core application module'
\ No newline at end of file
@@ -5,13 +5,29 @@
 
 import pygame as pg
 import sys
+import time
+from contextlib import nullcontext
 from typing import Optional
 
 from models import Grid, PaletteManager
 from tools import ToolManager
-from controllers import InputController, FileController, CanvasController
-from ui import Button, Slider, ColorPicker, Toolbar
+from controllers import InputController, FileController, CanvasController, record_event, replay_event
+from controllers.file_controller import TASK_SAVE, TASK_LOAD, TASK_EXPORT
+from ui import (Button, Slider, ColorPicker, Toolbar, Viewport, GridRenderer, ProgressIndicator,
+                ProfilerOverlay, get_font, render_text)
 from .config import Config
+from .startup_profile import StartupProfile
+from .frame_profiler import FrameProfiler
+from .replay import ReplayReport, canvas_hash
+from utils import InputRecording, RecordedFrame, save_recording
+
+
+# Подписи индикатора для фоновых операций с файлами
+FILE_TASK_LABELS = {
+    TASK_SAVE: "Сохранение",
+    TASK_LOAD: "Загрузка",
+    TASK_EXPORT: "Экспорт",
+}
 
 
 class Application:
@@ -22,46 +38,96 @@ class Application:
     
     _instance: Optional['Application'] = None
     
-    def __new__(cls):
+    def __new__(cls, profile: Optional[StartupProfile] = None, trace_path: Optional[str] = None,
+                record_path: Optional[str] = None):
         """Реализация паттерна Singleton"""
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
     
-    def __init__(self):
-        """Инициализация приложения"""
+    def __init__(self, profile: Optional[StartupProfile] = None, trace_path: Optional[str] = None,
+                 record_path: Optional[str] = None):
+        """
+        Инициализация приложения
+        
+        Args:
+            profile: профиль запуска - этапы инициализации замеряются,
+                     отчет печатается после первого кадра
+            trace_path: файл трассы кадров - запись идет с запуска
+                        и сохраняется при выходе
+            record_path: файл записи ввода - ввод каждого кадра
+                         записывается и сохраняется при выходе
+        """
         if hasattr(self, '_initialized'):
             return
         
         self._initialized = True
+        self._profile = profile
+        
+        # Профиль кадров (F3 - статистика, F4 - запись трассы)
+        self._frame_profiler = FrameProfiler()
+        self._trace_path = trace_path
+        if trace_path is not None:
+            self._frame_profiler.start_trace()
         
         # Инициализация Pygame
-        pg.init()
+        with self._measure("pygame.init"):
+            pg.init()
         
         # Создание окна
-        self._screen = pg.display.set_mode((Config.SCREEN_WIDTH, Config.SCREEN_HEIGHT))
-        pg.display.set_caption(Config.WINDOW_TITLE)
+        with self._measure("окно"):
+            self._screen = pg.display.set_mode((Config.SCREEN_WIDTH, Config.SCREEN_HEIGHT))
+            pg.display.set_caption(Config.WINDOW_TITLE)
+        
+        # В очередь попадают только обрабатываемые события
+        with self._measure("очередь событий"):
+            InputController.restrict_event_queue((pg.QUIT, pg.VIDEOEXPOSE, pg.WINDOWEXPOSED))
         
-        # Загрузка иконок
-        self._load_icons()
+        # Иконка окна; иконки инструментов - после первого кадра
+        with self._measure("иконка окна"):
+            self._load_window_icon()
+        self._has_icons = False
         
         # Часы для FPS
         self._clock = pg.time.Clock()
         self._running = False
         
+        # Состояние отрисовки (dirty rectangles)
+        self._needs_full_redraw = True
+        self._rendered_color = None  # упакованный цвет на индикаторе палитры
+        self._rendered_filename = None
+        
         # Инициализация компонентов
         self._init_components()
+        
+        # Запись ввода для воспроизведения (--record)
+        self._record_path = record_path
+        self._recording: Optional[InputRecording] = None
+        if record_path is not None:
+            self._recording = InputRecording(self._grid.width, self._grid.height)
     
-    def _load_icons(self):
-        """Загрузка иконок для инструментов"""
+    def _measure(self, name: str):
+        """Замер этапа инициализации (без профиля - пустой контекст)"""
+        if self._profile is None:
+            return nullcontext()
+        return self._profile.measure("init", name)
+    
+    def _load_window_icon(self):
+        """Загрузка иконки окна"""
         try:
-            # Иконка окна
             icon = pg.image.load("assets/icon.png")
             pg.display.set_icon(icon)
         except:
             pass
+    
+    def _load_icons(self):
+        """
+        Загрузка иконок для инструментов
         
-        # Иконки инструментов
+        Исходные изображения крупные, и их декодирование заметно
+        задерживает запуск, поэтому иконки загружаются после первого
+        кадра; кнопки перерисуются с ними в следующем кадре
+        """
         try:
             self._icon_brush = pg.transform.scale(pg.image.load("assets/brush.png"), (22, 22))
             self._icon_eraser = pg.transform.scale(pg.image.load("assets/eraser.png"), (22, 22))
@@ -73,26 +139,48 @@ class Application:
             print("   Создайте папку assets/ и поместите туда:")
             print("   - icon.png, brush.png, eraser.png, fill.png, eyedropper.png")
             self._has_icons = False
+            return
+        
+        self._btn_brush.set_icon(self._icon_brush)
+        self._btn_eraser.set_icon(self._icon_eraser)
+        self._btn_fill.set_icon(self._icon_fill)
+        self._btn_eyedropper.set_icon(self._icon_eyedropper)
     
     def _init_components(self):
         """Инициализация всех компонентов"""
-        # Models
-        self._grid = Grid(Config.GRID_WIDTH, Config.GRID_HEIGHT, Config.CELL_SIZE)
-        self._palette_manager = PaletteManager()
-        
-        # Tools
-        self._tool_manager = ToolManager()
+        with self._measure("модели и инструменты"):
+            self._init_models()
         
         # Controllers
-        self._input_controller = InputController()
+        self._input_controller = InputController(self._viewport)
         self._file_controller = FileController()
         self._canvas_controller = CanvasController(self._grid, self._tool_manager)
         
         # UI Components
-        self._init_ui()
+        with self._measure("UI"):
+            self._init_ui()
         
         # Устанавливаем начальный цвет
-        self._canvas_controller.current_color = self._palette_manager.current_palette.selected_color
+        self._canvas_controller.current_color = self._palette_manager.current_palette.selected_value
+    
+    def _init_models(self):
+        """Инициализация моделей, инструментов и окна просмотра"""
+        # Models
+        self._grid = Grid.create(Config.GRID_WIDTH, Config.GRID_HEIGHT, Config.CELL_SIZE,
+                                 tiled=Config.TILED_CANVAS, tile_size=Config.TILE_SIZE)
+        self._grid.history.set_limits(max_history=Config.HISTORY_MAX_ACTIONS,
+                                      memory_budget=Config.HISTORY_MEMORY_BUDGET,
+                                      hot_entries=Config.HISTORY_HOT_ACTIONS)
+        self._grid_renderer = GridRenderer.for_grid(self._grid)
+        self._palette_manager = PaletteManager()
+        
+        # Tools
+        self._tool_manager = ToolManager()
+        
+        # Окно просмотра холста (масштаб и панорамирование)
+        self._viewport = Viewport((0, 0, Config.CANVAS_VIEW_WIDTH, Config.CANVAS_VIEW_HEIGHT),
+                                  self._grid.width, self._grid.height,
+                                  Config.CELL_SIZE, Config.ZOOM_LEVELS)
     
     def _init_ui(self):
         """Инициализация UI компонентов"""
@@ -123,16 +211,40 @@ class Application:
         # Слайдеры размера (сдвинуты правее)
         # Боковая панель: 768-960 (ширина 192px)
         # Центр слайдера: 875, трек 120px → начало 815, конец 935
-        self._slider_brush = Slider(875, 305, 10, 20, 1, 5, 3, "Размер кисти")
-        self._slider_eraser = Slider(875, 225, 10, 20, 1, 5, 3, "Размер ластика")
+        self._slider_brush = Slider(875, 305, 10, 20, 1, Config.MAX_TOOL_SIZE, 3, "Размер кисти")
+        self._slider_eraser = Slider(875, 225, 10, 20, 1, Config.MAX_TOOL_SIZE, 3, "Размер ластика")
+        
+        # Масштаб экспорта PNG (нижняя панель, правее имени файла)
+        self._slider_export = Slider(800, 805, 10, 20, 1, Config.EXPORT_MAX_SCALE,
+                                     Config.EXPORT_SCALE, "Масштаб экспорта")
+        
+        # Индикатор фоновых операций с файлами (на месте имени файла)
+        self._progress = ProgressIndicator(*self._get_filename_rect())
+        
+        # Статистика кадров в углу холста
+        self._profiler_overlay = ProfilerOverlay(8, 8)
         
         # Палитра цветов
         self._color_picker = ColorPicker(784, 405, cell_size=20)
         self._color_picker.set_colors(self._palette_manager.current_palette.colors)
         
+        # Компоненты, сообщающие об изменениях (для частичной перерисовки)
+        self._ui_components = [
+            self._btn_save, self._btn_load, self._btn_export,
+            *self._tool_buttons,
+            self._slider_brush, self._slider_eraser, self._slider_export,
+            self._color_picker,
+        ]
+        
         # Шрифты
-        self._font = pg.font.SysFont(None, 30)
-        self._small_font = pg.font.SysFont(None, 25)
+        self._font = get_font(None, 30)
+        self._small_font = get_font(None, 25)
+        
+        # Неизменная часть UI рисуется один раз; кнопки собирают
+        # вид своих состояний поверх нее
+        self._static_ui = self._build_static_ui()
+        for button in (self._btn_save, self._btn_load, self._btn_export, *self._tool_buttons):
+            button.set_background(self._static_ui)
     
     def _select_tool(self, tool_index: int):
         """Выбрать инструмент"""
@@ -144,47 +256,88 @@ class Application:
     
     def _on_save_click(self):
         """Обработка клика по кнопке Save"""
-        self._file_controller.save_project(self._grid)
+        self._file_controller.request_save(self._grid)
     
     def _on_load_click(self):
         """Обработка клика по кнопке Load"""
-        self._file_controller.load_project(self._grid)
+        self._file_controller.request_load(self._grid)
     
     def _on_export_click(self):
         """Обработка клика по кнопке Export"""
-        region = (4, 4, Config.GRID_WIDTH * Config.CELL_SIZE, Config.GRID_HEIGHT * Config.CELL_SIZE)
-        self._file_controller.export_image(self._screen, region)
+        self._file_controller.request_export(self._grid, self._slider_export.value)
     
-    def _handle_events(self):
-        """Обработка событий"""
+    def _handle_events(self, first_event: Optional[pg.event.Event] = None):
+        """
+        Обработка событий
+        
+        Args:
+            first_event: событие, полученное при ожидании в простое
+        """
         events = pg.event.get()
+        if first_event is not None:
+            events.insert(0, first_event)
         
+        if self._recording is None:
+            self._process_events(events)
+            return
+        
+        # Записываются ровно те положение мыши и время, что получит контроллер ввода
+        mouse_pos = pg.mouse.get_pos()
+        time_ms = pg.time.get_ticks()
+        recorded = [record_event(event) for event in events]
+        self._recording.add_frame(time_ms, mouse_pos, [event for event in recorded if event is not None])
+        self._process_events(events, mouse_pos, time_ms)
+    
+    def _replay_events(self, frame: RecordedFrame):
+        """
+        Обработка событий кадра из записи ввода
+        
+        Args:
+            frame: записанный кадр
+        """
+        self._process_events([replay_event(event) for event in frame.events],
+                             frame.mouse_pos, frame.time)
+    
+    def _process_events(self, events: list, mouse_pos: Optional[tuple] = None,
+                        time_ms: Optional[int] = None):
+        """
+        Обработать события кадра
+        
+        Args:
+            events: события pygame
+            mouse_pos: положение мыши (по умолчанию - текущее)
+            time_ms: время кадра (по умолчанию - текущее)
+        """
         for event in events:
             if event.type == pg.QUIT:
                 self._running = False
             
             elif event.type == pg.KEYDOWN:
                 self._handle_keydown(event)
+            
+            elif event.type in (pg.VIDEOEXPOSE, pg.WINDOWEXPOSED):
+                # Содержимое окна потеряно - перерисовываем целиком
+                self._needs_full_redraw = True
         
         # Обновляем контроллер ввода
-        self._input_controller.update(events)
+        self._input_controller.update(events, mouse_pos, time_ms)
     
     def _handle_keydown(self, event):
         """Обработка нажатий клавиш"""
         # Ctrl+S - Сохранить
-        if event.key == pg.K_s and pg.key.get_mods() & pg.KMOD_CTRL:
-            self._file_controller.quick_save(self._grid)
+        if event.key == pg.K_s and event.mod & pg.KMOD_CTRL:
+            self._file_controller.request_quick_save(self._grid)
         
         # Ctrl+Z - Отменить
-        elif event.key == pg.K_z and pg.key.get_mods() & pg.KMOD_CTRL:
+        elif event.key == pg.K_z and event.mod & pg.KMOD_CTRL:
             self._canvas_controller.undo()
         
         # Ctrl+Y - Повторить
-        elif event.key == pg.K_y and pg.key.get_mods() & pg.KMOD_CTRL:
+        elif event.key == pg.K_y and event.mod & pg.KMOD_CTRL:
             self._canvas_controller.redo()
         
         # Ctrl+Space - Очистить
-        elif event.key == pg.K_SPACE and pg.key.get_mods() & pg.KMOD_CTRL:
+        elif event.key == pg.K_SPACE and event.mod & pg.KMOD_CTRL:
             self._canvas_controller.clear_canvas()
         
         # Клавиши быстрого выбора инструментов
@@ -196,9 +349,79 @@ class Application:
             self._select_tool(2)  # Fill
         elif event.key == pg.K_i:
             self._select_tool(3)  # Eyedropper
+        
+        # Масштаб и панорамирование холста
+        elif event.key in (pg.K_EQUALS, pg.K_PLUS, pg.K_KP_PLUS):
+            self._viewport.zoom_in()
+        elif event.key in (pg.K_MINUS, pg.K_KP_MINUS):
+            self._viewport.zoom_out()
+        elif event.key == pg.K_0:
+            self._viewport.reset()
+        elif event.key == pg.K_LEFT:
+            self._viewport.pan(Config.PAN_STEP, 0)
+        elif event.key == pg.K_RIGHT:
+            self._viewport.pan(-Config.PAN_STEP, 0)
+        elif event.key == pg.K_UP:
+            self._viewport.pan(0, Config.PAN_STEP)
+        elif event.key == pg.K_DOWN:
+            self._viewport.pan(0, -Config.PAN_STEP)
+        
+        # Профиль кадров
+        elif event.key == pg.K_F3:
+            self._toggle_profiler_overlay()
+        elif event.key == pg.K_F4:
+            self._toggle_trace()
+    
+    def _toggle_profiler_overlay(self):
+        """Показать или скрыть статистику кадров"""
+        visible = self._profiler_overlay.toggle()
+        self._frame_profiler.set_collecting(visible)
+    
+    def _toggle_trace(self):
+        """Начать запись трассы или закончить и сохранить ее"""
+        profiler = self._frame_profiler
+        if not profiler.tracing:
+            profiler.start_trace()
+            print("Запись трассы кадров...")
+            return
+        
+        profiler.stop_trace()
+        self._save_trace(self._trace_path or time.strftime("trace_%Y%m%d_%H%M%S.json"))
+    
+    def _save_trace(self, filepath: str):
+        """Сохранить записанную трассу кадров"""
+        profiler = self._frame_profiler
+        try:
+            profiler.save_trace(filepath)
+        except OSError as e:
+            print(f"Ошибка сохранения трассы: {e}")
+            return
+        
+        print(f"Трасса сохранена: {filepath} (событий: {profiler.trace_event_count})")
+        if profiler.dropped_events:
+            print(f"   отброшено событий сверх предела: {profiler.dropped_events}")
+    
+    def _update_file_tasks(self):
+        """Применить завершенные операции с файлами и обновить индикатор"""
+        file_controller = self._file_controller
+        # Загрузка посреди штриха заменила бы холст и сбросила запись
+        # действия для Undo - результаты ждут, пока штрих не закончится
+        # (до тех пор busy остается True и индикатор не гаснет)
+        if not self._canvas_controller.is_drawing:
+            file_controller.process_results(self._grid)
+        
+        if file_controller.busy:
+            self._progress.start(FILE_TASK_LABELS.get(file_controller.current_task, "Обработка"))
+            self._progress.update(file_controller.worker.elapsed)
+        elif self._progress.active:
+            self._progress.stop()
+            # На месте индикатора снова выводится имя файла
+            self._rendered_filename = None
     
     def _update(self):
         """Обновление логики"""
+        self._update_file_tasks()
+        
         mouse_pos = self._input_controller.mouse_pos
         mouse_pressed = self._input_controller.left_mouse_pressed
         mouse_clicked = self._input_controller.left_mouse_clicked
@@ -213,6 +436,7 @@ class Application:
         
         self._slider_brush.update(mouse_pos, mouse_pressed)
         self._slider_eraser.update(mouse_pos, mouse_pressed)
+        self._slider_export.update(mouse_pos, mouse_pressed)
         
         # Обновляем размеры инструментов
         self._tool_manager.get_brush().size = self._slider_brush.value
@@ -223,119 +447,296 @@ class Application:
         if selected_color:
             self._canvas_controller.current_color = selected_color
         
-        # Рисование на холсте
-        if mouse_pos[0] < Config.GRID_WIDTH * Config.CELL_SIZE and \
-           mouse_pos[1] < Config.GRID_HEIGHT * Config.CELL_SIZE:
-            
-            grid_x, grid_y = self._input_controller.pixel_to_grid(
-                mouse_pos[0], mouse_pos[1], Config.CELL_SIZE
-            )
+        # Масштаб колесом мыши (относительно курсора) и сдвиг средней кнопкой
+        if self._input_controller.wheel and self._viewport.contains(*mouse_pos):
+            if self._input_controller.wheel > 0:
+                self._viewport.zoom_in(mouse_pos)
+            else:
+                self._viewport.zoom_out(mouse_pos)
+        
+        if self._input_controller.middle_mouse_pressed:
+            self._viewport.pan(*self._input_controller.mouse_rel)
+        
+        # Рисование на холсте: штрих начинается нажатием на холсте, и
+        # каждое положение мыши с нажатой кнопкой продолжает его, поэтому
+        # быстрое движение не оставляет разрывов
+        path = self._input_controller.mouse_path
+        if self._input_controller.left_mouse_clicked:
+            if self._canvas_controller.is_drawing:
+                self._canvas_controller.stop_drawing()
+            if path and self._viewport.contains(*path[0]):
+                self._canvas_controller.start_drawing()
+        
+        if self._canvas_controller.is_drawing:
+            old_value = self._canvas_controller.current_value
+            tool_phase = f"инструмент {self._tool_manager.current_tool.name}"
             
-            if mouse_pressed:
-                if not self._canvas_controller._is_drawing:
-                    self._canvas_controller.start_drawing()
+            for pos in path:
+                if not self._viewport.contains(*pos):
+                    # Вне холста перо поднимается до возвращения курсора
+                    self._canvas_controller.lift_pen()
+                    continue
                 
-                # Сохраняем старый цвет
-                old_color = self._canvas_controller.current_color
-                
-                # Рисуем
-                self._canvas_controller.draw_at(grid_x, grid_y)
-                
-                # Если цвет изменился (пипетка) - обновляем индикатор
-                if self._canvas_controller.current_color != old_color:
-                    self._color_picker.set_selected_color(self._canvas_controller.current_color)
-                    
-            else:
-                if self._canvas_controller._is_drawing:
-                    self._canvas_controller.stop_drawing()
+                grid_x, grid_y = self._input_controller.pixel_to_grid(pos[0], pos[1])
+                with self._frame_profiler.phase(tool_phase):
+                    self._canvas_controller.stroke_to(grid_x, grid_y)
+            
+            # Если цвет изменился (пипетка) - обновляем индикатор
+            if self._canvas_controller.current_value != old_value:
+                self._color_picker.set_selected_color(self._canvas_controller.current_color)
+            
+            # Кнопку отпустили (на холсте или за его пределами) - штрих закончен
+            if not mouse_pressed:
+                self._canvas_controller.stop_drawing()
     
     def _render(self):
-        """Отрисовка"""
-        # Очищаем экран
+        """
+        Отрисовка
+        
+        Полностью экран перерисовывается только в первом кадре (и после
+        потери содержимого окна). Дальше перерисовываются лишь измененные
+        ячейки холста и UI, а на дисплей отправляются только их прямоугольники
+        """
+        if self._needs_full_redraw:
+            self._render_full()
+            return
+        
+        profiler = self._frame_profiler
+        dirty_rects = []
+        
+        # Под статистикой кадров - прежнее содержимое холста
+        overlay_rect = self._profiler_overlay.clear(self._screen)
+        if overlay_rect is not None:
+            dirty_rects.append(overlay_rect)
+        
+        # Измененные ячейки холста
+        with profiler.phase("холст"):
+            dirty_rects.extend(self._render_canvas())
+        
+        # Изменившиеся элементы UI
+        if self._ui_has_damage():
+            with profiler.phase("интерфейс"):
+                dirty_rects.extend(self._render_ui())
+        
+        overlay_rect = self._render_profiler_overlay()
+        if overlay_rect is not None:
+            dirty_rects.append(overlay_rect)
+        
+        # Обновляем только измененные области дисплея
+        if dirty_rects:
+            with profiler.phase("дисплей"):
+                pg.display.update(dirty_rects)
+    
+    def _render_full(self):
+        """Полная перерисовка всего окна"""
+        profiler = self._frame_profiler
+        
+        # Очищаем экран (сохраненный участок под статистикой устарел)
+        self._profiler_overlay.clear(self._screen)
         self._screen.fill(Config.BG_COLOR)
         
         # Отрисовка сетки
-        self._grid.render(self._screen)
+        with profiler.phase("холст"):
+            self._render_canvas(full=True)
         
-        # Отрисовка стен/границ
-        self._draw_walls()
+        # Отрисовка UI (вместе со стенами/границами)
+        with profiler.phase("интерфейс"):
+            self._render_ui(full=True)
         
-        # Отрисовка UI
-        self._render_ui()
+        self._render_profiler_overlay()
         
         # Обновляем дисплей
-        pg.display.flip()
+        with profiler.phase("дисплей"):
+            pg.display.flip()
+        self._needs_full_redraw = False
+    
+    def _render_profiler_overlay(self) -> Optional[pg.Rect]:
+        """
+        Нарисовать статистику кадров поверх холста
+        
+        Returns:
+            Область панели или None, если панель скрыта
+        """
+        if not self._profiler_overlay.visible:
+            return None
+        
+        self._screen.set_clip(self._get_canvas_rect())
+        rect = self._profiler_overlay.render(self._screen, self._frame_profiler.stats())
+        self._screen.set_clip(None)
+        return rect
+    
+    def _render_canvas(self, full: bool = False) -> list:
+        """
+        Отрисовать холст через окно просмотра
+        
+        Посещаются только видимые ячейки; при смене масштаба или сдвига
+        видимая часть перерисовывается целиком
+        
+        Args:
+            full: перерисовать всю видимую часть холста
+        
+        Returns:
+            Список перерисованных областей экрана
+        """
+        canvas_rect = self._get_canvas_rect()
+        full = self._viewport.pop_changed() or full
+        
+        self._screen.set_clip(canvas_rect)
+        if full:
+            self._screen.fill(Config.CANVAS_BACKDROP_COLOR, canvas_rect)
+        
+        origin_x, origin_y = self._viewport.origin
+        rects = self._grid_renderer.render(self._screen, origin_x, origin_y, full=full,
+                                           cell_size=self._viewport.zoom,
+                                           visible_rect=self._viewport.visible_cells())
+        self._screen.set_clip(None)
+        self._frame_profiler.add_cells(self._grid_renderer.rendered_cells)
+        
+        if full:
+            return [canvas_rect]
+        return [rect.clip(canvas_rect) for rect in rects]
+    
+    def _get_canvas_rect(self) -> pg.Rect:
+        """Видимая область холста (без нижней границы)"""
+        return pg.Rect(0, 0, Config.CANVAS_VIEW_WIDTH, Config.CANVAS_VIEW_HEIGHT - Config.WALL_THICKNESS)
+    
+    def _get_ui_rects(self) -> list:
+        """Области окна, занятые UI (боковая и нижняя панели)"""
+        grid_pixel_width, grid_pixel_height = Config.CANVAS_VIEW_WIDTH, Config.CANVAS_VIEW_HEIGHT
+        return [
+            pg.Rect(grid_pixel_width, 0, Config.SCREEN_WIDTH - grid_pixel_width, grid_pixel_height),
+            pg.Rect(0, grid_pixel_height - Config.WALL_THICKNESS,
+                    Config.SCREEN_WIDTH, Config.SCREEN_HEIGHT - grid_pixel_height + Config.WALL_THICKNESS),
+        ]
     
-    def _draw_walls(self):
-        """Отрисовка границ областей"""
-        grid_pixel_width = Config.GRID_WIDTH * Config.CELL_SIZE
-        grid_pixel_height = Config.GRID_HEIGHT * Config.CELL_SIZE
+    def _ui_has_damage(self) -> bool:
+        """Изменилось ли что-нибудь в UI с последней отрисовки"""
+        filename = self._file_controller.current_filename or "unnamed"
+        return (any(component.is_dirty for component in self._ui_components)
+                or self._canvas_controller.current_value != self._rendered_color
+                or self._progress.is_dirty
+                or (not self._progress.active and filename != self._rendered_filename))
+    
+    def _build_static_ui(self) -> pg.Surface:
+        """
+        Собрать неизменную часть UI в одну поверхность
         
-        # Боковая панель
-        pg.draw.rect(self._screen, Config.SIDEBAR_COLOR, 
-                    (grid_pixel_width, 0, Config.SCREEN_WIDTH - grid_pixel_width, grid_pixel_height))
+        Панели, границы, заголовки и фоны групп не зависят от состояния,
+        поэтому рисуются один раз; дальше под элементами UI копируется
+        нужный участок этого слоя
         
-        # Нижняя панель
-        pg.draw.rect(self._screen, Config.BOTTOM_BAR_COLOR,
-                    (0, grid_pixel_height, Config.SCREEN_WIDTH, Config.SCREEN_HEIGHT - grid_pixel_height))
+        Returns:
+            Поверхность размером с окно
+        """
+        surface = pg.Surface(self._screen.get_size()).convert()
+        surface.fill(Config.BG_COLOR)
         
-        # Границы
-        wall_thickness = 4
-        pg.draw.rect(self._screen, Config.WALL_COLOR,
-                    (grid_pixel_width, 0, wall_thickness, grid_pixel_height))
-        pg.draw.rect(self._screen, Config.WALL_COLOR,
-                    (0, grid_pixel_height - wall_thickness, Config.SCREEN_WIDTH, wall_thickness))
-    
-    def _render_ui(self):
-        """Отрисовка UI элементов"""
-        # Кнопки файлов
-        self._btn_save.render(self._screen)
-        self._btn_load.render(self._screen)
-        self._btn_export.render(self._screen)
+        # Панели и границы
+        self._draw_walls(surface)
         
-        # Заголовок инструментов
-        tools_title = self._small_font.render("Инструменты", True, (50, 50, 50))
-        self._screen.blit(tools_title, (779, 30))
+        # Заголовки групп
+        for title, pos in (("Инструменты", (779, 30)),
+                           ("Настройки размера", (779, 170)),
+                           ("Палитра", (779, 380))):
+            surface.blit(render_text(self._small_font, title, (50, 50, 50)), pos)
         
         # Фон панели инструментов
-        pg.draw.rect(self._screen, (180, 180, 180), (779, 50, 170, 100))
+        pg.draw.rect(surface, (180, 180, 180), (779, 50, 170, 100))
         
-        # Кнопки инструментов
-        for btn in self._tool_buttons:
-            btn.render(self._screen)
-        
-        # ИКОНКИ на кнопках инструментов
-        if self._has_icons:
-            self._screen.blit(self._icon_brush, (self._btn_brush._x + 4, self._btn_brush._y + 4))
-            self._screen.blit(self._icon_eraser, (self._btn_eraser._x + 4, self._btn_eraser._y + 4))
-            self._screen.blit(self._icon_fill, (self._btn_fill._x + 4, self._btn_fill._y + 4))
-            self._screen.blit(self._icon_eyedropper, (self._btn_eyedropper._x + 4, self._btn_eyedropper._y + 4))
+        # Фон палитры
+        pg.draw.rect(surface, (200, 200, 200), (779, 400, 170, 350))
         
-        # Заголовок настроек размера
-        size_title = self._small_font.render("Настройки размера", True, (50, 50, 50))
-        self._screen.blit(size_title, (779, 170))
+        # Фон для имени файла (БЕЛЫЙ)
+        pg.draw.rect(surface, (255, 255, 255), self._get_filename_rect())
         
-        # Слайдеры
-        self._slider_brush.render(self._screen)
-        self._slider_eraser.render(self._screen)
+        return surface
+    
+    def _get_filename_rect(self) -> pg.Rect:
+        """Область имени файла в нижней панели"""
+        return pg.Rect(310, 790, 370, 40)
+    
+    def _draw_walls(self, surface: pg.Surface):
+        """
+        Отрисовка границ областей
         
-        # Заголовок палитры
-        palette_title = self._small_font.render("Палитра", True, (50, 50, 50))
-        self._screen.blit(palette_title, (779, 380))
+        Args:
+            surface: поверхность для рисования
+        """
+        grid_pixel_width = Config.CANVAS_VIEW_WIDTH
+        grid_pixel_height = Config.CANVAS_VIEW_HEIGHT
         
-        # Фон палитры
-        pg.draw.rect(self._screen, (200, 200, 200), (779, 400, 170, 350))
+        # Боковая панель
+        pg.draw.rect(surface, Config.SIDEBAR_COLOR, 
+                    (grid_pixel_width, 0, Config.SCREEN_WIDTH - grid_pixel_width, grid_pixel_height))
         
-        # Палитра (передаем текущий цвет для индикатора)
-        self._color_picker.render(self._screen, self._canvas_controller.current_color)
+        # Нижняя панель
+        pg.draw.rect(surface, Config.BOTTOM_BAR_COLOR,
+                    (0, grid_pixel_height, Config.SCREEN_WIDTH, Config.SCREEN_HEIGHT - grid_pixel_height))
         
-        # Фон для имени файла (БЕЛЫЙ)
-        pg.draw.rect(self._screen, (255, 255, 255), (310, 790, 370, 40))
+        # Границы
+        wall_thickness = Config.WALL_THICKNESS
+        pg.draw.rect(surface, Config.WALL_COLOR,
+                    (grid_pixel_width, 0, wall_thickness, grid_pixel_height))
+        pg.draw.rect(surface, Config.WALL_COLOR,
+                    (0, grid_pixel_height - wall_thickness, Config.SCREEN_WIDTH, wall_thickness))
+    
+    def _render_ui(self, full: bool = False) -> list:
+        """
+        Отрисовка UI элементов поверх статического слоя
+        
+        Args:
+            full: перерисовать весь UI (иначе только изменившиеся элементы)
+        
+        Returns:
+            Список перерисованных областей экрана
+        """
+        rects = []
+        if full:
+            rects = self._get_ui_rects()
+            for rect in rects:
+                self._screen.blit(self._static_ui, rect, rect)
+        
+        color_changed = self._canvas_controller.current_value != self._rendered_color
+        for component in self._ui_components:
+            if full or component.is_dirty or (component is self._color_picker and color_changed):
+                if not full:
+                    rect = component.rect
+                    self._screen.blit(self._static_ui, rect, rect)
+                    rects.append(rect)
+                self._render_component(component)
+        
+        # Индикатор фоновой операции вместо имени файла
+        if self._progress.active:
+            if full or self._progress.is_dirty:
+                rect = self._progress.rect
+                if not full:
+                    self._screen.blit(self._static_ui, rect, rect)
+                    rects.append(rect)
+                self._progress.render(self._screen)
+            return rects
         
         # Имя файла
         filename = self._file_controller.current_filename or "unnamed"
-        filename_surface = self._font.render(filename, True, (0, 0, 0))
-        self._screen.blit(filename_surface, (320, Config.SCREEN_HEIGHT - 50))
+        if full or filename != self._rendered_filename:
+            filename_rect = self._get_filename_rect()
+            if not full:
+                self._screen.blit(self._static_ui, filename_rect, filename_rect)
+                rects.append(filename_rect)
+            filename_surface = render_text(self._font, filename, (0, 0, 0))
+            self._screen.blit(filename_surface, (320, Config.SCREEN_HEIGHT - 50))
+            self._rendered_filename = filename
+        
+        return rects
+    
+    def _render_component(self, component):
+        """Отрисовать элемент UI (палитре нужен текущий цвет)"""
+        if component is self._color_picker:
+            # Палитра (передаем текущий цвет для индикатора)
+            self._color_picker.render(self._screen, self._canvas_controller.current_color)
+            self._rendered_color = self._canvas_controller.current_value
+            return
+        
+        component.render(self._screen)
     
     def run(self):
         """Главный цикл приложения"""
@@ -347,18 +748,150 @@ class Application:
         print("\nГорячие клавиши:")
         print("  B - Кисть, E - Ластик, G - Заливка, I - Пипетка")
         print("  Ctrl+S - Сохранить, Ctrl+Z - Отменить")
+        print("  Колесо/+/- - Масштаб, средняя кнопка/стрелки - Сдвиг, 0 - Сброс")
+        print("  F3 - Статистика кадров, F4 - Запись трассы")
         print("="*35)
         
+        started = False
         while self._running:
-            self._handle_events()
-            self._update()
-            self._render()
+            # Ожидание в простое не входит во время кадра
+            self._step(first_event=self._wait_while_idle())
+            if not started:
+                self._finish_startup()
+                started = True
             self._clock.tick(Config.FPS)
         
         self._quit()
     
+    def _step(self, first_event: Optional[pg.event.Event] = None,
+              frame: Optional[RecordedFrame] = None):
+        """
+        Один кадр: события, логика и отрисовка
+        
+        Args:
+            first_event: событие, полученное при ожидании в простое
+            frame: кадр записи ввода вместо очереди событий
+        """
+        profiler = self._frame_profiler
+        profiler.begin_frame()
+        with profiler.phase("события"):
+            if frame is None:
+                self._handle_events(first_event)
+            else:
+                self._replay_events(frame)
+        with profiler.phase("обновление"):
+            self._update()
+        if self._has_damage():
+            self._render()
+        profiler.end_frame()
+    
+    def replay(self, recording: InputRecording) -> ReplayReport:
+        """
+        Воспроизвести запись ввода с максимальной скоростью
+        
+        Кадры идут без ожидания и ограничения FPS; иконки
+        не загружаются. Начатые операции с файлами дожидаются
+        завершения до подсчета контрольной суммы холста
+        
+        Args:
+            recording: запись ввода
+        
+        Returns:
+            Время кадров и контрольная сумма холста
+        """
+        if recording.grid_size != (self._grid.width, self._grid.height):
+            width, height = recording.grid_size
+            print(f"⚠️  Запись сделана на сетке {width}x{height}, "
+                  f"текущая - {self._grid.width}x{self._grid.height}")
+        
+        self._running = True
+        frame_times = []
+        start = time.perf_counter()
+        for frame in recording.frames:
+            frame_start = time.perf_counter()
+            self._step(frame=frame)
+            frame_times.append(time.perf_counter() - frame_start)
+            if not self._running:
+                break
+        
+        self._file_controller.finish_pending(self._grid)
+        total = time.perf_counter() - start
+        return ReplayReport(frame_times, total, canvas_hash(self._grid))
+    
+    def _finish_startup(self):
+        """Завершить запуск после первого кадра (то, что его не задерживает)"""
+        if self._profile is not None:
+            self._profile.mark_first_frame()
+        
+        with self._measure("иконки инструментов"):
+            self._load_icons()
+        
+        if self._profile is not None:
+            print(self._profile.report())
+    
+    def _has_damage(self) -> bool:
+        """Есть ли что перерисовывать (холст, окно просмотра или UI)"""
+        return (self._needs_full_redraw
+                or self._grid.has_damage
+                or self._viewport.changed
+                or self._profiler_overlay.is_dirty
+                or self._ui_has_damage())
+    
+    def _is_idle(self) -> bool:
+        """
+        Простой: нет штриха, перетаскивания и неотрисованных изменений
+        
+        Пока кнопка мыши нажата или идет операция с файлами,
+        цикл идет с частотой Config.FPS
+        """
+        return (not self._canvas_controller.is_drawing
+                and not self._input_controller.any_mouse_pressed
+                and not self._file_controller.busy
+                and not self._has_damage())
+    
+    def _wait_while_idle(self) -> Optional[pg.event.Event]:
+        """
+        В простое ждать следующего события вместо опроса каждый кадр
+        
+        Ожидание ограничено Config.IDLE_WAIT_MS, чтобы цикл
+        периодически просыпался и без событий
+        
+        Returns:
+            Полученное событие или None
+        """
+        if not self._is_idle():
+            return None
+        
+        event = pg.event.wait(Config.IDLE_WAIT_MS)
+        if event.type == pg.NOEVENT:
+            return None
+        return event
+    
     def _quit(self):
         """Завершение работы"""
         print("\n=== Завершение работы ===")
-        pg.quit()
-        sys.exit()
\ No newline at end of file
+        self.close()
+        sys.exit()
+    
+    def close(self):
+        """
+        Завершить работу приложения, не выходя из программы
+        
+        Дожидается операций с файлами, сохраняет трассу (--trace)
+        и запись ввода (--record) и закрывает окно
+        """
+        # Начатое сохранение должно завершиться
+        self._file_controller.finish_pending(self._grid)
+        
+        # Трасса, записанная с запуска (--trace)
+        if self._trace_path is not None and self._frame_profiler.tracing:
+            self._frame_profiler.stop_trace()
+            self._save_trace(self._trace_path)
+        
+        # Запись ввода (--record)
+        if self._recording is not None:
+            if save_recording(self._recording, self._record_path):
+                print(f"Запись ввода сохранена: {self._record_path} "
+                      f"(кадров: {len(self._recording)}, событий: {self._recording.event_count})")
+            print(f"Холст: {canvas_hash(self._grid)}")
+        pg.quit()
\ No newline at end of file
@@ -20,15 +20,51 @@ class Config:
     GRID_HEIGHT = 64
     CELL_SIZE = 12
     
+    # Разреженный холст из тайлов: None - выбрать по размеру сетки,
+    # True/False - включить/выключить принудительно
+    TILED_CANVAS = None
+    TILE_SIZE = 64
+    
+    # Область просмотра холста на экране (не зависит от размера сетки)
+    CANVAS_VIEW_WIDTH = 768
+    CANVAS_VIEW_HEIGHT = 768
+    
+    # Масштаб (пикселей на ячейку) и панорамирование
+    ZOOM_LEVELS = (1, 2, 3, 4, 6, 8, 12, 16, 24, 32, 48, 64)
+    PAN_STEP = 64
+    
+    # История изменений: максимум действий, бюджет памяти в байтах
+    # и сколько последних действий хранить несжатыми
+    HISTORY_MAX_ACTIONS = 200
+    HISTORY_MEMORY_BUDGET = 64 * 1024 * 1024
+    HISTORY_HOT_ACTIONS = 8
+    
+    # Максимальный размер кисти и ластика на слайдерах (не больше Tool.MAX_SIZE)
+    MAX_TOOL_SIZE = 64
+    
+    # Экспорт PNG: масштаб по умолчанию (пикселей на ячейку) и максимальный
+    EXPORT_SCALE = 12
+    EXPORT_MAX_SCALE = 16
+    # Предел размера PNG в пикселях (8192x8192, 256 МБ в памяти):
+    # для больших холстов масштаб уменьшается
+    EXPORT_MAX_PIXELS = 8192 * 8192
+    
     # Цвета интерфейса
     BG_COLOR = (255, 255, 255)
     WALL_COLOR = (50, 50, 50)
     SIDEBAR_COLOR = (150, 150, 150)
     BOTTOM_BAR_COLOR = (80, 80, 80)
+    CANVAS_BACKDROP_COLOR = (120, 120, 120)
+    
+    # Толщина границ между холстом и панелями
+    WALL_THICKNESS = 4
     
     # FPS
     FPS = 60
     
+    # Простой: сколько ждать события (мс), пока ничего не меняется
+    IDLE_WAIT_MS = 500
+    
     # Заголовок окна
     WINDOW_TITLE = "Pixelart Editor v2.0"
     
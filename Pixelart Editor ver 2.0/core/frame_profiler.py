@@ -0,0 +1,295 @@
+# ========================================
+# core/frame_profiler.py
+# ========================================
+"""
+Профиль кадров: время фаз главного цикла и вызовов инструментов
+
+Статистика последних кадров показывается на экране (F3), а запись
+трассы (F4, main.py --trace) сохраняется в формате chrome://tracing
+(Trace Event Format). Выключенный профиль почти ничего не стоит:
+phase() возвращает общий пустой контекст
+
+Модуль не зависит от pygame
+"""
+
+import json
+import os
+import time
+from collections import deque
+from typing import Deque, Dict, List, NamedTuple, Optional, Tuple
+
+
+class FrameStats(NamedTuple):
+    """
+    Сводка по последним кадрам
+    
+    Attributes:
+        frames: число кадров в выборке
+        last: длительность последнего кадра (секунды)
+        average: средняя длительность
+        p50, p95, p99: перцентили длительности
+        cells: ячеек холста, выведенных в последнем кадре
+        phases: фазы последнего кадра (название, секунды) по порядку
+    """
+    frames: int
+    last: float
+    average: float
+    p50: float
+    p95: float
+    p99: float
+    cells: int
+    phases: List[Tuple[str, float]]
+
+
+class _NullPhase:
+    """Пустой контекст фазы (профиль выключен)"""
+    
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    """Замер одной фазы"""
+    
+    __slots__ = ('_profiler', '_name', '_start')
+    
+    def __init__(self, profiler: 'FrameProfiler', name: str):
+        self._profiler = profiler
+        self._name = name
+        self._start = 0.0
+    
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self._profiler._add_phase(self._name, self._start, time.perf_counter())
+        return False
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """
+    Перцентиль по ближайшему рангу
+    
+    Args:
+        values: отсортированные значения (не пусто)
+        percent: 0-100
+    
+    Returns:
+        Значение, не меньше которого percent% выборки
+    """
+    rank = max(1, -(-len(values) * percent // 100))
+    return values[int(rank) - 1]
+
+
+class FrameProfiler:
+    """
+    Замеры кадров главного цикла
+    
+    Кадр обрамляется begin_frame()/end_frame(), фазы внутри него -
+    контекстом phase(name). Время одноименных фаз за кадр суммируется
+    (инструмент вызывается для каждого положения мыши), в трассу
+    попадает каждый вызов. Профиль включен, пока показывается
+    статистика или пишется трасса
+    """
+    
+    # Кадров в выборке для статистики
+    HISTORY_FRAMES = 240
+    # Предел событий трассы (дальше события отбрасываются)
+    MAX_TRACE_EVENTS = 500_000
+    
+    def __init__(self, history: int = HISTORY_FRAMES):
+        """
+        Инициализация профиля (выключен)
+        
+        Args:
+            history: число кадров в выборке для статистики
+        """
+        self._origin = time.perf_counter()
+        self._enabled = False
+        self._collecting = False
+        self._tracing = False
+        
+        # Текущий кадр
+        self._frame_start: Optional[float] = None
+        self._frame_phases: Dict[str, float] = {}
+        self._frame_cells = 0
+        
+        # Последние кадры: (длительность, ячейки, фазы)
+        self._frames: Deque[Tuple[float, int, List[Tuple[str, float]]]] = deque(maxlen=history)
+        
+        # События трассы: (название, начало, длительность) в секундах от _origin
+        self._trace: List[Tuple[str, float, float]] = []
+        self._dropped_events = 0
+    
+    @property
+    def enabled(self) -> bool:
+        """Идут ли замеры"""
+        return self._enabled
+    
+    @property
+    def collecting(self) -> bool:
+        """Собирается ли статистика кадров"""
+        return self._collecting
+    
+    @property
+    def tracing(self) -> bool:
+        """Пишется ли трасса"""
+        return self._tracing
+    
+    @property
+    def trace_event_count(self) -> int:
+        """Записано событий трассы"""
+        return len(self._trace)
+    
+    @property
+    def dropped_events(self) -> int:
+        """Отброшено событий сверх MAX_TRACE_EVENTS"""
+        return self._dropped_events
+    
+    def set_collecting(self, collecting: bool):
+        """
+        Включить или выключить сбор статистики
+        
+        Args:
+            collecting: собирать статистику кадров
+        """
+        self._collecting = collecting
+        if not collecting:
+            self._frames.clear()
+        self._update_enabled()
+    
+    def start_trace(self):
+        """Начать запись трассы (прежняя запись отбрасывается)"""
+        self._trace = []
+        self._dropped_events = 0
+        self._tracing = True
+        self._update_enabled()
+    
+    def stop_trace(self):
+        """Закончить запись трассы (записанное сохраняется через save_trace)"""
+        self._tracing = False
+        self._update_enabled()
+    
+    def _update_enabled(self):
+        """Пересчитать, нужны ли замеры"""
+        self._enabled = self._collecting or self._tracing
+        if not self._enabled:
+            self._frame_start = None
+    
+    def begin_frame(self):
+        """Начало кадра"""
+        if not self._enabled:
+            return
+        self._frame_start = time.perf_counter()
+        self._frame_phases = {}
+        self._frame_cells = 0
+    
+    def phase(self, name: str):
+        """
+        Контекст замера фазы
+        
+        Args:
+            name: название фазы
+        """
+        if not self._enabled:
+            return _NULL_PHASE
+        return _Phase(self, name)
+    
+    def add_cells(self, count: int):
+        """
+        Учесть ячейки холста, выведенные в текущем кадре
+        
+        Args:
+            count: число ячеек
+        """
+        self._frame_cells += count
+    
+    def end_frame(self):
+        """Конец кадра: длительность попадает в статистику и трассу"""
+        start = self._frame_start
+        if start is None:
+            return
+        end = time.perf_counter()
+        self._frame_start = None
+        
+        if self._collecting:
+            self._frames.append((end - start, self._frame_cells, list(self._frame_phases.items())))
+        if self._tracing:
+            self._add_event("кадр", start, end)
+    
+    def _add_phase(self, name: str, start: float, end: float):
+        """Учесть завершенную фазу"""
+        if self._frame_start is not None:
+            phases = self._frame_phases
+            phases[name] = phases.get(name, 0.0) + (end - start)
+        if self._tracing:
+            self._add_event(name, start, end)
+    
+    def _add_event(self, name: str, start: float, end: float):
+        """Добавить событие в трассу"""
+        if len(self._trace) >= self.MAX_TRACE_EVENTS:
+            self._dropped_events += 1
+            return
+        self._trace.append((name, start - self._origin, end - start))
+    
+    def stats(self) -> Optional[FrameStats]:
+        """
+        Сводка по последним кадрам
+        
+        Returns:
+            FrameStats или None, если кадров еще не было
+        """
+        if not self._frames:
+            return None
+        
+        durations = sorted(frame[0] for frame in self._frames)
+        last, cells, phases = self._frames[-1]
+        return FrameStats(
+            frames=len(durations),
+            last=last,
+            average=sum(durations) / len(durations),
+            p50=percentile(durations, 50),
+            p95=percentile(durations, 95),
+            p99=percentile(durations, 99),
+            cells=cells,
+            phases=phases,
+        )
+    
+    def trace_events(self) -> List[dict]:
+        """
+        События трассы в формате Trace Event Format
+        
+        Returns:
+            Список событий "X" (время в микросекундах) с названием потока
+        """
+        pid = os.getpid()
+        events = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": 1,
+                   "args": {"name": "главный цикл"}}]
+        for name, start, duration in self._trace:
+            events.append({"name": name, "ph": "X", "pid": pid, "tid": 1,
+                           "ts": round(start * 1e6, 3), "dur": round(duration * 1e6, 3)})
+        return events
+    
+    def save_trace(self, filepath: str):
+        """
+        Сохранить трассу (открывается в chrome://tracing и Perfetto)
+        
+        Args:
+            filepath: путь к JSON файлу
+        """
+        data = {"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+    
+    def __repr__(self) -> str:
+        return (f"FrameProfiler(collecting={self._collecting}, tracing={self._tracing}, "
+                f"frames={len(self._frames)}, events={len(self._trace)})")
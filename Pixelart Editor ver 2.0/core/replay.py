@@ -0,0 +1,86 @@
+# ========================================
+# core/replay.py
+# ========================================
+"""
+Итоги воспроизведения записи ввода (main.py --replay)
+
+Модуль не зависит от pygame
+"""
+
+import hashlib
+import sys
+from array import array
+from typing import List, NamedTuple, TYPE_CHECKING
+
+from .frame_profiler import percentile
+
+if TYPE_CHECKING:
+    from models import Grid
+
+
+def canvas_hash(grid: 'Grid') -> str:
+    """
+    Контрольная сумма холста (размеры и цвета всех ячеек)
+    
+    Не зависит от устройства сетки (сплошная или из тайлов)
+    и порядка байт платформы
+    
+    Args:
+        grid: сетка
+    
+    Returns:
+        SHA-1 в шестнадцатеричном виде
+    """
+    pixels = grid.pixels
+    if sys.byteorder != 'little':
+        pixels = array(pixels.typecode, pixels)
+        pixels.byteswap()
+    
+    digest = hashlib.sha1(f"{grid.width}x{grid.height}:".encode())
+    digest.update(pixels.tobytes())
+    return digest.hexdigest()
+
+
+class ReplayReport(NamedTuple):
+    """
+    Итоги воспроизведения
+    
+    Attributes:
+        frame_times: длительность каждого кадра (секунды)
+        total: общее время воспроизведения (секунды)
+        canvas_hash: контрольная сумма холста после воспроизведения
+    """
+    frame_times: List[float]
+    total: float
+    canvas_hash: str
+    
+    def to_dict(self) -> dict:
+        """Итоги для JSON (время в миллисекундах)"""
+        times = sorted(self.frame_times)
+        return {
+            "frames": len(self.frame_times),
+            "total_ms": self.total * 1000,
+            "p50_ms": percentile(times, 50) * 1000 if times else 0.0,
+            "p95_ms": percentile(times, 95) * 1000 if times else 0.0,
+            "p99_ms": percentile(times, 99) * 1000 if times else 0.0,
+            "max_ms": times[-1] * 1000 if times else 0.0,
+            "canvas_hash": self.canvas_hash,
+            "frame_times_ms": [seconds * 1000 for seconds in self.frame_times],
+        }
+    
+    def report(self) -> str:
+        """
+        Отчет для вывода в консоль
+        
+        Returns:
+            Многострочный текст
+        """
+        data = self.to_dict()
+        return "\n".join([
+            "=== Воспроизведение записи ===",
+            f"Кадров: {data['frames']}",
+            f"Общее время: {data['total_ms']:.1f} мс",
+            f"Кадр: p50 {data['p50_ms']:.2f}  p95 {data['p95_ms']:.2f}  "
+            f"p99 {data['p99_ms']:.2f}  макс. {data['max_ms']:.2f} мс",
+            f"Холст: {self.canvas_hash}",
+        ])
@@ -0,0 +1,101 @@
+# ========================================
+# core/startup_profile.py
+# ========================================
+"""
+Профиль запуска: время импорта модулей и инициализации до первого кадра
+
+Модуль не зависит от pygame - его можно импортировать раньше всех
+"""
+
+import importlib
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+
+class StartupProfile:
+    """
+    Замеры этапов запуска (main.py --profile-startup)
+    
+    Этапы группируются ("import", "init"); время каждого этапа
+    собственное, вложенные замеры не поддерживаются
+    """
+    
+    def __init__(self):
+        """Инициализация профиля (момент создания - начало отсчета)"""
+        self._start = time.perf_counter()
+        self._stages: List[Tuple[str, str, float]] = []
+        self._first_frame: Optional[float] = None
+    
+    @property
+    def stages(self) -> List[Tuple[str, str, float]]:
+        """Замеренные этапы: (группа, название, секунды)"""
+        return list(self._stages)
+    
+    @property
+    def first_frame(self) -> Optional[float]:
+        """Время от начала отсчета до первого кадра (None - кадра еще не было)"""
+        return self._first_frame
+    
+    @contextmanager
+    def measure(self, group: str, name: str) -> Iterator[None]:
+        """
+        Замерить этап
+        
+        Args:
+            group: группа этапа ("import", "init")
+            name: название этапа
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._stages.append((group, name, time.perf_counter() - start))
+    
+    def import_modules(self, names: Iterable[str]):
+        """
+        Импортировать модули по очереди, замеряя каждый
+        
+        Время модуля не включает уже импортированные им зависимости,
+        поэтому порядок - от базовых пакетов к зависящим от них
+        
+        Args:
+            names: имена модулей
+        """
+        for name in names:
+            with self.measure("import", name):
+                importlib.import_module(name)
+    
+    def mark_first_frame(self):
+        """Отметить вывод первого кадра"""
+        if self._first_frame is None:
+            self._first_frame = time.perf_counter() - self._start
+    
+    def report(self) -> str:
+        """
+        Отчет: этапы по группам с итогами и время до первого кадра
+        
+        Returns:
+            Многострочный текст
+        """
+        lines = ["=== Профиль запуска ==="]
+        groups: List[str] = []
+        for group, _, _ in self._stages:
+            if group not in groups:
+                groups.append(group)
+        
+        for group in groups:
+            stages = [(name, seconds) for stage_group, name, seconds in self._stages
+                      if stage_group == group]
+            lines.append(f"{group}:")
+            for name, seconds in stages:
+                lines.append(f"  {name:28s} {seconds * 1000:8.1f} мс")
+            total = sum(seconds for _, seconds in stages)
+            lines.append(f"  {'итого':28s} {total * 1000:8.1f} мс")
+        
+        if self._first_frame is not None:
+            lines.append(f"До первого кадра: {self._first_frame * 1000:.1f} мс")
+        return "\n".join(lines)
+    
+    def __repr__(self) -> str:
+        return f"StartupProfile(stages={len(self._stages)}, first_frame={self._first_frame})"
@@ -10,11 +10,20 @@ Pixelart Editor - ООП Рефакторинг
 
 import sys
 import os
+import argparse
+import json
+from importlib.util import find_spec
 
 # Добавляем текущую директорию в путь (на всякий случай)
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from core import Application, Config
+# Config и StartupProfile не тянут за собой pygame - Application
+# и остальные пакеты импортируются только при запуске
+from core import Config, StartupProfile
+
+# Модули проекта от базовых к зависящим от них (порядок важен
+# для замера времени импорта каждого)
+STARTUP_MODULES = ['pygame', 'models', 'utils', 'tools', 'ui', 'controllers', 'core.application']
 
 
 def print_banner():
@@ -29,35 +38,82 @@ def print_banner():
     print()
 
 
+def parse_args(argv=None) -> argparse.Namespace:
+    """Разобрать аргументы командной строки"""
+    parser = argparse.ArgumentParser(description="Pixelart Editor")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="вывести время импорта и инициализации до первого кадра")
+    parser.add_argument('--trace', metavar='FILE',
+                        help="записать трассу кадров (chrome://tracing) и сохранить при выходе")
+    parser.add_argument('--record', metavar='FILE',
+                        help="записать ввод (мышь, клавиши, время) для воспроизведения")
+    parser.add_argument('--replay', metavar='FILE',
+                        help="воспроизвести запись ввода без окна с максимальной скоростью")
+    parser.add_argument('--replay-report', metavar='FILE',
+                        help="сохранить итоги воспроизведения (время кадров, холст) в JSON")
+    return parser.parse_args(argv)
+
+
 def check_dependencies():
-    """Проверить наличие необходимых зависимостей"""
+    """
+    Проверить наличие необходимых зависимостей
+    
+    Модули только ищутся (find_spec), но не импортируются: импорт
+    выполняется один раз, при запуске приложения
+    """
     print("Проверка зависимостей...")
     
-    try:
-        import pygame
-        print(f"✓ Pygame {pygame.version.ver} установлен")
-    except ImportError:
+    if find_spec('pygame') is None:
         print("✗ Pygame не установлен!")
         print("  Установите: pip install pygame")
         return False
+    print("✓ Pygame установлен")
     
     # Проверка модулей проекта
     modules = ['models', 'utils', 'tools', 'ui', 'controllers', 'core']
     for module in modules:
-        try:
-            __import__(module)
-            print(f"✓ Модуль {module} найден")
-        except ImportError as e:
+        if find_spec(module) is None:
             print(f"✗ Модуль {module} не найден!")
-            print(f"  Ошибка: {e}")
             return False
+        print(f"✓ Модуль {module} найден")
     
     print("✓ Все зависимости на месте!\n")
     return True
 
 
+def run_replay(args: argparse.Namespace):
+    """
+    Воспроизвести запись ввода без окна (main.py --replay)
+    
+    Печатает общее время, перцентили времени кадра и контрольную
+    сумму холста; при --replay-report сохраняет их в JSON
+    """
+    from utils import load_recording
+    
+    recording = load_recording(args.replay)
+    if recording is None:
+        sys.exit(1)
+    
+    # Окно не нужно: pygame рисует в память
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    from core import Application
+    
+    app = Application(trace_path=args.trace)
+    report = app.replay(recording)
+    app.close()
+    
+    print(report.report())
+    if args.replay_report is not None:
+        with open(args.replay_report, 'w', encoding='utf-8') as f:
+            json.dump(report.to_dict(), f, indent=2)
+        print(f"Итоги сохранены: {args.replay_report}")
+
+
 def main():
     """Главная функция запуска приложения"""
+    args = parse_args()
+    profile = StartupProfile() if args.profile_startup else None
     
     # Баннер
     print_banner()
@@ -72,9 +128,17 @@ def main():
         print("🚀 Запуск приложения...")
         print("   Нажмите Ctrl+C для выхода\n")
         
-        app = Application()
-        app.run()
+        if args.replay is not None:
+            run_replay(args)
+            return
+        
+        if profile is not None:
+            profile.import_modules(STARTUP_MODULES)
+        from core import Application
         
+        app = Application(profile, trace_path=args.trace, record_path=args.record)
+        app.run()
+    
     except KeyboardInterrupt:
         print("\n\n⚠️  Прервано пользователем (Ctrl+C)")
         sys.exit(0)
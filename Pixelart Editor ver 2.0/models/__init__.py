@@ -2,23 +2,32 @@
 Модуль моделей данных для Pixelart Editor
 
 Содержит базовые структуры данных:
-- Color: работа с цветами
+- Color: работа с цветами (pack_rgb/unpack_rgb - упаковка в 0xRRGGBB)
+- PackedColor, ColorLike, to_packed: упакованный цвет - внутреннее представление
 - Cell: ячейка сетки
 - Grid: сетка для рисования
+- TiledGrid: разреженная сетка из тайлов для больших холстов
 - Palette: цветовые палитры
 - UndoRedoManager: история изменений
 """
 
-from .color import Color
+from .color import Color, PackedColor, ColorLike, pack_rgb, unpack_rgb, to_packed
 from .cell import Cell
 from .grid import Grid
+from .tiled_grid import TiledGrid
 from .palette import Palette, PaletteManager
 from .history import UndoRedoManager
 
 __all__ = [
     'Color',
+    'pack_rgb',
+    'unpack_rgb',
+    'to_packed',
+    'PackedColor',
+    'ColorLike',
     'Cell',
     'Grid',
+    'TiledGrid',
     'Palette',
     'PaletteManager',
     'UndoRedoManager',
@@ -3,28 +3,28 @@
 # ========================================
 """Модуль ячейки сетки"""
 
-import pygame as pg
 from typing import Tuple
+from .color import ColorLike, PackedColor, to_packed, unpack_rgb
 
 
 class Cell:
     """
     Ячейка сетки - минимальная единица рисования
-    Инкапсулирует данные о цвете и размере
+    Инкапсулирует данные о цвете и размере (без поверхности pygame)
+    
+    Цвет хранится упакованным (0xRRGGBB), кортеж собирается по запросу
     """
     
-    def __init__(self, size: int, color: Tuple[int, int, int] = (255, 255, 255)):
+    def __init__(self, size: int, color: ColorLike = 0xFFFFFF):
         """
         Инициализация ячейки
         
         Args:
             size: размер ячейки в пикселях
-            color: цвет ячейки (R, G, B)
+            color: цвет ячейки (упакованный или (R, G, B))
         """
         self._size = size
-        self._color = color
-        self._surface = pg.Surface((size, size))
-        self._update_surface()
+        self._value = to_packed(color)
     
     @property
     def size(self) -> int:
@@ -33,36 +33,32 @@ class Cell:
     
     @property
     def color(self) -> Tuple[int, int, int]:
-        """Получить текущий цвет ячейки"""
-        return self._color
+        """Получить текущий цвет ячейки (R, G, B)"""
+        return unpack_rgb(self._value)
     
     @color.setter
-    def color(self, value: Tuple[int, int, int]):
-        """
-        Установить новый цвет ячейки
-        Автоматически обновляет surface
-        """
-        if self._color != value:
-            self._color = value
-            self._update_surface()
+    def color(self, value: ColorLike):
+        """Установить новый цвет ячейки"""
+        self._value = to_packed(value)
     
-    def _update_surface(self):
-        """Обновить surface с новым цветом"""
-        self._surface.fill(self._color)
+    @property
+    def value(self) -> PackedColor:
+        """Упакованный цвет ячейки"""
+        return self._value
     
-    def render(self, screen: pg.Surface, x: int, y: int):
+    def render(self, screen, x: int, y: int):
         """
         Отрисовать ячейку на экране
         
         Args:
-            screen: поверхность для рисования
+            screen: поверхность для рисования (pygame.Surface)
             x, y: координаты верхнего левого угла
         """
-        screen.blit(self._surface, (x, y))
+        screen.fill(unpack_rgb(self._value), (x, y, self._size, self._size))
     
     def clone(self) -> 'Cell':
         """Создать копию ячейки"""
-        return Cell(self._size, self._color)
+        return Cell(self._size, self._value)
     
     def __repr__(self) -> str:
-        return f"Cell(size={self._size}, color={self._color})"
\ No newline at end of file
+        return f"Cell(size={self._size}, color={self.color})"
\ No newline at end of file
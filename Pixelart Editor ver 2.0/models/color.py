@@ -1,9 +1,71 @@
 # ========================================
 # models/color.py
 # ========================================
-"""Модуль для работы с цветами"""
+"""
+Модуль для работы с цветами
 
-from typing import Tuple, List
+Внутри моделей и инструментов цвет - упакованное число 0xRRGGBB
+(PackedColor): его дешево сравнивать и хранить в массивах. Кортежи
+(R, G, B) нужны только на границе с pygame и UI
+"""
+
+from typing import Tuple, List, Union
+
+
+# Упакованный цвет 0xRRGGBB
+PackedColor = int
+
+# Цвет в любом из представлений: упакованный или (R, G, B)
+ColorLike = Union[PackedColor, Tuple[int, int, int]]
+
+
+def pack_rgb(color: Tuple[int, int, int]) -> int:
+    """
+    Упаковать цвет (R, G, B) в одно число 0xRRGGBB
+    
+    Args:
+        color: цвет (R, G, B)
+    
+    Returns:
+        Упакованный цвет
+    
+    Example:
+        >>> hex(pack_rgb((255, 128, 0)))
+        '0xff8000'
+    """
+    return (color[0] << 16) | (color[1] << 8) | color[2]
+
+
+def unpack_rgb(value: int) -> Tuple[int, int, int]:
+    """
+    Распаковать число 0xRRGGBB в цвет (R, G, B)
+    
+    Args:
+        value: упакованный цвет
+    
+    Returns:
+        Цвет (R, G, B)
+    
+    Example:
+        >>> unpack_rgb(0xff8000)
+        (255, 128, 0)
+    """
+    return ((value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF)
+
+
+def to_packed(color: ColorLike) -> PackedColor:
+    """
+    Привести цвет к упакованному виду
+    
+    Args:
+        color: упакованный цвет или (R, G, B)
+    
+    Returns:
+        Упакованный цвет (число передается как есть)
+    """
+    if isinstance(color, int):
+        return color
+    return (color[0] << 16) | (color[1] << 8) | color[2]
 
 
 class Color:
@@ -63,6 +125,16 @@ class Color:
         r, g, b = map(int, color_string.strip().split(','))
         return cls(r, g, b)
     
+    @property
+    def packed(self) -> int:
+        """Получить цвет как упакованное число 0xRRGGBB"""
+        return pack_rgb(self.rgb)
+    
+    @classmethod
+    def from_packed(cls, value: int) -> 'Color':
+        """Создать цвет из упакованного числа 0xRRGGBB"""
+        return cls(*unpack_rgb(value))
+    
     def to_string(self) -> str:
         """Преобразовать цвет в строку 'R,G,B'"""
         return f"{self._r},{self._g},{self._b}"
@@ -3,19 +3,46 @@
 # ========================================
 """Модуль сетки для рисования"""
 
-from typing import List, Tuple, Optional
-import pygame as pg
+from array import array
+from typing import Iterator, List, Tuple, Optional, Sequence, Union, TYPE_CHECKING
 from .cell import Cell
+from .color import ColorLike, pack_rgb, unpack_rgb, to_packed
+
+if TYPE_CHECKING:
+    from .history import ChangeRecorder
+
+
+# Код типа для упакованных пикселей 0xRRGGBB (беззнаковое 32-битное число)
+PIXEL_TYPECODE = 'I' if array('I').itemsize == 4 else 'L'
+
+# Снимок состояния: плоский массив упакованных цветов (построчно)
+GridState = Union[array, Sequence[int]]
+
+# Прямоугольник в координатах сетки (x, y, width, height)
+GridRect = Tuple[int, int, int, int]
+
+# Непрерывный участок буфера: (индекс первой ячейки, цвета)
+PixelRun = Tuple[int, array]
 
 
 class Grid:
     """
     Сетка для рисования - основная модель данных
-    Хранит двумерный массив ячеек
+    Хранит цвета всех ячеек в одном непрерывном буфере
+    (array 0xRRGGBB, построчно: index = y * width + x)
+    
+    Не зависит от pygame: сетка только накапливает прямоугольники
+    изменений, а выводом на экран занимается ui.GridRenderer
     """
     
-    def __init__(self, width: int, height: int, cell_size: int, 
-                 background_color: Tuple[int, int, int] = (255, 255, 255)):
+    # После этого количества прямоугольники изменений объединяются в один
+    MAX_DIRTY_RECTS = 256
+    
+    # Начиная с этого количества ячеек create() выбирает разреженную сетку
+    TILED_THRESHOLD = 1024 * 1024
+    
+    def __init__(self, width: int, height: int, cell_size: int,
+                 background_color: ColorLike = (255, 255, 255)):
         """
         Инициализация сетки
         
@@ -28,20 +55,52 @@ class Grid:
         self._width = width
         self._height = height
         self._cell_size = cell_size
-        self._background_color = background_color
+        self._background_packed = to_packed(background_color)
+        
+        # Хранилище цветов ячеек
+        self._init_storage()
         
-        # Создаем двумерный массив ячеек
-        self._cells: List[List[Cell]] = []
-        for i in range(width):
-            column = []
-            for j in range(height):
-                column.append(Cell(cell_size, background_color))
-            self._cells.append(column)
+        # Отслеживание изменений (dirty rectangles) для перерисовки
+        self._dirty_rects: List[GridRect] = []
+        self._dirty_all = True
+        
+        # Запись изменений для истории (активна только во время действия)
+        self._recorder: Optional['ChangeRecorder'] = None
         
         # ДОБАВЛЕНО: Создаем менеджер истории
         from .history import UndoRedoManager
         self._history = UndoRedoManager(self)
     
+    def _init_storage(self):
+        """Создать хранилище: один непрерывный буфер вместо width*height объектов Cell"""
+        self._pixels = array(PIXEL_TYPECODE, [self._background_packed]) * (self._width * self._height)
+    
+    @classmethod
+    def create(cls, width: int, height: int, cell_size: int,
+               background_color: ColorLike = (255, 255, 255),
+               tiled: Optional[bool] = None, tile_size: int = 64) -> 'Grid':
+        """
+        Создать сетку подходящего типа
+        
+        Args:
+            width, height: размеры сетки в ячейках
+            cell_size: размер одной ячейки в пикселях
+            background_color: цвет фона
+            tiled: True - разреженная сетка из тайлов (TiledGrid),
+                   False - обычная, None - выбрать по размеру холста
+            tile_size: размер тайла для разреженной сетки
+        
+        Returns:
+            Grid или TiledGrid
+        """
+        if tiled is None:
+            tiled = width * height >= cls.TILED_THRESHOLD
+        
+        if tiled:
+            from .tiled_grid import TiledGrid
+            return TiledGrid(width, height, cell_size, background_color, tile_size)
+        return Grid(width, height, cell_size, background_color)
+    
     @property
     def width(self) -> int:
         """Ширина сетки (количество ячеек)"""
@@ -59,8 +118,13 @@ class Grid:
     
     @property
     def background_color(self) -> Tuple[int, int, int]:
-        """Цвет фона"""
-        return self._background_color
+        """Цвет фона (R, G, B)"""
+        return unpack_rgb(self._background_packed)
+    
+    @property
+    def background_packed(self) -> int:
+        """Упакованный цвет фона 0xRRGGBB"""
+        return self._background_packed
     
     @property
     def pixel_width(self) -> int:
@@ -72,6 +136,28 @@ class Grid:
         """Высота в пикселях"""
         return self._height * self._cell_size
     
+    @property
+    def pixels(self) -> array:
+        """Буфер упакованных цветов (только для чтения!)"""
+        return self._pixels
+    
+    @property
+    def recorder(self) -> Optional['ChangeRecorder']:
+        """Текущая запись изменений для истории (None если запись не ведется)"""
+        return self._recorder
+    
+    @property
+    def has_damage(self) -> bool:
+        """Есть ли изменения, которые еще не были отрисованы"""
+        return self._dirty_all or bool(self._dirty_rects)
+    
+    @property
+    def dirty_rects(self) -> List[GridRect]:
+        """Прямоугольники изменений, еще не забранные pop_dirty_rects (копия)"""
+        if self._dirty_all:
+            return [(0, 0, self._width, self._height)]
+        return list(self._dirty_rects)
+    
     # ДОБАВЛЕНО: Свойство для доступа к истории
     @property
     def history(self):
@@ -82,6 +168,9 @@ class Grid:
         """
         Получить ячейку по координатам
         
+        Ячейки больше не хранятся в сетке - возвращается
+        отдельный объект-копия, изменения которого не влияют на сетку
+        
         Args:
             x: координата по X
             y: координата по Y
@@ -89,14 +178,191 @@ class Grid:
         Returns:
             Cell или None если координаты вне границ
         """
-        if self.is_valid_position(x, y):
-            return self._cells[x][y]
+        value = self.get_pixel(x, y)
+        if value is not None:
+            return Cell(self._cell_size, value)
         return None
     
     def is_valid_position(self, x: int, y: int) -> bool:
         """Проверить валидность координат"""
         return 0 <= x < self._width and 0 <= y < self._height
     
+    def get_pixel(self, x: int, y: int) -> Optional[int]:
+        """
+        Получить упакованный цвет ячейки
+        
+        Returns:
+            Цвет 0xRRGGBB или None если координаты вне границ
+        """
+        if 0 <= x < self._width and 0 <= y < self._height:
+            return self._pixels[y * self._width + x]
+        return None
+    
+    def set_pixel(self, x: int, y: int, value: int) -> bool:
+        """
+        Установить упакованный цвет ячейки
+        
+        Args:
+            x, y: координаты ячейки
+            value: цвет 0xRRGGBB
+        
+        Returns:
+            True если успешно, False если координаты невалидны
+        """
+        if 0 <= x < self._width and 0 <= y < self._height:
+            index = y * self._width + x
+            old_value = self._pixels[index]
+            if old_value != value:
+                if self._recorder is not None:
+                    self._recorder.record(index, old_value)
+                self._pixels[index] = value
+                self.mark_dirty(x, y, 1, 1)
+            return True
+        return False
+    
+    def read_run(self, start: int, count: int) -> array:
+        """
+        Прочитать участок буфера по линейному индексу (y * width + x)
+        
+        Args:
+            start: индекс первой ячейки
+            count: количество ячеек (участок может переходить на следующие строки)
+        
+        Returns:
+            Массив упакованных цветов
+        """
+        return self._pixels[start:start + count]
+    
+    def write_run(self, start: int, values: array):
+        """
+        Записать участок буфера по линейному индексу (y * width + x)
+        
+        Используется историей для отмены/повтора: не записывается
+        в историю, но отмечает изменения для отрисовки
+        
+        Args:
+            start: индекс первой ячейки
+            values: упакованные цвета
+        """
+        self._pixels[start:start + len(values)] = values
+        self._mark_run_dirty(start, len(values))
+    
+    def _mark_run_dirty(self, start: int, count: int):
+        """Отметить участок буфера как измененный"""
+        width = self._width
+        first_row = start // width
+        last_row = (start + count - 1) // width
+        if first_row == last_row:
+            self.mark_dirty(start % width, first_row, count, 1)
+        else:
+            self.mark_dirty(0, first_row, width, last_row - first_row + 1)
+    
+    def diff_state(self, state: GridState) -> Iterator[PixelRun]:
+        """
+        Найти отличия текущего состояния от снимка
+        
+        Строки сравниваются целиком (на уровне C), поэлементно
+        просматриваются только измененные строки
+        
+        Args:
+            state: снимок из save_state()
+        
+        Yields:
+            Участки (start, цвета из снимка), где сетка отличается от снимка
+        """
+        width = self._width
+        for y in range(self._height):
+            start = y * width
+            old_row = state[start:start + width]
+            new_row = self._pixels[start:start + width]
+            if old_row != new_row:
+                for offset, values in _diff_rows(old_row, new_row):
+                    yield start + offset, values
+    
+    def get_row(self, y: int) -> array:
+        """
+        Получить копию строки упакованных цветов
+        
+        Args:
+            y: номер строки
+        
+        Returns:
+            Массив из width цветов 0xRRGGBB
+        """
+        start = y * self._width
+        return self._pixels[start:start + self._width]
+    
+    def fill_span(self, x: int, y: int, length: int, value: int) -> int:
+        """
+        Залить участок строки одним цветом
+        
+        Args:
+            x, y: первая ячейка участка
+            length: длина участка (обрезается по границам сетки)
+            value: упакованный цвет
+        
+        Returns:
+            Количество измененных ячеек участка (0 если участок уже этого цвета)
+        """
+        return self.fill_spans(x, y, ((0, 0, length),), value)
+    
+    def fill_spans(self, x: int, y: int, spans: Sequence[Tuple[int, int, int]], value: int) -> int:
+        """
+        Залить несколько участков строк одним цветом (отпечаток кисти)
+        
+        Участки обрезаются по границам сетки, неизмененные участки
+        пропускаются. Изменения отмечаются одним прямоугольником
+        
+        Args:
+            x, y: точка привязки участков
+            spans: участки (dy, dx, длина) относительно точки привязки
+            value: упакованный цвет
+        
+        Returns:
+            Количество ячеек в измененных участках
+        """
+        width, height = self._width, self._height
+        changed = 0
+        top = left = 1 << 30
+        bottom = right = -1
+        
+        for dy, dx, length in spans:
+            row = y + dy
+            if not 0 <= row < height:
+                continue
+            span_left = max(0, x + dx)
+            span_right = min(width, x + dx + length)
+            if span_left >= span_right:
+                continue
+            
+            if self._write_span(span_left, row, span_right - span_left, value):
+                changed += span_right - span_left
+                top = min(top, row)
+                bottom = max(bottom, row)
+                left = min(left, span_left)
+                right = max(right, span_right)
+        
+        if changed:
+            self.mark_dirty(left, top, right - left, bottom - top + 1)
+        return changed
+    
+    def _write_span(self, x: int, y: int, count: int, value: int) -> bool:
+        """
+        Записать участок строки (координаты уже проверены)
+        
+        Returns:
+            True если хотя бы одна ячейка изменилась
+        """
+        start = y * self._width + x
+        old_values = self._pixels[start:start + count]
+        if old_values.count(value) == count:
+            return False
+        
+        if self._recorder is not None:
+            self._recorder.record_run(start, old_values)
+        self._pixels[start:start + count] = array(PIXEL_TYPECODE, [value]) * count
+        return True
+    
     def set_cell_color(self, x: int, y: int, color: Tuple[int, int, int]) -> bool:
         """
         Установить цвет ячейки
@@ -109,61 +375,146 @@ class Grid:
         Returns:
             True если успешно, False если координаты невалидны
         """
-        cell = self.get_cell(x, y)
-        if cell:
-            cell.color = color
-            return True
-        return False
+        return self.set_pixel(x, y, pack_rgb(color))
     
     def get_cell_color(self, x: int, y: int) -> Optional[Tuple[int, int, int]]:
         """Получить цвет ячейки"""
-        cell = self.get_cell(x, y)
-        return cell.color if cell else None
+        value = self.get_pixel(x, y)
+        return unpack_rgb(value) if value is not None else None
+    
+    def start_recording(self, recorder: 'ChangeRecorder'):
+        """Начать запись изменений (старых значений ячеек) для истории"""
+        self._recorder = recorder
+    
+    def stop_recording(self) -> Optional['ChangeRecorder']:
+        """
+        Остановить запись изменений
+        
+        Returns:
+            Записанные изменения или None, если запись не велась
+        """
+        recorder = self._recorder
+        self._recorder = None
+        return recorder
+    
+    def _record_state(self):
+        """Перед изменением всей сетки сохранить снимок для истории"""
+        if self._recorder is not None:
+            self._recorder.record_state(self.save_state())
     
     def clear(self):
         """Очистить всю сетку (залить фоновым цветом)"""
-        for column in self._cells:
-            for cell in column:
-                cell.color = self._background_color
+        self._record_state()
+        self._pixels = array(PIXEL_TYPECODE, [self._background_packed]) * (self._width * self._height)
+        self.mark_all_dirty()
     
-    def render(self, screen: pg.Surface, offset_x: int = 0, offset_y: int = 0):
+    def mark_dirty(self, x: int, y: int, width: int, height: int):
         """
-        Отрисовать всю сетку
+        Отметить прямоугольник ячеек как измененный
         
-        Args:
-            screen: поверхность для рисования
-            offset_x: смещение по X
-            offset_y: смещение по Y
+        При большом количестве прямоугольников они объединяются
+        в один общий, чтобы список не рос бесконечно
+        """
+        if self._dirty_all:
+            return
+        
+        self._dirty_rects.append((x, y, width, height))
+        if len(self._dirty_rects) > self.MAX_DIRTY_RECTS:
+            self._dirty_rects = [self._union_rects(self._dirty_rects)]
+    
+    def mark_all_dirty(self):
+        """Отметить всю сетку как измененную"""
+        self._dirty_all = True
+        self._dirty_rects = []
+    
+    def pop_dirty_rects(self) -> List[GridRect]:
+        """
+        Забрать накопленные изменения и сбросить их
+        
+        Returns:
+            Список прямоугольников (x, y, width, height) в ячейках
         """
-        for x in range(self._width):
-            for y in range(self._height):
-                pixel_x = offset_x + (x * self._cell_size)
-                pixel_y = offset_y + (y * self._cell_size)
-                self._cells[x][y].render(screen, pixel_x, pixel_y)
+        if self._dirty_all:
+            rects = [(0, 0, self._width, self._height)]
+        else:
+            rects = self._dirty_rects
+        
+        self._dirty_rects = []
+        self._dirty_all = False
+        return rects
+    
+    @staticmethod
+    def _union_rects(rects: List[GridRect]) -> GridRect:
+        """Общий охватывающий прямоугольник для списка прямоугольников"""
+        left = min(r[0] for r in rects)
+        top = min(r[1] for r in rects)
+        right = max(r[0] + r[2] for r in rects)
+        bottom = max(r[1] + r[3] for r in rects)
+        return (left, top, right - left, bottom - top)
     
-    def save_state(self) -> List[List[Tuple[int, int, int]]]:
+    def save_state(self) -> array:
         """
         Сохранить текущее состояние сетки
         
         Returns:
-            Двумерный массив цветов
+            Копия буфера упакованных цветов (4 байта на ячейку)
         """
-        state = []
-        for column in self._cells:
-            column_colors = [cell.color for cell in column]
-            state.append(column_colors)
-        return state
+        return array(PIXEL_TYPECODE, self._pixels)
     
-    def restore_state(self, state: List[List[Tuple[int, int, int]]]):
+    def restore_state(self, state: Union[GridState, List[List[Tuple[int, int, int]]]]):
         """
         Восстановить состояние сетки
         
         Args:
-            state: двумерный массив цветов
+            state: снимок из save_state() или двумерный массив
+                   цветов [x][y] (старый формат, например из файла)
+        """
+        if len(state) and isinstance(state[0], (list, tuple)):
+            self._record_state()
+            self._restore_columns(state)
+            return
+        
+        if len(state) == len(self._pixels):
+            self._record_state()
+            self._pixels[:] = array(PIXEL_TYPECODE, state)
+            self.mark_all_dirty()
+    
+    def _restore_columns(self, columns: List[List[Tuple[int, int, int]]]):
+        """Восстановить состояние из двумерного массива цветов [x][y]"""
+        width = self._width
+        pixels = self._pixels
+        for x in range(min(len(columns), width)):
+            column = columns[x]
+            for y in range(min(len(column), self._height)):
+                pixels[y * width + x] = pack_rgb(column[y])
+        self.mark_all_dirty()
+    
+    def get_columns(self) -> List[List[Tuple[int, int, int]]]:
         """
-        for x in range(min(len(state), self._width)):
-            for y in range(min(len(state[x]), self._height)):
-                self._cells[x][y].color = state[x][y]
+        Получить цвета в виде двумерного массива [x][y]
+        (формат текстовых файлов проекта)
+        """
+        rows = [self.get_row(y) for y in range(self._height)]
+        return [[unpack_rgb(row[x]) for row in rows] for x in range(self._width)]
     
     def __repr__(self) -> str:
-        return f"Grid({self._width}x{self._height}, cell_size={self._cell_size})"
\ No newline at end of file
+        return f"Grid({self._width}x{self._height}, cell_size={self._cell_size})"
+
+
+def _diff_rows(old_row: array, new_row: array) -> Iterator[PixelRun]:
+    """
+    Найти участки, где две строки отличаются
+    
+    Yields:
+        (смещение, значения из old_row) для каждого отличающегося участка
+    """
+    run_start = -1
+    for offset in range(len(old_row)):
+        if old_row[offset] != new_row[offset]:
+            if run_start < 0:
+                run_start = offset
+        elif run_start >= 0:
+            yield run_start, old_row[run_start:offset]
+            run_start = -1
+    if run_start >= 0:
+        yield run_start, old_row[run_start:]
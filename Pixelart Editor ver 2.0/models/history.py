@@ -3,61 +3,380 @@
 # ========================================
 """Модуль управления историей изменений (Undo/Redo)"""
 
-from typing import List, Tuple, TYPE_CHECKING
+import zlib
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
 from collections import deque
 
 # Используем TYPE_CHECKING для избежания циклических импортов
 if TYPE_CHECKING:
-    from .grid import Grid
+    from .grid import Grid, GridState, PixelRun
+
+
+# Тип массивов истории (совпадает с PIXEL_TYPECODE сетки)
+HISTORY_TYPECODE = 'I'
+
+# Уровень сжатия старых элементов (быстрое сжатие важнее степени)
+COMPRESSION_LEVEL = 1
+
+
+class ChangeRecorder:
+    """
+    Запись изменений сетки в течение одного действия
+    
+    Сетка сообщает старое значение каждой ячейки при первом изменении.
+    Операции над всей сеткой (очистка, загрузка) сохраняют один снимок,
+    после которого отдельные ячейки уже не записываются
+    """
+    
+    def __init__(self):
+        """Инициализация пустой записи"""
+        # Старые значения ячеек: индекс -> цвет до начала действия
+        self._cells: Dict[int, int] = {}
+        # Снимок сетки перед первой операцией над всей сеткой
+        self._state: Optional['GridState'] = None
+    
+    @property
+    def is_empty(self) -> bool:
+        """Ничего не записано"""
+        return not self._cells and self._state is None
+    
+    def record(self, index: int, old_value: int):
+        """
+        Записать старое значение ячейки (только первое за действие)
+        
+        Args:
+            index: линейный индекс ячейки (y * width + x)
+            old_value: упакованный цвет до изменения
+        """
+        if self._state is None and index not in self._cells:
+            self._cells[index] = old_value
+    
+    def record_run(self, start: int, old_values: Iterable[int]):
+        """
+        Записать старые значения подряд идущих ячеек
+        
+        Args:
+            start: линейный индекс первой ячейки
+            old_values: упакованные цвета до изменения
+        """
+        if self._state is None:
+            cells = self._cells
+            for offset, old_value in enumerate(old_values):
+                cells.setdefault(start + offset, old_value)
+    
+    def record_state(self, state: 'GridState'):
+        """Записать снимок сетки (сохраняется только первый)"""
+        if self._state is None:
+            self._state = state
+    
+    def finish(self, grid: 'Grid') -> Optional['HistoryEntry']:
+        """
+        Превратить запись в элемент истории
+        
+        Args:
+            grid: сетка, на которой велась запись
+        
+        Returns:
+            Элемент истории или None, если сетка не изменилась
+        """
+        if self._state is None:
+            changes = sorted(self._cells.items())
+            return HistoryEntry.from_changes(grid, changes)
+        
+        runs = grid.diff_state(self._state)
+        if not self._cells:
+            return HistoryEntry.from_runs(grid, runs)
+        
+        # Часть ячеек изменилась еще до снимка - их старые значения
+        # берутся из записи, а не из снимка
+        old_values: Dict[int, int] = {}
+        for start, values in runs:
+            for offset, value in enumerate(values):
+                old_values[start + offset] = value
+        old_values.update(self._cells)
+        return HistoryEntry.from_changes(grid, sorted(old_values.items()))
+
+
+class HistoryEntry:
+    """
+    Элемент истории - изменения одного действия
+    
+    Хранит непрерывные участки измененных ячеек: начало, длину,
+    старые и новые цвета. Отмена и повтор стоят O(количества
+    измененных ячеек), а память не зависит от размера холста
+    
+    Давние элементы сжимаются (zlib) и распаковываются только
+    при отмене или повторе
+    """
+    
+    def __init__(self, starts: array, lengths: array, old: array, new: array):
+        """
+        Инициализация элемента
+        
+        Args:
+            starts: линейные индексы начала участков
+            lengths: длины участков
+            old: цвета участков до действия (подряд)
+            new: цвета участков после действия (подряд)
+        """
+        self._starts = starts
+        self._lengths = lengths
+        self._old = old
+        self._new = new
+        self._run_count = len(starts)
+        self._cell_count = len(old)
+        
+        # Сжатые данные (все четыре массива подряд) или None
+        self._packed: Optional[bytes] = None
+    
+    @classmethod
+    def from_changes(cls, grid: 'Grid',
+                     changes: Iterable[Tuple[int, int]]) -> Optional['HistoryEntry']:
+        """
+        Создать элемент из отсортированных пар (индекс, старый цвет)
+        
+        Соседние индексы объединяются в участки, неизмененные ячейки
+        (старый цвет совпадает с текущим) отбрасываются
+        
+        Returns:
+            Элемент истории или None, если изменений нет
+        """
+        width = grid.width
+        runs: List['PixelRun'] = []
+        run_start = -1
+        run_values = array(HISTORY_TYPECODE)
+        
+        for index, old_value in changes:
+            if grid.get_pixel(index % width, index // width) == old_value:
+                continue
+            if run_start >= 0 and index == run_start + len(run_values):
+                run_values.append(old_value)
+            else:
+                if run_start >= 0:
+                    runs.append((run_start, run_values))
+                run_start = index
+                run_values = array(HISTORY_TYPECODE, [old_value])
+        
+        if run_start >= 0:
+            runs.append((run_start, run_values))
+        return cls.from_runs(grid, runs)
+    
+    @classmethod
+    def from_runs(cls, grid: 'Grid', runs: Iterable['PixelRun']) -> Optional['HistoryEntry']:
+        """
+        Создать элемент из участков (начало, старые цвета)
+        
+        Новые цвета читаются из текущего состояния сетки
+        
+        Returns:
+            Элемент истории или None, если участков нет
+        """
+        starts = array(HISTORY_TYPECODE)
+        lengths = array(HISTORY_TYPECODE)
+        old = array(HISTORY_TYPECODE)
+        new = array(HISTORY_TYPECODE)
+        
+        for start, values in runs:
+            starts.append(start)
+            lengths.append(len(values))
+            old.extend(values)
+            new.extend(grid.read_run(start, len(values)))
+        
+        if not starts:
+            return None
+        return cls(starts, lengths, old, new)
+    
+    @property
+    def cell_count(self) -> int:
+        """Количество измененных ячеек"""
+        return self._cell_count
+    
+    @property
+    def is_compressed(self) -> bool:
+        """Хранится ли элемент в сжатом виде"""
+        return self._packed is not None
+    
+    @property
+    def nbytes(self) -> int:
+        """Объем памяти под данные элемента в байтах (с учетом сжатия)"""
+        if self._packed is not None:
+            return len(self._packed)
+        return sum(part.itemsize * len(part)
+                   for part in (self._starts, self._lengths, self._old, self._new))
+    
+    def compress(self):
+        """Сжать данные элемента (массивы освобождаются)"""
+        if self._packed is not None:
+            return
+        
+        self._packed = zlib.compress(self._starts.tobytes() + self._lengths.tobytes() +
+                                     self._old.tobytes() + self._new.tobytes(),
+                                     COMPRESSION_LEVEL)
+        self._starts = self._lengths = self._old = self._new = None
+    
+    def decompress(self):
+        """Распаковать данные элемента"""
+        if self._packed is None:
+            return
+        
+        data = array(HISTORY_TYPECODE)
+        data.frombytes(zlib.decompress(self._packed))
+        runs, cells = self._run_count, self._cell_count
+        self._starts = data[:runs]
+        self._lengths = data[runs:2 * runs]
+        self._old = data[2 * runs:2 * runs + cells]
+        self._new = data[2 * runs + cells:]
+        self._packed = None
+    
+    def undo(self, grid: 'Grid'):
+        """Вернуть старые цвета"""
+        self.decompress()
+        self._apply(grid, self._old)
+    
+    def redo(self, grid: 'Grid'):
+        """Вернуть новые цвета"""
+        self.decompress()
+        self._apply(grid, self._new)
+    
+    def _apply(self, grid: 'Grid', values: array):
+        """Записать цвета всех участков в сетку"""
+        offset = 0
+        for start, length in zip(self._starts, self._lengths):
+            grid.write_run(start, values[offset:offset + length])
+            offset += length
+    
+    def __repr__(self) -> str:
+        return (f"HistoryEntry(runs={self._run_count}, cells={self._cell_count}, "
+                f"compressed={self.is_compressed})")
 
 
 class UndoRedoManager:
     """
     Менеджер истории изменений
     Реализует паттерн Command для Undo/Redo
+    
+    Каждое действие (штрих, заливка, очистка) хранится как набор
+    измененных ячеек, а не как копия всей сетки
+    
+    Размер истории ограничен числом действий и бюджетом памяти:
+    при превышении бюджета удаляются самые давние действия.
+    Только последние hot_entries действий хранятся несжатыми
     """
     
-    def __init__(self, grid: 'Grid', max_history: int = 50):
+    def __init__(self, grid: 'Grid', max_history: int = 50,
+                 memory_budget: Optional[int] = None, hot_entries: int = 8):
         """
         Инициализация менеджера
         
         Args:
             grid: сетка для управления
-            max_history: максимальное количество сохраненных состояний
+            max_history: максимальное количество сохраненных действий
+            memory_budget: максимальный объем памяти под историю в байтах
+                           (None - без ограничения)
+            hot_entries: сколько последних действий каждого стека не сжимать
         """
         self._grid = grid
         self._max_history = max_history
+        self._memory_budget = memory_budget
+        self._hot_entries = hot_entries
         
-        # Используем deque для эффективного управления историей
-        self._undo_stack: deque = deque(maxlen=max_history)
-        self._redo_stack: deque = deque(maxlen=max_history)
+        # Используем deque для эффективного управления историей,
+        # лишние элементы удаляются в _enforce_limits()
+        self._undo_stack: deque = deque()
+        self._redo_stack: deque = deque()
+    
+    @property
+    def max_history(self) -> int:
+        """Максимальное количество сохраненных действий"""
+        return self._max_history
+    
+    @property
+    def memory_budget(self) -> Optional[int]:
+        """Бюджет памяти под историю в байтах (None - без ограничения)"""
+        return self._memory_budget
+    
+    @property
+    def hot_entries(self) -> int:
+        """Сколько последних действий хранятся несжатыми"""
+        return self._hot_entries
+    
+    def set_limits(self, max_history: Optional[int] = None,
+                   memory_budget: Optional[int] = None,
+                   hot_entries: Optional[int] = None):
+        """
+        Изменить ограничения истории (None - оставить как есть)
         
-        # Сохраняем начальное состояние
-        self._save_initial_state()
+        Args:
+            max_history: максимальное количество сохраненных действий
+            memory_budget: бюджет памяти в байтах
+            hot_entries: сколько последних действий не сжимать
+        """
+        if max_history is not None:
+            self._max_history = max_history
+        if memory_budget is not None:
+            self._memory_budget = memory_budget
+        if hot_entries is not None:
+            self._hot_entries = hot_entries
+        self._enforce_limits()
     
-    def _save_initial_state(self):
-        """Сохранить начальное состояние"""
-        initial_state = self._grid.save_state()
-        self._undo_stack.append(initial_state)
+    @property
+    def is_recording(self) -> bool:
+        """Идет ли запись действия"""
+        return self._grid.recorder is not None
     
-    def save_state(self):
+    def begin_action(self):
         """
-        Сохранить текущее состояние для Undo
-        Очищает Redo стек
+        Начать действие - дальнейшие изменения сетки записываются
+        до вызова end_action()
+        """
+        self.end_action()
+        self._grid.start_recording(ChangeRecorder())
+    
+    def end_action(self) -> bool:
         """
-        current_state = self._grid.save_state()
-        self._undo_stack.append(current_state)
+        Закончить действие и поместить его изменения в историю
+        Очищает Redo стек, если сетка изменилась
+        
+        Returns:
+            True если действие добавлено в историю
+        """
+        recorder = self._grid.stop_recording()
+        if recorder is None or recorder.is_empty:
+            return False
+        
+        entry = recorder.finish(self._grid)
+        if entry is None:
+            return False
+        
+        self._undo_stack.append(entry)
         
         # При новом действии очищаем redo
         self._redo_stack.clear()
+        self._enforce_limits()
+        return True
+    
+    def save_state(self):
+        """
+        Отметить начало нового действия
+        
+        Оставлено для совместимости: закрывает текущее действие
+        и начинает запись следующего
+        """
+        self.begin_action()
     
     def can_undo(self) -> bool:
         """Можно ли выполнить Undo"""
-        return len(self._undo_stack) > 1  # Оставляем хотя бы начальное состояние
+        return len(self._undo_stack) > 0 or self._has_pending_changes()
     
     def can_redo(self) -> bool:
         """Можно ли выполнить Redo"""
-        return len(self._redo_stack) > 0
+        return len(self._redo_stack) > 0 and not self._has_pending_changes()
+    
+    def _has_pending_changes(self) -> bool:
+        """Есть ли изменения в незаконченном действии"""
+        recorder = self._grid.recorder
+        return recorder is not None and not recorder.is_empty
     
     def undo(self) -> bool:
         """
@@ -66,17 +385,22 @@ class UndoRedoManager:
         Returns:
             True если отмена выполнена, False если нечего отменять
         """
-        if not self.can_undo():
-            return False
+        # Незаконченное действие сначала попадает в историю
+        recording = self.is_recording
+        self.end_action()
         
-        # Сохраняем текущее состояние в redo
-        current_state = self._undo_stack.pop()
-        self._redo_stack.append(current_state)
+        if not self._undo_stack:
+            if recording:
+                self.begin_action()
+            return False
         
-        # Восстанавливаем предыдущее состояние
-        previous_state = self._undo_stack[-1]
-        self._grid.restore_state(previous_state)
+        entry = self._undo_stack.pop()
+        entry.undo(self._grid)
+        self._redo_stack.append(entry)
+        self._enforce_limits()
         
+        if recording:
+            self.begin_action()
         return True
     
     def redo(self) -> bool:
@@ -86,29 +410,67 @@ class UndoRedoManager:
         Returns:
             True если повтор выполнен, False если нечего повторять
         """
-        if not self.can_redo():
+        recording = self.is_recording
+        self.end_action()
+        
+        if not self._redo_stack:
+            if recording:
+                self.begin_action()
             return False
         
-        # Восстанавливаем состояние из redo
-        next_state = self._redo_stack.pop()
-        self._undo_stack.append(next_state)
-        self._grid.restore_state(next_state)
+        entry = self._redo_stack.pop()
+        entry.redo(self._grid)
+        self._undo_stack.append(entry)
+        self._enforce_limits()
         
+        if recording:
+            self.begin_action()
         return True
     
     def clear_history(self):
         """Очистить всю историю"""
+        self._grid.stop_recording()
         self._undo_stack.clear()
         self._redo_stack.clear()
-        self._save_initial_state()
     
     def get_undo_count(self) -> int:
         """Количество доступных отмен"""
-        return max(0, len(self._undo_stack) - 1)
+        return len(self._undo_stack)
     
     def get_redo_count(self) -> int:
         """Количество доступных повторов"""
         return len(self._redo_stack)
     
+    def get_memory_usage(self) -> int:
+        """Объем памяти под историю в байтах (сжатые элементы - по сжатому размеру)"""
+        return sum(entry.nbytes for entry in self._undo_stack) + \
+            sum(entry.nbytes for entry in self._redo_stack)
+    
+    def _enforce_limits(self):
+        """Сжать давние действия и удалить лишние по количеству и памяти"""
+        for stack in (self._undo_stack, self._redo_stack):
+            # Давние элементы сжимаются; ниже первого сжатого все уже сжаты
+            for index in range(len(stack) - self._hot_entries - 1, -1, -1):
+                if stack[index].is_compressed:
+                    break
+                stack[index].compress()
+            
+            while len(stack) > self._max_history:
+                stack.popleft()
+        
+        if self._memory_budget is None:
+            return
+        
+        # Сначала удаляются самые давние отмены, затем самые дальние повторы;
+        # последнее действие остается, даже если оно больше бюджета
+        usage = self.get_memory_usage()
+        while usage > self._memory_budget and len(self._undo_stack) + len(self._redo_stack) > 1:
+            if len(self._undo_stack) > 1 or not self._redo_stack:
+                stack = self._undo_stack
+            else:
+                stack = self._redo_stack
+            usage -= stack.popleft().nbytes
+    
     def __repr__(self) -> str:
-        return f"UndoRedoManager(undo={self.get_undo_count()}, redo={self.get_redo_count()})"
+        return (f"UndoRedoManager(undo={self.get_undo_count()}, redo={self.get_redo_count()}, "
+                f"memory={self.get_memory_usage()})")
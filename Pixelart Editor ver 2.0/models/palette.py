@@ -3,23 +3,27 @@
 # ========================================
 
 from typing import List, Tuple, Optional
+from .color import ColorLike, PackedColor, to_packed, unpack_rgb
 
 
 class Palette:
     """
     Цветовая палитра - коллекция цветов
+    
+    Цвета хранятся упакованными; colors и selected_color отдают
+    кортежи (R, G, B) для UI
     """
     
-    def __init__(self, name: str, colors: List[Tuple[int, int, int]]):
+    def __init__(self, name: str, colors: List[ColorLike]):
         """
         Инициализация палитры
         
         Args:
             name: название палитры
-            colors: список цветов в формате (R, G, B)
+            colors: список цветов (R, G, B) или упакованных
         """
         self._name = name
-        self._colors = colors.copy()
+        self._values: List[PackedColor] = [to_packed(color) for color in colors]
         self._selected_index = 0
     
     @property
@@ -29,18 +33,28 @@ class Palette:
     
     @property
     def colors(self) -> List[Tuple[int, int, int]]:
-        """Список всех цветов"""
-        return self._colors.copy()
+        """Список всех цветов (R, G, B)"""
+        return [unpack_rgb(value) for value in self._values]
+    
+    @property
+    def values(self) -> List[PackedColor]:
+        """Список всех цветов в упакованном виде"""
+        return self._values.copy()
     
     @property
     def count(self) -> int:
         """Количество цветов в палитре"""
-        return len(self._colors)
+        return len(self._values)
     
     @property
     def selected_color(self) -> Tuple[int, int, int]:
-        """Текущий выбранный цвет"""
-        return self._colors[self._selected_index]
+        """Текущий выбранный цвет (R, G, B)"""
+        return unpack_rgb(self._values[self._selected_index])
+    
+    @property
+    def selected_value(self) -> PackedColor:
+        """Текущий выбранный цвет в упакованном виде"""
+        return self._values[self._selected_index]
     
     @property
     def selected_index(self) -> int:
@@ -57,7 +71,7 @@ class Palette:
         Returns:
             True если успешно, False если индекс невалиден
         """
-        if 0 <= index < len(self._colors):
+        if 0 <= index < len(self._values):
             self._selected_index = index
             return True
         return False
@@ -0,0 +1,374 @@
+# ========================================
+# models/tiled_grid.py
+# ========================================
+"""Разреженная сетка из тайлов для очень больших холстов"""
+
+from array import array
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
+from .grid import Grid, GridState, PixelRun, PIXEL_TYPECODE, _diff_rows
+from .color import ColorLike, pack_rgb
+
+
+# Координаты тайла (tile_x, tile_y)
+TileKey = Tuple[int, int]
+
+
+class TiledGrid(Grid):
+    """
+    Разреженная сетка - холст разбит на тайлы фиксированного размера
+    
+    Тайл создается только при первом рисовании в нем, нетронутые тайлы
+    возвращают цвет фона. Память растет пропорционально закрашенной
+    площади, а не площади холста (4096x4096 и больше)
+    """
+    
+    def __init__(self, width: int, height: int, cell_size: int,
+                 background_color: ColorLike = (255, 255, 255),
+                 tile_size: int = 64):
+        """
+        Инициализация сетки
+        
+        Args:
+            width: количество ячеек по горизонтали
+            height: количество ячеек по вертикали
+            cell_size: размер одной ячейки в пикселях
+            background_color: цвет фона (по умолчанию белый)
+            tile_size: размер стороны тайла в ячейках
+        """
+        self._tile_size = tile_size
+        super().__init__(width, height, cell_size, background_color)
+    
+    def _init_storage(self):
+        """Создать хранилище: пустой словарь тайлов"""
+        tile_size = self._tile_size
+        self._tiles: Dict[TileKey, array] = {}
+        self._background_row = array(PIXEL_TYPECODE, [self._background_packed]) * tile_size
+        self._tiles_x = (self._width + tile_size - 1) // tile_size
+        self._tiles_y = (self._height + tile_size - 1) // tile_size
+        
+        # Тайлы, измененные после последнего сохранения
+        self._unsaved_tiles: Set[TileKey] = set()
+    
+    @property
+    def tile_size(self) -> int:
+        """Размер стороны тайла в ячейках"""
+        return self._tile_size
+    
+    @property
+    def tiles_x(self) -> int:
+        """Количество тайлов по горизонтали"""
+        return self._tiles_x
+    
+    @property
+    def tiles_y(self) -> int:
+        """Количество тайлов по вертикали"""
+        return self._tiles_y
+    
+    @property
+    def tile_count(self) -> int:
+        """Количество созданных (закрашенных) тайлов"""
+        return len(self._tiles)
+    
+    @property
+    def pixels(self) -> array:
+        """
+        Плоский буфер упакованных цветов
+        
+        Собирается из тайлов при каждом обращении - дорогая операция
+        """
+        result = array(PIXEL_TYPECODE)
+        for y in range(self._height):
+            result.extend(self.get_row(y))
+        return result
+    
+    @property
+    def has_unsaved_changes(self) -> bool:
+        """Есть ли тайлы, измененные после последнего сохранения"""
+        return bool(self._unsaved_tiles)
+    
+    def get_tile(self, tile_x: int, tile_y: int) -> Optional[array]:
+        """
+        Получить тайл
+        
+        Returns:
+            Массив tile_size*tile_size цветов или None, если тайл не закрашен
+        """
+        return self._tiles.get((tile_x, tile_y))
+    
+    def iter_tiles(self) -> Iterator[Tuple[TileKey, array]]:
+        """Перебрать созданные тайлы в порядке строк"""
+        for key in sorted(self._tiles, key=lambda k: (k[1], k[0])):
+            yield key, self._tiles[key]
+    
+    def pop_unsaved_tiles(self) -> Set[TileKey]:
+        """
+        Забрать тайлы, измененные после последнего сохранения
+        
+        Returns:
+            Множество координат тайлов (включая очищенные)
+        """
+        tiles = self._unsaved_tiles
+        self._unsaved_tiles = set()
+        return tiles
+    
+    def mark_unsaved(self, tiles: Set[TileKey]):
+        """
+        Вернуть тайлы в несохраненные (сохранение не состоялось)
+        
+        Args:
+            tiles: координаты тайлов из pop_unsaved_tiles()
+        """
+        self._unsaved_tiles |= tiles
+    
+    def get_pixel(self, x: int, y: int) -> Optional[int]:
+        """Получить упакованный цвет ячейки"""
+        if 0 <= x < self._width and 0 <= y < self._height:
+            size = self._tile_size
+            tile = self._tiles.get((x // size, y // size))
+            if tile is None:
+                return self._background_packed
+            return tile[(y % size) * size + x % size]
+        return None
+    
+    def set_pixel(self, x: int, y: int, value: int) -> bool:
+        """Установить упакованный цвет ячейки (создает тайл при необходимости)"""
+        if not (0 <= x < self._width and 0 <= y < self._height):
+            return False
+        
+        size = self._tile_size
+        key = (x // size, y // size)
+        tile = self._tiles.get(key)
+        if tile is None:
+            # Фон в пустой тайл - ничего не меняется
+            if value == self._background_packed:
+                return True
+            tile = self._allocate_tile(key)
+        
+        index = (y % size) * size + x % size
+        old_value = tile[index]
+        if old_value != value:
+            if self._recorder is not None:
+                self._recorder.record(y * self._width + x, old_value)
+            tile[index] = value
+            self._unsaved_tiles.add(key)
+            self.mark_dirty(x, y, 1, 1)
+        return True
+    
+    def _write_span(self, x: int, y: int, count: int, value: int) -> bool:
+        """Записать участок строки по тайлам (координаты уже проверены)"""
+        size = self._tile_size
+        row_offset = (y % size) * size
+        position = x
+        right = x + count
+        changed = False
+        
+        while position < right:
+            key = (position // size, y // size)
+            part = min(right, (key[0] + 1) * size) - position
+            tile = self._tiles.get(key)
+            if tile is None:
+                # Фон в пустой тайл - ничего не меняется
+                if value == self._background_packed:
+                    position += part
+                    continue
+                tile = self._allocate_tile(key)
+            
+            index = row_offset + position % size
+            old_values = tile[index:index + part]
+            if old_values.count(value) != part:
+                if self._recorder is not None:
+                    self._recorder.record_run(y * self._width + position, old_values)
+                tile[index:index + part] = array(PIXEL_TYPECODE, [value]) * part
+                self._unsaved_tiles.add(key)
+                changed = True
+            position += part
+        
+        return changed
+    
+    def read_run(self, start: int, count: int) -> array:
+        """Прочитать участок буфера по линейному индексу (y * width + x)"""
+        size = self._tile_size
+        result = array(PIXEL_TYPECODE)
+        for y, x, length, _ in self._split_run(start, count):
+            row_offset = (y % size) * size
+            end = x + length
+            while x < end:
+                key = (x // size, y // size)
+                part = min(end, (key[0] + 1) * size) - x
+                tile = self._tiles.get(key)
+                if tile is None:
+                    result.extend(self._background_row[:part])
+                else:
+                    index = row_offset + x % size
+                    result.extend(tile[index:index + part])
+                x += part
+        return result
+    
+    def write_run(self, start: int, values: array):
+        """Записать участок буфера по линейному индексу (по тайлам)"""
+        size = self._tile_size
+        background = self._background_packed
+        for y, x, length, offset in self._split_run(start, len(values)):
+            row_offset = (y % size) * size
+            end = x + length
+            while x < end:
+                key = (x // size, y // size)
+                count = min(end, (key[0] + 1) * size) - x
+                part = values[offset:offset + count]
+                tile = self._tiles.get(key)
+                if tile is None:
+                    if part.count(background) == count:
+                        x += count
+                        offset += count
+                        continue
+                    tile = self._allocate_tile(key)
+                
+                index = row_offset + x % size
+                tile[index:index + count] = part
+                self._unsaved_tiles.add(key)
+                x += count
+                offset += count
+        self._mark_run_dirty(start, len(values))
+    
+    def _split_run(self, start: int, count: int) -> Iterator[Tuple[int, int, int, int]]:
+        """
+        Разбить участок буфера на части по строкам
+        
+        Yields:
+            (y, x, длина, смещение от начала участка)
+        """
+        width = self._width
+        offset = 0
+        while offset < count:
+            y, x = divmod(start + offset, width)
+            length = min(width - x, count - offset)
+            yield y, x, length, offset
+            offset += length
+    
+    def diff_state(self, state: Dict[TileKey, array]) -> Iterator[PixelRun]:
+        """
+        Найти отличия текущего состояния от снимка тайлов
+        
+        Сравниваются только тайлы, которые есть в снимке или в сетке
+        
+        Args:
+            state: снимок тайлов из save_state()
+        
+        Yields:
+            Участки (start, цвета из снимка) в линейных индексах сетки
+        """
+        size = self._tile_size
+        width = self._width
+        empty = self._background_row * size
+        keys = set(state) | set(self._tiles)
+        
+        for key in sorted(keys, key=lambda k: (k[1], k[0])):
+            old_tile = state.get(key, empty)
+            new_tile = self._tiles.get(key, empty)
+            if old_tile == new_tile:
+                continue
+            
+            count = min(size, width - key[0] * size)
+            for row in range(min(size, self._height - key[1] * size)):
+                old_row = old_tile[row * size:row * size + count]
+                new_row = new_tile[row * size:row * size + count]
+                if old_row != new_row:
+                    row_start = (key[1] * size + row) * width + key[0] * size
+                    for offset, values in _diff_rows(old_row, new_row):
+                        yield row_start + offset, values
+    
+    def _allocate_tile(self, key: TileKey) -> array:
+        """Создать тайл, залитый цветом фона"""
+        tile = self._background_row * self._tile_size
+        self._tiles[key] = tile
+        return tile
+    
+    def get_row(self, y: int) -> array:
+        """Получить копию строки упакованных цветов"""
+        size = self._tile_size
+        tile_y = y // size
+        offset = (y % size) * size
+        row = array(PIXEL_TYPECODE)
+        
+        for tile_x in range(self._tiles_x):
+            count = min(size, self._width - tile_x * size)
+            tile = self._tiles.get((tile_x, tile_y))
+            if tile is None:
+                row.extend(self._background_row[:count])
+            else:
+                row.extend(tile[offset:offset + count])
+        return row
+    
+    def clear(self):
+        """Очистить всю сетку (удалить все тайлы)"""
+        self._record_state()
+        self._unsaved_tiles.update(self._tiles)
+        self._tiles = {}
+        self.mark_all_dirty()
+    
+    def save_state(self) -> Dict[TileKey, array]:
+        """
+        Сохранить текущее состояние сетки
+        
+        Returns:
+            Копии созданных тайлов (пустые тайлы не сохраняются)
+        """
+        return {key: array(PIXEL_TYPECODE, tile) for key, tile in self._tiles.items()}
+    
+    def restore_state(self, state: Union[Dict[TileKey, array], GridState,
+                                         List[List[Tuple[int, int, int]]]]):
+        """
+        Восстановить состояние сетки
+        
+        Args:
+            state: снимок тайлов из save_state(), плоский буфер
+                   упакованных цветов или двумерный массив цветов [x][y]
+        """
+        if isinstance(state, dict):
+            tiles = {key: array(PIXEL_TYPECODE, tile) for key, tile in state.items()}
+        elif len(state) and isinstance(state[0], (list, tuple)):
+            tiles = self._split_into_tiles(self._columns_to_pixels(state))
+        elif len(state) == self._width * self._height:
+            tiles = self._split_into_tiles(state)
+        else:
+            return
+        
+        self._record_state()
+        self._unsaved_tiles.update(self._tiles)
+        self._unsaved_tiles.update(tiles)
+        self._tiles = tiles
+        self.mark_all_dirty()
+    
+    def _columns_to_pixels(self, columns: List[List[Tuple[int, int, int]]]) -> array:
+        """Преобразовать двумерный массив цветов [x][y] в плоский буфер"""
+        width = self._width
+        pixels = array(PIXEL_TYPECODE, [self._background_packed]) * (width * self._height)
+        for x in range(min(len(columns), width)):
+            column = columns[x]
+            for y in range(min(len(column), self._height)):
+                pixels[y * width + x] = pack_rgb(column[y])
+        return pixels
+    
+    def _split_into_tiles(self, pixels: GridState) -> Dict[TileKey, array]:
+        """Разбить плоский буфер на тайлы, пропуская полностью пустые"""
+        size = self._tile_size
+        width = self._width
+        background = self._background_packed
+        tiles = {}
+        
+        for tile_y in range(self._tiles_y):
+            for tile_x in range(self._tiles_x):
+                tile = self._background_row * size
+                count = min(size, width - tile_x * size)
+                for row in range(min(size, self._height - tile_y * size)):
+                    start = (tile_y * size + row) * width + tile_x * size
+                    tile[row * size:row * size + count] = array(PIXEL_TYPECODE, pixels[start:start + count])
+                
+                if tile.count(background) != len(tile):
+                    tiles[(tile_x, tile_y)] = tile
+        
+        return tiles
+    
+    def __repr__(self) -> str:
+        return (f"TiledGrid({self._width}x{self._height}, cell_size={self._cell_size}, "
+                f"tile_size={self._tile_size}, tiles={len(self._tiles)})")
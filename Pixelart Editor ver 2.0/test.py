@@ -54,6 +54,35 @@ def test_imports():
             failed.append(module)
     
     print(f"\nРезультат: {success}/{len(modules)} модулей загружено")
+    
+    # Модели, инструменты и файлы проекта работают без pygame
+    import subprocess
+    import tempfile
+    headless = (
+        "import sys, os\n"
+        "from models import Grid\n"
+        "from tools import BrushTool, FillTool\n"
+        "from utils import save_grid_to_file, load_grid_from_file\n"
+        "from core import Config, StartupProfile, FrameProfiler, canvas_hash\n"
+        "grid = Grid(8, 8, 1)\n"
+        "BrushTool().use(grid, 2, 2, (255, 0, 0))\n"
+        "FillTool().use(grid, 7, 7, (0, 0, 255))\n"
+        "path = os.path.join(sys.argv[1], 'grid.txt')\n"
+        "save_grid_to_file(grid.get_columns(), path)\n"
+        "grid.restore_state(load_grid_from_file(path, 8, 8))\n"
+        "assert grid.get_cell_color(2, 2) == (255, 0, 0)\n"
+        "assert 'pygame' not in sys.modules, 'pygame imported'\n"
+    )
+    with tempfile.TemporaryDirectory() as folder:
+        result = subprocess.run([sys.executable, "-c", headless, folder],
+                                cwd=os.path.dirname(os.path.abspath(__file__)),
+                                capture_output=True, text=True)
+    if result.returncode == 0:
+        print("✓ models, tools, utils работают без pygame")
+    else:
+        print(f"✗ Ядро требует pygame: {result.stderr.strip().splitlines()[-1:]}")
+        failed.append('headless core')
+    
     if failed:
         print(f"Ошибки в: {', '.join(failed)}")
         return False
@@ -73,7 +102,7 @@ def test_models():
         
         # Пробуем импортировать History
         try:
-            from models.history import History
+            from models.history import UndoRedoManager as History
             has_history = True
         except (ImportError, AttributeError):
             has_history = False
@@ -95,6 +124,10 @@ def test_models():
         grid.set_cell_color(1, 1, (255, 0, 0))
         assert grid.get_cell_color(1, 1) == (255, 0, 0), "Изменение цвета"
         
+        # Внутри цвет упакован, кортеж - только по запросу
+        cell = grid.get_cell(1, 1)
+        assert cell.value == 0xFF0000 and cell.color == (255, 0, 0), "Упакованный цвет ячейки"
+        
         print("✓ Cell работает корректно")
         
         # Тест Grid
@@ -104,8 +137,60 @@ def test_models():
         assert grid2.get_cell(5, 5) is not None, "Получение ячейки"
         grid2.set_cell_color(5, 5, (255, 0, 0))
         assert grid2.get_cell_color(5, 5) == (255, 0, 0), "Установка цвета"
+        
+        # Снимок состояния - компактный буфер (4 байта на ячейку)
+        state = grid2.save_state()
+        assert len(state) == 100 and state.itemsize == 4, "Компактный снимок"
+        grid2.clear()
+        assert grid2.get_cell_color(5, 5) == (255, 255, 255), "Очистка"
+        grid2.restore_state(state)
+        assert grid2.get_cell_color(5, 5) == (255, 0, 0), "Восстановление снимка"
+        grid2.restore_state(grid2.get_columns())
+        assert grid2.get_cell_color(5, 5) == (255, 0, 0), "Восстановление из [x][y]"
+        
+        # Отслеживание изменений (dirty rectangles)
+        grid2.pop_dirty_rects()
+        assert not grid2.has_damage, "Нет изменений после отрисовки"
+        grid2.set_cell_color(5, 5, (255, 0, 0))
+        assert not grid2.has_damage, "Тот же цвет - нет изменений"
+        grid2.set_cell_color(2, 3, (0, 0, 255))
+        assert grid2.pop_dirty_rects() == [(2, 3, 1, 1)], "Изменена одна ячейка"
+        
+        # Изображение холста в исходном разрешении
+        from ui import GridRenderer
+        surface = GridRenderer.for_grid(grid2).surface
+        assert surface.get_size() == (10, 10), "Размер изображения = размер сетки"
+        assert tuple(surface.get_at((2, 3)))[:3] == (0, 0, 255), "Пиксель = ячейка"
+        
+        # Сдвиг окна просмотра (full) выводит видимую часть из готового
+        # изображения, не отмечая всю сетку измененной
+        renderer = GridRenderer.for_grid(grid2)
+        screen = pg.Surface((100, 100))
+        renderer.render(screen, full=True, cell_size=10)
+        renderer.render(screen, full=True, cell_size=10, visible_rect=(0, 0, 5, 5))
+        assert renderer.rendered_cells == 25, "Выведена только видимая часть"
+        assert not grid2.has_damage, "Сетка не отмечена измененной"
+        assert tuple(screen.get_at((25, 35)))[:3] == (0, 0, 255), "Ячейка на экране"
         print("✓ Grid работает корректно")
         
+        # Тест TiledGrid (разреженный холст)
+        print("\n[TiledGrid]")
+        from models import TiledGrid
+        big = Grid.create(4096, 4096, 1)
+        assert isinstance(big, TiledGrid), "Большой холст - разреженный"
+        assert big.tile_count == 0, "Пустые тайлы не создаются"
+        big.set_cell_color(4000, 10, (255, 0, 0))
+        big.set_cell_color(5, 5, (255, 255, 255))
+        assert big.tile_count == 1, "Создан только закрашенный тайл"
+        assert big.get_cell_color(4000, 10) == (255, 0, 0), "Цвет в тайле"
+        assert big.get_cell_color(0, 0) == (255, 255, 255), "Пустой тайл = фон"
+        tiled_state = big.save_state()
+        big.clear()
+        assert big.tile_count == 0, "Очистка удаляет тайлы"
+        big.restore_state(tiled_state)
+        assert big.get_cell_color(4000, 10) == (255, 0, 0), "Восстановление тайлов"
+        print("✓ TiledGrid работает корректно")
+        
         # Тест Palette
         print("\n[Palette]")
         colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255)]
@@ -115,6 +200,7 @@ def test_models():
         assert palette.selected_color == (255, 0, 0), "Выбранный цвет"
         palette.select_color(1)
         assert palette.selected_color == (0, 255, 0), "Смена выбранного цвета"
+        assert palette.selected_value == 0x00FF00 and palette.values[2] == 0x0000FF, "Упакованные цвета"
         print("✓ Palette работает корректно")
         
         # Тест PaletteManager
@@ -147,11 +233,58 @@ def test_models():
             # Отменяем последнее изменение
             history.undo()
             assert grid3.get_cell_color(0, 0) == (255, 0, 0), "Undo восстановил состояние"
+            
+            # История хранит только измененные ячейки
+            grid4 = Grid(256, 256, 1)
+            grid4.history.begin_action()
+            for x in range(10, 20):
+                grid4.set_cell_color(x, 5, (0, 0, 0))
+            grid4.history.end_action()
+            assert grid4.history.get_memory_usage() < 256, "Память истории ~ размер штриха"
+            grid4.history.begin_action()
+            grid4.clear()
+            grid4.history.end_action()
+            assert grid4.history.get_undo_count() == 2, "Штрих и очистка в истории"
+            grid4.history.undo()
+            assert grid4.get_cell_color(15, 5) == (0, 0, 0), "Undo очистки"
+            grid4.history.undo()
+            assert grid4.get_cell_color(15, 5) == (255, 255, 255), "Undo штриха"
+            grid4.history.redo()
+            assert grid4.get_cell_color(19, 5) == (0, 0, 0), "Redo штриха"
+            
+            # То же для разреженной сетки
+            big.history.begin_action()
+            big.set_cell_color(100, 4000, (0, 255, 0))
+            big.history.end_action()
+            big.history.undo()
+            assert big.get_cell_color(100, 4000) == (255, 255, 255), "Undo в тайле"
+            big.history.redo()
+            assert big.get_cell_color(100, 4000) == (0, 255, 0), "Redo в тайле"
+            
+            # Бюджет памяти: давние действия сжимаются, лишние удаляются
+            grid5 = Grid(256, 256, 1)
+            history5 = grid5.history
+            history5.set_limits(max_history=100, hot_entries=2)
+            for step in range(10):
+                history5.begin_action()
+                for y in range(64):
+                    grid5.set_cell_color(step, y, (step, 0, 0))
+                history5.end_action()
+            assert history5.get_undo_count() == 10, "Все действия в истории"
+            assert history5._undo_stack[0].is_compressed, "Давнее действие сжато"
+            assert not history5._undo_stack[-1].is_compressed, "Последнее не сжато"
+            for _ in range(10):
+                history5.undo()
+            assert grid5.get_cell_color(0, 0) == (255, 255, 255), "Undo сжатых действий"
+            history5.redo()
+            assert grid5.get_cell_color(0, 63) == (0, 0, 0), "Redo сжатого действия"
+            history5.set_limits(memory_budget=history5.get_memory_usage() // 2)
+            assert history5.get_memory_usage() <= history5.memory_budget, "Бюджет памяти соблюден"
             print("✓ History работает корректно")
         
         print("\n✅ Все модели работают!")
         return True
-        
+    
     except Exception as e:
         print(f"\n❌ Критическая ошибка: {e}")
         import traceback
@@ -176,6 +309,36 @@ def test_tools():
     brush.size = 1
     brush.use(grid, 5, 5, (255, 0, 0))
     assert grid.get_cell_color(5, 5) == (255, 0, 0), "Рисование кистью"
+    
+    # Отпечатки кисти: кэш, участки строк без повторов, большие размеры
+    from tools import get_stamp
+    assert get_stamp('round', 3) is get_stamp('round', 3), "Отпечаток из кэша"
+    assert get_stamp('round', 2).cell_count == 5, "Размер 2 - крест"
+    assert get_stamp('round', 5).cell_count == 25, "Размер 5 - квадрат 5x5, как прежде"
+    assert get_stamp('square', 4).cell_count == 16, "Квадрат 4x4"
+    offsets = get_stamp('round', 64).offsets
+    assert len(offsets) == len(set(offsets)), "Ячейки отпечатка не повторяются"
+    brush.size = 64
+    assert brush.size == 64, "Размер кисти до 64"
+    big_grid = Grid(128, 128, 1)
+    brush.use(big_grid, 64, 64, (0, 0, 255))
+    assert big_grid.get_cell_color(64 + 31, 64) == (0, 0, 255), "Большая кисть"
+    assert big_grid.get_cell_color(64 + 31, 64 + 31) == (255, 255, 255), "Круглая форма"
+    brush.size = 1
+    
+    # Штрих: быстрый отрезок без разрывов, без повторной закраски
+    line_grid = Grid(32, 32, 1)
+    brush.begin_stroke(line_grid, 0, 0, (255, 0, 0))
+    brush.stroke_to(line_grid, 20, 9, (255, 0, 0))
+    from utils import bresenham_line
+    assert all(line_grid.get_cell_color(x, y) == (255, 0, 0)
+               for x, y in bresenham_line(0, 0, 20, 9)), "Отрезок штриха без разрывов"
+    assert brush.stroke.painted == 21, "Каждая ячейка отрезка закрашена один раз"
+    brush.stroke_to(line_grid, 25, 9, (255, 0, 0))
+    brush.stroke_to(line_grid, 20, 9, (255, 0, 0))
+    assert brush.stroke.painted == 26, "Повторный проход не закрашивает ячейки"
+    brush.end_stroke()
+    assert brush.stroke is None, "Штрих закончен"
     print("✓ BrushTool работает")
     
     # Тест Eraser
@@ -191,6 +354,19 @@ def test_tools():
     grid.set_cell_color(3, 3, (255, 0, 0))
     fill.use(grid, 3, 3, (0, 255, 0))
     assert grid.get_cell_color(3, 3) == (0, 255, 0), "Заливка цветом"
+    
+    # Заливка не выходит за стены (4-связность) и заполняет всю область
+    from models import Grid
+    walled = Grid(8, 8, 1)
+    for i in range(8):
+        walled.set_cell_color(4, i, (0, 0, 0))
+    walled.set_cell_color(6, 2, (0, 0, 0))
+    fill.use(walled, 0, 0, (0, 0, 255))
+    assert walled.get_cell_color(3, 7) == (0, 0, 255), "Вся область залита"
+    assert walled.get_cell_color(5, 0) == (255, 255, 255), "За стеной не залито"
+    fill.use(walled, 7, 7, (0, 255, 0))
+    assert walled.get_cell_color(5, 0) == (0, 255, 0), "Область с выступом"
+    assert walled.get_cell_color(6, 2) == (0, 0, 0), "Выступ не залит"
     print("✓ FillTool работает")
     
     # Тест EyeDropper
@@ -230,6 +406,25 @@ def test_ui():
     btn.set_on_click(lambda: clicks.append(1))
     btn._is_hovered = True
     btn.update((110, 110), True)
+    
+    # Вид состояний собирается один раз поверх известного фона
+    background = pg.Surface((400, 400))
+    background.fill((150, 150, 150))
+    icon = pg.Surface((8, 8))
+    icon.fill((255, 0, 0))
+    btn.set_icon(icon)
+    btn.set_background(background)
+    target = pg.Surface((400, 400))
+    btn.update((0, 0), False)
+    btn.render(target)
+    normal = btn._state_surfaces['normal']
+    btn.render(target)
+    assert btn._state_surfaces['normal'] is normal, "Состояние из кэша"
+    assert target.get_at((105, 105))[:3] == (255, 0, 0), "Иконка в готовом виде кнопки"
+    btn.update((110, 130), False)
+    assert btn.state == 'hover' and btn.is_dirty, "Наведение меняет состояние"
+    btn.render(target)
+    assert target.get_at((170, 135)) != normal.get_at((70, 35)), "Вид наведения отличается"
     print("✓ Button работает")
     
     # Тест Slider
@@ -242,6 +437,15 @@ def test_ui():
     elif hasattr(slider, '_min_value'):
         assert slider._min_value == 1, "Минимум"
         assert slider._max_value == 5, "Максимум"
+    
+    # Надписи слайдера берутся из кэша текста
+    from ui import get_font, render_text
+    assert get_font(None, 25) is slider._font, "Шрифт из кэша"
+    screen = pg.Surface((400, 400))
+    slider.render(screen)
+    assert render_text(get_font(None, 25), "3", (30, 30, 30)) is render_text(slider._font, "3", (30, 30, 30)), \
+        "Повторная надпись из кэша"
+    assert screen.get_rect().contains(slider.rect), "Область слайдера"
     print("✓ Slider работает")
     
     # Тест ColorPicker
@@ -250,8 +454,40 @@ def test_ui():
     picker = ColorPicker(300, 300)
     picker.set_colors(colors)
     assert len(picker._colors) == 3, "Цвета загружены"
+    picker.render(screen, (0, 255, 0))
+    assert picker.rect.collidepoint(300, 300) and not picker.is_dirty, "Область палитры"
+    assert screen.get_at((picker.rect.centerx, picker.rect.bottom - 10))[:3] == (0, 255, 0), \
+        "Индикатор цвета внутри области палитры"
+    
+    # Выбор по координатам ячейки и по словарю цветов
+    assert picker.update((345, 305), True) == (0, 0, 255), "Клик по третьей ячейке"
+    assert picker.update((305, 322), True) is None, "Отступ между рядами"
+    picker.set_selected_color((0, 255, 0))
+    assert picker._selected_index == 1, "Выбор цвета по словарю"
+    big_palette = [(i % 256, i // 256, 0) for i in range(4096)]
+    picker.set_colors(big_palette)
+    assert picker.index_at((300 + 3 * 20 + 1, 300 + 400 * 25 + 1)) == 400 * 8 + 3, "Большая палитра"
+    picker.set_selected_color(big_palette[4000])
+    assert picker._selected_index == 4000, "Цвет большой палитры"
     print("✓ ColorPicker работает")
     
+    # Тест Viewport
+    print("\n[Viewport]")
+    from ui import Viewport
+    viewport = Viewport((0, 0, 768, 768), 64, 64, zoom=12)
+    assert viewport.zoom == 12, "Холст 64x64 помещается при масштабе 12"
+    assert viewport.screen_to_grid(100, 100) == (8, 8), "Экран -> сетка"
+    assert viewport.visible_cells() == (0, 0, 64, 64), "Видна вся сетка"
+    viewport.zoom_in((0, 0))
+    assert viewport.zoom == 16 and viewport.screen_to_grid(0, 0) == (0, 0), "Масштаб от якоря"
+    assert viewport.visible_cells() == (0, 0, 48, 48), "Отсечение невидимых ячеек"
+    viewport.pan(-160, 0)
+    assert viewport.screen_to_grid(0, 0) == (10, 0), "Сдвиг холста"
+    big_view = Viewport((0, 0, 768, 768), 4096, 4096, zoom=12)
+    assert big_view.zoom == 1, "Большой холст - минимальный масштаб"
+    assert big_view.visible_cells() == (0, 0, 768, 768), "Видимая часть ограничена окном"
+    print("✓ Viewport работает")
+    
     print("\n✅ Все UI компоненты работают!")
     return True
 
@@ -270,6 +506,39 @@ def test_controllers():
     print("\n[InputController]")
     input_ctrl = InputController()
     assert input_ctrl.mouse_pos == (0, 0), "Начальная позиция мыши"
+    from core import Config
+    cell = Config.CELL_SIZE
+    assert input_ctrl.pixel_to_grid(cell * 3, cell * 2 + 1) == (3, 2), "Без окна просмотра - Config.CELL_SIZE"
+    assert input_ctrl.pixel_to_grid(25, 45, 20) == (1, 2), "Явный размер ячейки"
+    
+    # Все движения мыши с нажатой кнопкой сохраняются по порядку со временем
+    input_ctrl.update([pg.event.Event(pg.MOUSEBUTTONDOWN, pos=(0, 0), button=1)])
+    motion = [pg.event.Event(pg.MOUSEMOTION, pos=(i, 2 * i), rel=(1, 2), buttons=(1, 0, 0))
+              for i in range(1, 6)]
+    input_ctrl.update(motion)
+    assert input_ctrl.mouse_path == [(i, 2 * i) for i in range(1, 6)], "Все положения за кадр"
+    times = [sample.time for sample in input_ctrl.mouse_samples]
+    assert times == sorted(times), "Время положений не убывает"
+    assert input_ctrl.mouse_rel == (5, 10), "Суммарное смещение"
+    input_ctrl.update([])
+    assert input_ctrl.mouse_samples == [], "Положения сбрасываются каждый кадр"
+    
+    # Путь начинается с нажатия: движение до него в том же кадре
+    # не соединяется с точкой нажатия, после отпускания - не пишется
+    input_ctrl.update([pg.event.Event(pg.MOUSEBUTTONUP, pos=(5, 10), button=1)])
+    input_ctrl.update([pg.event.Event(pg.MOUSEMOTION, pos=(30, 30), rel=(25, 20), buttons=(0, 0, 0)),
+                       pg.event.Event(pg.MOUSEBUTTONDOWN, pos=(400, 400), button=1)])
+    assert input_ctrl.mouse_path == [(400, 400)], "Путь начинается с точки нажатия"
+    input_ctrl.update([pg.event.Event(pg.MOUSEMOTION, pos=(410, 400), rel=(10, 0), buttons=(1, 0, 0)),
+                       pg.event.Event(pg.MOUSEBUTTONUP, pos=(410, 400), button=1),
+                       pg.event.Event(pg.MOUSEMOTION, pos=(500, 500), rel=(90, 100), buttons=(0, 0, 0))])
+    assert input_ctrl.mouse_path == [(410, 400)], "Путь заканчивается отпусканием"
+    
+    # Неиспользуемые события не попадают в очередь
+    InputController.restrict_event_queue((pg.QUIT,))
+    assert pg.event.get_blocked(pg.TEXTINPUT), "Ввод текста отфильтрован"
+    assert not pg.event.get_blocked(pg.MOUSEMOTION), "Движение мыши разрешено"
+    pg.event.set_allowed(None)
     print("✓ InputController работает")
     
     # Тест CanvasController
@@ -279,12 +548,134 @@ def test_controllers():
     canvas = CanvasController(grid, tm)
     assert canvas.current_color == (0, 0, 0), "Начальный цвет"
     canvas.current_color = (255, 0, 0)
+    assert canvas.current_value == 0xFF0000, "Цвет рисования хранится упакованным"
     canvas.start_drawing()
     canvas.draw_at(5, 5)
     assert grid.get_cell_color(5, 5) == (255, 0, 0), "Рисование через контроллер"
     canvas.stop_drawing()
+    
+    # Штрих через контроллер: позиции соединяются, одно действие в истории
+    tm.select_tool_by_name("Brush")
+    tm.current_tool.size = 1
+    canvas.start_drawing()
+    canvas.stroke_to(0, 9)
+    canvas.stroke_to(9, 0)
+    assert canvas.is_drawing, "Штрих идет"
+    canvas.stop_drawing()
+    assert all(grid.get_cell_color(x, 9 - x) == (255, 0, 0) for x in range(10)), "Штрих через контроллер"
+    canvas.undo()
+    assert grid.get_cell_color(1, 8) == (255, 255, 255), "Штрих отменяется одним действием"
     print("✓ CanvasController работает")
     
+    # Тест FileController: бинарный формат и старый текстовый
+    print("\n[FileController]")
+    import tempfile
+    import time
+    from controllers import FileController
+    from utils import is_project_file
+    file_ctrl = FileController()
+    with tempfile.TemporaryDirectory() as folder:
+        binary_path = os.path.join(folder, "project.pxp")
+        text_path = os.path.join(folder, "project.txt")
+        assert file_ctrl.save_project(grid, binary_path), "Сохранение .pxp"
+        assert file_ctrl.save_project(grid, text_path), "Сохранение .txt"
+        assert is_project_file(binary_path), "Сигнатура бинарного файла"
+        assert os.path.getsize(binary_path) < os.path.getsize(text_path), "Бинарный файл меньше"
+        
+        for path in (binary_path, text_path):
+            loaded = Grid(10, 10, 20)
+            assert file_ctrl.load_project(loaded, path), "Загрузка проекта"
+            assert loaded.pixels == grid.pixels, "Проект загружен без потерь"
+        
+        # Разреженная сетка: снимок копирует только измененные тайлы,
+        # сохранение снимает отметку несохраненных изменений
+        from models import TiledGrid
+        tiled = TiledGrid(128, 128, 1, tile_size=32)
+        tiled.set_cell_color(1, 1, (255, 0, 0))
+        tiled.set_cell_color(100, 100, (0, 255, 0))
+        tiled_path = os.path.join(folder, "tiled.pxp")
+        assert file_ctrl.save_project(tiled, tiled_path), "Сохранение тайлов"
+        assert not tiled.has_unsaved_changes, "Изменения сохранены"
+        kept = file_ctrl._tile_copies[(3, 3)]
+        tiled.set_cell_color(2, 2, (0, 0, 255))
+        tiled.set_cell_color(100, 100, (255, 255, 255))
+        assert tiled.has_unsaved_changes, "Изменения после сохранения"
+        assert file_ctrl.save_project(tiled, tiled_path), "Повторное сохранение"
+        assert file_ctrl._tile_copies[(3, 3)] is not kept, "Измененный тайл скопирован заново"
+        loaded = TiledGrid(128, 128, 1, tile_size=32)
+        assert file_ctrl.load_project(loaded, tiled_path), "Загрузка тайлов"
+        assert loaded.pixels == tiled.pixels, "Снимок совпадает с сеткой"
+        assert not loaded.has_unsaved_changes, "Загруженный проект не изменен"
+        
+        # Экспорт PNG из данных сетки с заданным масштабом
+        png_path = os.path.join(folder, "image.png")
+        assert file_ctrl.export_image(grid, 3, png_path), "Экспорт PNG"
+        image = pg.image.load(png_path)
+        assert image.get_size() == (30, 30), "Размер PNG = сетка x масштаб"
+        assert tuple(image.get_at((17, 17)))[:3] == (255, 0, 0), "Ячейка увеличена без сглаживания"
+        
+        # Масштаб уменьшается, если PNG больше предела
+        from core import Config
+        max_pixels = Config.EXPORT_MAX_PIXELS
+        Config.EXPORT_MAX_PIXELS = 40 * 40
+        try:
+            assert file_ctrl.export_image(grid, 16, png_path), "Экспорт с большим масштабом"
+        finally:
+            Config.EXPORT_MAX_PIXELS = max_pixels
+        assert pg.image.load(png_path).get_size() == (40, 40), "Масштаб ограничен размером PNG"
+        
+        # Фоновые операции: сохраняется снимок на момент запроса,
+        # результат применяется в process_results
+        async_path = os.path.join(folder, "async.pxp")
+        file_ctrl.request_save(grid, async_path)
+        grid.set_cell_color(0, 0, (0, 0, 255))
+        assert file_ctrl.busy, "Сохранение в фоне"
+        file_ctrl.finish_pending(grid)
+        assert not file_ctrl.busy and file_ctrl.current_filename == "async.pxp", "Сохранение завершено"
+        
+        # Путь без расширения: запоминается действительно записанный файл
+        assert file_ctrl.save_project(grid, os.path.join(folder, "bare")), "Сохранение без расширения"
+        assert file_ctrl.current_filename == "bare.pxp", "Имя файла с расширением"
+        assert os.path.exists(os.path.join(folder, "bare.pxp")), "Файл .pxp записан"
+        
+        loaded = Grid(10, 10, 20)
+        file_ctrl.request_load(loaded, async_path)
+        assert loaded.get_cell_color(5, 5) == (255, 255, 255), "Сетка меняется только в главном потоке"
+        results = []
+        deadline = time.time() + 10
+        while not results and time.time() < deadline:
+            results = file_ctrl.process_results(loaded)
+            time.sleep(0.01)
+        assert [result.ok for result in results] == [True], "Загрузка в фоне"
+        assert loaded.get_cell_color(0, 0) == (255, 255, 255), "Загружен снимок до изменения"
+        assert loaded.get_cell_color(5, 5) == (255, 0, 0), "Фоновая загрузка"
+    print("✓ FileController работает")
+    
+    # Запись ввода: события pygame -> файл .pxr -> те же события
+    print("\n[Запись ввода]")
+    from controllers import record_event, replay_event
+    from utils import InputRecording, save_recording, load_recording
+    events = [
+        pg.event.Event(pg.MOUSEBUTTONDOWN, pos=(5, 6), button=1),
+        pg.event.Event(pg.MOUSEMOTION, pos=(9, 8), rel=(4, 2), buttons=(1, 0, 0)),
+        pg.event.Event(pg.KEYDOWN, key=pg.K_z, mod=pg.KMOD_LCTRL),
+    ]
+    recording = InputRecording(10, 10)
+    recording.add_frame(120, (9, 8), [record_event(event) for event in events])
+    with tempfile.TemporaryDirectory() as folder:
+        record_path = os.path.join(folder, "session.pxr")
+        assert save_recording(recording, record_path), "Сохранение записи"
+        loaded_recording = load_recording(record_path)
+    assert loaded_recording.frames == recording.frames, "Запись загружена без потерь"
+    
+    replayed = [replay_event(event) for event in loaded_recording.frames[0].events]
+    input_ctrl = InputController()
+    input_ctrl.update(replayed, mouse_pos=(9, 8), time=120)
+    assert input_ctrl.mouse_pos == (9, 8) and input_ctrl.left_mouse_pressed, "Состояние мыши"
+    assert input_ctrl.mouse_samples[-1] == (9, 8, 120), "Время из записи"
+    assert replayed[2].mod & pg.KMOD_CTRL and input_ctrl.is_key_down(pg.K_z), "Клавиши"
+    print("✓ Запись ввода работает")
+    
     print("\n✅ Все контроллеры работают!")
     return True
 
@@ -308,6 +699,52 @@ def test_config():
     assert Config.SCREEN_WIDTH == 960, "Ширина окна"
     assert Config.SCREEN_HEIGHT == 850, "Высота окна"
     
+    # Профиль запуска (main.py --profile-startup)
+    from core import StartupProfile
+    profile = StartupProfile()
+    profile.import_modules(['models', 'tools'])
+    with profile.measure("init", "stage"):
+        pass
+    profile.mark_first_frame()
+    assert [stage[:2] for stage in profile.stages] == [
+        ("import", "models"), ("import", "tools"), ("init", "stage")], "Этапы запуска"
+    assert profile.first_frame is not None and "До первого кадра" in profile.report(), "Отчет"
+    print("✓ StartupProfile работает корректно")
+    
+    # Профиль кадров: выключенный ничего не записывает
+    import json
+    import tempfile
+    from core import FrameProfiler
+    profiler = FrameProfiler()
+    profiler.begin_frame()
+    with profiler.phase("события"):
+        pass
+    profiler.end_frame()
+    assert profiler.stats() is None and profiler.trace_event_count == 0, "Выключенный профиль"
+    
+    profiler.set_collecting(True)
+    profiler.start_trace()
+    for _ in range(3):
+        profiler.begin_frame()
+        for _ in range(2):
+            with profiler.phase("инструмент Brush"):
+                pass
+        profiler.add_cells(5)
+        profiler.end_frame()
+    stats = profiler.stats()
+    assert stats.frames == 3 and stats.cells == 5, "Статистика кадров"
+    assert [name for name, _ in stats.phases] == ["инструмент Brush"], "Фазы суммируются"
+    assert stats.p50 <= stats.p95 <= stats.p99, "Перцентили"
+    
+    profiler.stop_trace()
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "trace.json")
+        profiler.save_trace(path)
+        with open(path, encoding='utf-8') as f:
+            events = json.load(f)["traceEvents"]
+    assert sum(event["ph"] == "X" for event in events) == 9, "События трассы"
+    print("✓ FrameProfiler работает корректно")
+    
     print("\n✅ Конфигурация корректна!")
     return True
 
@@ -381,6 +818,28 @@ def test_integration():
     else:
         print(f"⚠️  Неожиданный цвет после Undo: {restored_color}")
     
+    # Пакетное преобразование: .txt -> .png (x3) -> .pxp -> .txt без потерь
+    import tempfile
+    from convert import ConvertJob, convert_file
+    from utils import save_grid_to_file
+    with tempfile.TemporaryDirectory() as folder:
+        source = os.path.join(folder, "drawing.txt")
+        save_grid_to_file(grid.get_columns(), source)
+        size = (grid.width, grid.height)
+        out_dir = os.path.join(folder, "out")
+        steps = [ConvertJob(source, 'png', (1, 3), size, 1, None),
+                 ConvertJob(os.path.join(folder, "drawing_x3.png"), 'pxp', (1,), size, 3, None),
+                 ConvertJob(os.path.join(folder, "drawing_x3.pxp"), 'txt', (1,), size, 1, out_dir)]
+        os.makedirs(out_dir)
+        for job in steps:
+            result = convert_file(job)
+            assert result.error is None, f"Преобразование {job.source}: {result.error}"
+        assert [os.path.basename(path) for path in convert_file(steps[0]).outputs] == [
+            "drawing.png", "drawing_x3.png"], "Имена PNG по масштабам"
+        with open(source) as original, open(os.path.join(out_dir, "drawing_x3.txt")) as converted:
+            assert original.read() == converted.read(), "Преобразование без потерь"
+    print("✅ Пакетное преобразование работает")
+    
     print("\n✅ Интеграция работает!")
     return True
 
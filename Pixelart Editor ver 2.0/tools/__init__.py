@@ -6,6 +6,9 @@
 - BrushTool: кисть для рисования
 - EraserTool: ластик для стирания
 - FillTool: заливка области
+- scanline_fill: построчная заливка (используется FillTool)
+- BrushStamp, get_stamp: кэш отпечатков кисти (используется BrushTool)
+- Stroke: штрих кисти с интерполяцией между положениями мыши
 - EyeDropperTool: пипетка для выбора цвета
 - ToolManager: управление инструментами
 """
@@ -14,6 +17,9 @@ from .base_tool import Tool
 from .brush_tool import BrushTool
 from .eraser_tool import EraserTool
 from .fill_tool import FillTool
+from .flood_fill import scanline_fill
+from .brush_stamp import BrushStamp, get_stamp, register_shape, register_mask
+from .stroke import Stroke
 from .eyedropper_tool import EyeDropperTool
 from .tool_manager import ToolManager
 
@@ -22,6 +28,12 @@ __all__ = [
     'BrushTool',
     'EraserTool',
     'FillTool',
+    'scanline_fill',
+    'BrushStamp',
+    'get_stamp',
+    'register_shape',
+    'register_mask',
+    'Stroke',
     'EyeDropperTool',
     'ToolManager',
 ]
@@ -4,11 +4,11 @@
 """Базовый класс для всех инструментов"""
 
 from abc import ABC, abstractmethod
-from typing import Tuple, TYPE_CHECKING
-import pygame as pg
+from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from models import Grid
+    from models.color import ColorLike
 
 
 class Tool(ABC):
@@ -17,6 +17,10 @@ class Tool(ABC):
     Реализует паттерн Strategy
     """
     
+    # Допустимый размер инструмента
+    MIN_SIZE = 1
+    MAX_SIZE = 64
+    
     def __init__(self, name: str):
         """
         Инициализация инструмента
@@ -25,7 +29,7 @@ class Tool(ABC):
             name: название инструмента
         """
         self._name = name
-        self._size = 3  # Размер инструмента (1-5)
+        self._size = 3  # Размер инструмента (MIN_SIZE-MAX_SIZE)
     
     @property
     def name(self) -> str:
@@ -39,11 +43,11 @@ class Tool(ABC):
     
     @size.setter
     def size(self, value: int):
-        """Установить размер (1-5)"""
-        self._size = max(1, min(5, value))
+        """Установить размер (MIN_SIZE-MAX_SIZE)"""
+        self._size = max(self.MIN_SIZE, min(self.MAX_SIZE, value))
     
     @abstractmethod
-    def use(self, grid: 'Grid', x: int, y: int, color: Tuple[int, int, int]):
+    def use(self, grid: 'Grid', x: int, y: int, color: 'ColorLike'):
         """
         Использовать инструмент на сетке
         
@@ -51,20 +55,38 @@ class Tool(ABC):
             grid: сетка для рисования
             x: координата X (в ячейках)
             y: координата Y (в ячейках)
-            color: цвет для применения
+            color: цвет для применения (упакованный или (R, G, B))
         """
         pass
     
-    @abstractmethod
-    def draw_cursor(self, screen: pg.Surface, pos: Tuple[int, int], color: Tuple[int, int, int]):
+    def begin_stroke(self, grid: 'Grid', x: int, y: int, color: 'ColorLike'):
+        """
+        Начать штрих (нажатие кнопки мыши)
+        
+        По умолчанию инструмент просто применяется в точке
+        
+        Args:
+            grid: сетка для рисования
+            x, y: координаты в сетке
+            color: цвет для применения
+        """
+        self.use(grid, x, y, color)
+    
+    def stroke_to(self, grid: 'Grid', x: int, y: int, color: 'ColorLike',
+                  connect: bool = True):
         """
-        Отрисовать курсор инструмента
+        Продолжить штрих до точки (движение мыши с нажатой кнопкой)
         
         Args:
-            screen: поверхность для рисования
-            pos: позиция курсора (в пикселях)
-            color: цвет курсора
+            grid: сетка для рисования
+            x, y: координаты в сетке
+            color: цвет для применения
+            connect: соединить точку с предыдущей (False - перо поднималось)
         """
+        self.use(grid, x, y, color)
+    
+    def end_stroke(self):
+        """Закончить штрих (отпускание кнопки мыши)"""
         pass
     
     def __repr__(self) -> str:
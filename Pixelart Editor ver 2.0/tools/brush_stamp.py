@@ -0,0 +1,183 @@
+# ========================================
+# tools/brush_stamp.py
+# ========================================
+"""Отпечатки кисти (маски) с кэшированием по форме и размеру"""
+
+from typing import Callable, Dict, Iterable, List, Tuple
+
+
+# Участок строки отпечатка: (dy, dx начала, длина) относительно центра
+StampSpan = Tuple[int, int, int]
+
+# Построитель маски: размер -> смещения (dx, dy) закрашиваемых ячеек
+ShapeFactory = Callable[[int], Iterable[Tuple[int, int]]]
+
+
+class BrushStamp:
+    """
+    Отпечаток кисти - маска, хранящаяся как участки строк
+    
+    Каждая ячейка маски входит ровно в один участок, поэтому
+    при нанесении отпечатка ячейки не закрашиваются повторно
+    """
+    
+    def __init__(self, shape: str, size: int, offsets: Iterable[Tuple[int, int]]):
+        """
+        Инициализация отпечатка
+        
+        Args:
+            shape: название формы
+            size: размер кисти
+            offsets: смещения (dx, dy) ячеек маски (повторы допускаются)
+        """
+        self._shape = shape
+        self._size = size
+        self._spans = _offsets_to_spans(offsets)
+        self._cell_count = sum(length for _, _, length in self._spans)
+    
+    @property
+    def shape(self) -> str:
+        """Название формы"""
+        return self._shape
+    
+    @property
+    def size(self) -> int:
+        """Размер кисти"""
+        return self._size
+    
+    @property
+    def spans(self) -> Tuple[StampSpan, ...]:
+        """Участки строк (dy, dx, длина), упорядоченные по dy"""
+        return self._spans
+    
+    @property
+    def cell_count(self) -> int:
+        """Количество ячеек маски"""
+        return self._cell_count
+    
+    @property
+    def offsets(self) -> List[Tuple[int, int]]:
+        """Смещения (dx, dy) всех ячеек маски"""
+        return [(dx + i, dy) for dy, dx, length in self._spans for i in range(length)]
+    
+    def __repr__(self) -> str:
+        return f"BrushStamp('{self._shape}', size={self._size}, cells={self._cell_count})"
+
+
+def _offsets_to_spans(offsets: Iterable[Tuple[int, int]]) -> Tuple[StampSpan, ...]:
+    """Сгруппировать смещения по строкам в непрерывные участки (без повторов)"""
+    rows: Dict[int, set] = {}
+    for dx, dy in offsets:
+        rows.setdefault(dy, set()).add(dx)
+    
+    spans: List[StampSpan] = []
+    for dy in sorted(rows):
+        columns = sorted(rows[dy])
+        start = previous = columns[0]
+        for dx in columns[1:]:
+            if dx != previous + 1:
+                spans.append((dy, start, previous - start + 1))
+                start = dx
+            previous = dx
+        spans.append((dy, start, previous - start + 1))
+    return tuple(spans)
+
+
+def _round_shape(size: int) -> Iterable[Tuple[int, int]]:
+    """
+    Круг радиуса size / 2 с центром в ячейке
+    
+    Для размеров 1-5 совпадает с прежними узорами кисти (точка, крест,
+    квадрат 3x3, квадрат 3x3 с выступами, квадрат 5x5): круг размера 5
+    без четырех углов отличался бы от привычной кисти
+    """
+    if size == 5:
+        yield from _square_shape(size)
+        return
+    
+    radius_sq = (size / 2) ** 2
+    reach = size // 2
+    for dy in range(-reach, reach + 1):
+        for dx in range(-reach, reach + 1):
+            if dx * dx + dy * dy <= radius_sq:
+                yield dx, dy
+
+
+def _square_shape(size: int) -> Iterable[Tuple[int, int]]:
+    """Квадрат size x size (для четных размеров центр смещен влево-вверх)"""
+    start = -(size // 2)
+    for dy in range(start, start + size):
+        for dx in range(start, start + size):
+            yield dx, dy
+
+
+# Зарегистрированные формы кисти
+_SHAPES: Dict[str, ShapeFactory] = {
+    'round': _round_shape,
+    'square': _square_shape,
+}
+
+# Кэш готовых отпечатков: (форма, размер) -> отпечаток
+_STAMP_CACHE: Dict[Tuple[str, int], BrushStamp] = {}
+
+
+def get_stamp(shape: str, size: int) -> BrushStamp:
+    """
+    Получить отпечаток кисти (строится один раз для пары форма/размер)
+    
+    Args:
+        shape: название формы ('round', 'square' или зарегистрированная)
+        size: размер кисти
+    
+    Returns:
+        Отпечаток кисти
+    
+    Raises:
+        KeyError: если форма не зарегистрирована
+    """
+    key = (shape, size)
+    stamp = _STAMP_CACHE.get(key)
+    if stamp is None:
+        stamp = BrushStamp(shape, size, _SHAPES[shape](size))
+        _STAMP_CACHE[key] = stamp
+    return stamp
+
+
+def register_shape(name: str, factory: ShapeFactory):
+    """
+    Зарегистрировать форму кисти
+    
+    Args:
+        name: название формы
+        factory: функция размер -> смещения (dx, dy) ячеек маски
+    """
+    _SHAPES[name] = factory
+    
+    # Отпечатки прежней формы с тем же названием больше не действительны
+    for key in [key for key in _STAMP_CACHE if key[0] == name]:
+        del _STAMP_CACHE[key]
+
+
+def register_mask(name: str, rows: List[str]):
+    """
+    Зарегистрировать форму из текстовой маски (одинаковой для всех размеров)
+    
+    Args:
+        name: название формы
+        rows: строки маски, '#' - закрашиваемая ячейка; центр маски -
+              середина прямоугольника строк
+    
+    Example:
+        >>> register_mask('dither', ['#.#', '.#.', '#.#'])
+    """
+    height = len(rows)
+    width = max((len(row) for row in rows), default=0)
+    offsets = [(x - width // 2, y - height // 2)
+               for y, row in enumerate(rows)
+               for x, char in enumerate(row) if char == '#']
+    register_shape(name, lambda size: offsets)
+
+
+def get_shape_names() -> List[str]:
+    """Названия зарегистрированных форм"""
+    return list(_SHAPES)
@@ -3,75 +3,71 @@
 # ========================================
 """Инструмент кисть"""
 
-from typing import List, Tuple
-import pygame as pg
+from typing import Optional
 from .base_tool import Tool
+from .brush_stamp import BrushStamp, get_stamp
+from .stroke import Stroke
+from models.color import ColorLike, PackedColor, to_packed
 
 
 class BrushTool(Tool):
     """
-    Инструмент кисть - рисование с различными размерами
+    Инструмент кисть - рисование с различными размерами и формами
+    
+    Отпечаток кисти берется из кэша (tools.brush_stamp) и наносится
+    на сетку участками строк. Штрих (tools.stroke) соединяет
+    положения мыши отрезками и не закрашивает ячейки повторно
     """
     
-    def __init__(self):
+    def __init__(self, shape: str = 'round'):
         super().__init__("Brush")
+        self._shape = shape
+        self._stroke: Optional[Stroke] = None
+    
+    @property
+    def shape(self) -> str:
+        """Форма кисти ('round', 'square' или зарегистрированная)"""
+        return self._shape
+    
+    @shape.setter
+    def shape(self, value: str):
+        """Установить форму кисти"""
+        get_stamp(value, self._size)  # проверяем, что форма существует
+        self._shape = value
+    
+    @property
+    def stamp(self) -> BrushStamp:
+        """Текущий отпечаток кисти"""
+        return get_stamp(self._shape, self._size)
     
-    def _get_brush_pattern(self) -> List[Tuple[int, int]]:
-        """
-        Получить паттерн кисти в зависимости от размера
-        
-        Returns:
-            Список смещений (dx, dy) относительно центра
-        """
-        if self._size == 1:
-            return [(0, 0)]
-        
-        elif self._size == 2:
-            return [
-                (0, 0),
-                (-1, 0), (1, 0),
-                (0, -1), (0, 1)
-            ]
-        
-        elif self._size == 3:
-            return [
-                (0, 0),
-                (-1, 0), (1, 0), (0, -1), (0, 1),
-                (-1, -1), (-1, 1), (1, -1), (1, 1)
-            ]
-        
-        elif self._size == 4:
-            return [
-                (0, 0),
-                (-1, 0), (1, 0), (0, -1), (0, 1),
-                (-1, -1), (-1, 1), (1, -1), (1, 1),
-                (-2, 0), (2, 0), (0, -2), (0, 2)
-            ]
-        
-        else:  # size == 5
-            return [
-                (0, 0),
-                # Крест
-                (-1, 0), (1, 0), (0, -1), (0, 1),
-                (-2, 0), (2, 0), (0, -2), (0, 2),
-                # Диагонали
-                (-1, -1), (-1, 1), (1, -1), (1, 1),
-                (-2, -2), (-2, 2), (2, -2), (2, 2),
-                # Дополнительные точки
-                (-1, -2), (0, -2), (1, -2),
-                (-1, 2), (0, 2), (1, 2),
-                (-2, -1), (-2, 0), (-2, 1),
-                (2, -1), (2, 0), (2, 1)
-            ]
+    @property
+    def stroke(self) -> Optional[Stroke]:
+        """Текущий штрих (None вне штриха)"""
+        return self._stroke
     
-    def use(self, grid, x: int, y: int, color: Tuple[int, int, int]):
+    def paint_value(self, color: ColorLike) -> PackedColor:
+        """Упакованный цвет, которым рисует инструмент"""
+        return to_packed(color)
+    
+    def use(self, grid, x: int, y: int, color: ColorLike):
         """Рисование кистью"""
-        pattern = self._get_brush_pattern()
-        
-        for dx, dy in pattern:
-            grid.set_cell_color(x + dx, y + dy, color)
+        grid.fill_spans(x, y, self.stamp.spans, self.paint_value(color))
+    
+    def begin_stroke(self, grid, x: int, y: int, color: ColorLike):
+        """Начать штрих кистью"""
+        self._stroke = Stroke(grid, self.stamp.spans, self.paint_value(color))
+        self._stroke.move_to(x, y)
+    
+    def stroke_to(self, grid, x: int, y: int, color: ColorLike,
+                  connect: bool = True):
+        """Продолжить штрих отрезком от предыдущей точки"""
+        if self._stroke is None or self._stroke.grid is not grid:
+            self.begin_stroke(grid, x, y, color)
+        elif connect:
+            self._stroke.line_to(x, y)
+        else:
+            self._stroke.move_to(x, y)
     
-    def draw_cursor(self, screen: pg.Surface, pos: Tuple[int, int], color: Tuple[int, int, int]):
-        """Отрисовка курсора кисти (круг)"""
-        radius = self._size * 8
-        pg.draw.circle(screen, color, pos, radius, 1)
+    def end_stroke(self):
+        """Закончить штрих"""
+        self._stroke = None
@@ -3,9 +3,8 @@
 # ========================================
 """Инструмент ластик"""
 
-from typing import Tuple
-import pygame as pg
 from .brush_tool import BrushTool
+from models.color import ColorLike, PackedColor, to_packed
 
 
 class EraserTool(BrushTool):
@@ -16,18 +15,13 @@ class EraserTool(BrushTool):
     def __init__(self):
         super().__init__()
         self._name = "Eraser"
-        self._background_color = (255, 255, 255)
+        self._background_value: PackedColor = 0xFFFFFF
     
-    def set_background_color(self, color: Tuple[int, int, int]):
+    def set_background_color(self, color: ColorLike):
         """Установить цвет фона (для стирания)"""
-        self._background_color = color
+        self._background_value = to_packed(color)
     
-    def use(self, grid, x: int, y: int, color: Tuple[int, int, int]):
+    def paint_value(self, color: ColorLike) -> PackedColor:
         """Стирание (рисование цветом фона)"""
         # Игнорируем переданный цвет и используем цвет фона
-        super().use(grid, x, y, self._background_color)
-    
-    def draw_cursor(self, screen: pg.Surface, pos: Tuple[int, int], color: Tuple[int, int, int]):
-        """Отрисовка курсора ластика (серый круг)"""
-        radius = self._size * 8
-        pg.draw.circle(screen, (50, 50, 50), pos, radius, 1)
\ No newline at end of file
+        return self._background_value
\ No newline at end of file
@@ -4,8 +4,8 @@
 """Инструмент пипетка (выбор цвета)"""
 
 from typing import Tuple, Optional
-import pygame as pg
 from .base_tool import Tool
+from models.color import ColorLike, PackedColor, unpack_rgb
 
 
 class EyeDropperTool(Tool):
@@ -15,22 +15,22 @@ class EyeDropperTool(Tool):
     
     def __init__(self):
         super().__init__("EyeDropper")
-        self._picked_color: Optional[Tuple[int, int, int]] = None
+        self._picked_value: Optional[PackedColor] = None
     
     @property
     def picked_color(self) -> Optional[Tuple[int, int, int]]:
-        """Последний выбранный цвет"""
-        return self._picked_color
+        """Последний выбранный цвет (R, G, B)"""
+        if self._picked_value is None:
+            return None
+        return unpack_rgb(self._picked_value)
     
-    def use(self, grid, x: int, y: int, color: Tuple[int, int, int]):
-        """Выбор цвета из ячейки (цвет параметр игнорируется)"""
-        picked = grid.get_cell_color(x, y)
-        if picked:
-            self._picked_color = picked
+    @property
+    def picked_value(self) -> Optional[PackedColor]:
+        """Последний выбранный цвет в упакованном виде"""
+        return self._picked_value
     
-    def draw_cursor(self, screen: pg.Surface, pos: Tuple[int, int], color: Tuple[int, int, int]):
-        """Отрисовка курсора пипетки"""
-        # Круг с крестиком внутри
-        pg.draw.circle(screen, color, pos, 8, 1)
-        pg.draw.line(screen, color, (pos[0] - 4, pos[1]), (pos[0] + 4, pos[1]), 1)
-        pg.draw.line(screen, color, (pos[0], pos[1] - 4), (pos[0], pos[1] + 4), 1)
+    def use(self, grid, x: int, y: int, color: ColorLike):
+        """Выбор цвета из ячейки (цвет параметр игнорируется)"""
+        picked = grid.get_pixel(x, y)
+        if picked is not None:
+            self._picked_value = picked
@@ -0,0 +1,236 @@
+# ========================================
+# tools/flood_fill.py
+# ========================================
+"""Построчная (scanline) заливка связной области"""
+
+from array import array
+from typing import Iterator, List, Tuple, TYPE_CHECKING
+
+try:
+    import numpy as np
+except ImportError:  # NumPy необязателен - есть реализация на array
+    np = None
+
+if TYPE_CHECKING:
+    from models import Grid
+
+
+# Начальный шаг поиска по строке (дальше удваивается)
+_SEARCH_STEP = 16
+
+# С какой ширины строки NumPy быстрее срезов array (накладные
+# расходы на вызов NumPy окупаются только на длинных строках)
+NUMPY_MIN_WIDTH = 1024
+
+
+def scanline_fill(grid: 'Grid', x: int, y: int, value: int,
+                  use_numpy: bool = None) -> int:
+    """
+    Залить связную (4-связность) область одного цвета
+    
+    Строка заливается целиком участком от левой до правой границы
+    области, после чего в соседних строках ищутся участки исходного
+    цвета. Отдельное множество посещенных ячеек не нужно: залитая
+    ячейка уже не совпадает с исходным цветом
+    
+    Args:
+        grid: сетка
+        x, y: начальная ячейка
+        value: упакованный цвет заливки
+        use_numpy: использовать NumPy (None - если установлен
+                   и строки не короче NUMPY_MIN_WIDTH)
+    
+    Returns:
+        Количество залитых ячеек
+    """
+    target = grid.get_pixel(x, y)
+    if target is None or target == value:
+        return 0
+    
+    if use_numpy is None:
+        use_numpy = np is not None and grid.width >= NUMPY_MIN_WIDTH
+    if use_numpy and np is not None:
+        rows = _NumpyRows(grid, target)
+    else:
+        rows = _ArrayRows(grid, target)
+    
+    height = grid.height
+    stack: List[Tuple[int, int]] = [(x, y)]
+    filled = 0
+    
+    while stack:
+        seed_x, seed_y = stack.pop()
+        row = rows.get(seed_y)
+        
+        # Участок уже залит с другой затравки
+        if row[seed_x] != target:
+            continue
+        
+        left, right = rows.span(row, seed_x)
+        rows.fill(row, left, right, value)
+        filled += grid.fill_span(left, seed_y, right - left, value)
+        
+        # По одной затравке на каждый участок исходного цвета
+        # в соседних строках над и под залитым участком
+        for next_y in (seed_y - 1, seed_y + 1):
+            if 0 <= next_y < height:
+                for start in rows.run_starts(rows.get(next_y), left, right):
+                    stack.append((start, next_y))
+    
+    return filled
+
+
+class _ArrayRows:
+    """
+    Строки сетки в виде array - поиск границ участков сравнением
+    срезов (на уровне C), без обхода по одной ячейке
+    """
+    
+    def __init__(self, grid: 'Grid', target: int):
+        self._grid = grid
+        self._target = target
+        self._rows = {}
+        # Строка, целиком состоящая из исходного цвета, - образец для сравнения
+        self._solid = array(grid.get_row(0).typecode, [target]) * grid.width
+    
+    def get(self, y: int) -> array:
+        """Получить строку (читается из сетки один раз)"""
+        row = self._rows.get(y)
+        if row is None:
+            row = self._grid.get_row(y)
+            self._rows[y] = row
+        return row
+    
+    def span(self, row: array, x: int) -> Tuple[int, int]:
+        """Границы участка исходного цвета вокруг x: [left, right)"""
+        return (_run_begin(row, x + 1, 0, self._solid),
+                _run_end(row, x, len(row), self._solid))
+    
+    def run_starts(self, row: array, left: int, right: int) -> Iterator[int]:
+        """Начала участков исходного цвета в диапазоне [left, right)"""
+        target = self._target
+        solid = self._solid
+        position = left
+        while position < right:
+            start = _find_value(row, target, position, right)
+            if start >= right:
+                return
+            yield start
+            position = _run_end(row, start, right, solid)
+    
+    def fill(self, row: array, left: int, right: int, value: int):
+        """Залить участок строки в кэше"""
+        row[left:right] = array(row.typecode, [value]) * (right - left)
+
+
+class _NumpyRows:
+    """Строки сетки в виде массивов NumPy - поиск границ векторно"""
+    
+    def __init__(self, grid: 'Grid', target: int):
+        self._grid = grid
+        self._target = target
+        self._rows = {}
+    
+    def get(self, y: int):
+        """Получить строку (читается из сетки один раз)"""
+        row = self._rows.get(y)
+        if row is None:
+            data = self._grid.get_row(y)
+            row = np.frombuffer(data, dtype='u%d' % data.itemsize).copy()
+            self._rows[y] = row
+        return row
+    
+    def span(self, row, x: int) -> Tuple[int, int]:
+        """Границы участка исходного цвета вокруг x: [left, right)"""
+        other = np.flatnonzero(row[:x] != self._target)
+        left = int(other[-1]) + 1 if len(other) else 0
+        other = np.flatnonzero(row[x:] != self._target)
+        right = x + int(other[0]) if len(other) else len(row)
+        return left, right
+    
+    def run_starts(self, row, left: int, right: int) -> Iterator[int]:
+        """Начала участков исходного цвета в диапазоне [left, right)"""
+        mask = np.empty(right - left + 1, dtype=np.int8)
+        mask[0] = 0
+        mask[1:] = row[left:right] == self._target
+        for start in np.flatnonzero(np.diff(mask) == 1):
+            yield left + int(start)
+    
+    def fill(self, row, left: int, right: int, value: int):
+        """Залить участок строки в кэше"""
+        row[left:right] = value
+
+
+def _find_value(row: array, value: int, start: int, stop: int) -> int:
+    """
+    Найти первую ячейку с цветом value в [start, stop)
+    
+    Returns:
+        Индекс ячейки или stop, если цвет не найден
+    """
+    step = _SEARCH_STEP
+    while start < stop:
+        end = min(stop, start + step)
+        chunk = row[start:end]
+        if value in chunk:
+            return start + chunk.index(value)
+        start = end
+        step *= 2
+    return stop
+
+
+def _run_end(row: array, start: int, stop: int, solid: array) -> int:
+    """
+    Найти конец участка исходного цвета, начинающегося в start
+    
+    Участок растет удвоением шага, затем граница уточняется
+    двоичным поиском - сравниваются срезы, а не отдельные ячейки
+    
+    Returns:
+        Первый индекс в [start, stop) с другим цветом или stop
+    """
+    step = 1
+    low = start
+    while low < stop:
+        high = min(stop, low + step)
+        if row[low:high] == solid[low:high]:
+            low = high
+            step *= 2
+            continue
+        
+        # В [low, high) есть ячейка другого цвета, [start, low) - исходный цвет
+        while high - low > 1:
+            middle = (low + high) // 2
+            if row[low:middle] == solid[low:middle]:
+                low = middle
+            else:
+                high = middle
+        return low
+    return stop
+
+
+def _run_begin(row: array, end: int, stop: int, solid: array) -> int:
+    """
+    Найти начало участка исходного цвета, заканчивающегося перед end
+    
+    Returns:
+        Наименьший индекс p в [stop, end], такой что row[p:end] - исходный цвет
+    """
+    step = 1
+    high = end
+    while high > stop:
+        low = max(stop, high - step)
+        if row[low:high] == solid[low:high]:
+            high = low
+            step *= 2
+            continue
+        
+        # В [low, high) есть ячейка другого цвета, [high, end) - исходный цвет
+        while high - low > 1:
+            middle = (low + high) // 2
+            if row[middle:high] == solid[middle:high]:
+                high = middle
+            else:
+                low = middle
+        return high
+    return stop
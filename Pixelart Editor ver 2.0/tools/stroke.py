@@ -0,0 +1,140 @@
+# ========================================
+# tools/stroke.py
+# ========================================
+"""Штрих кисти - отпечатки вдоль отрезков между положениями мыши"""
+
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+from utils.math_utils import bresenham_line
+
+if TYPE_CHECKING:
+    from models import Grid
+
+
+class Stroke:
+    """
+    Один штрих кисти (от нажатия до отпускания кнопки)
+    
+    Отрезок между соседними положениями мыши растеризуется
+    алгоритмом Брезенхэма, и отпечаток наносится в каждой его
+    ячейке - быстрое движение не оставляет разрывов. Ячейки,
+    уже закрашенные этим штрихом, повторно не записываются:
+    для каждой строки хранятся покрытые участки, и от отпечатка
+    остаются только новые ячейки
+    """
+    
+    def __init__(self, grid: 'Grid', spans: Sequence[Tuple[int, int, int]], value: int):
+        """
+        Инициализация штриха
+        
+        Args:
+            grid: сетка для рисования
+            spans: участки отпечатка (dy, dx, длина) относительно центра
+            value: упакованный цвет
+        """
+        self._grid = grid
+        self._spans = tuple(spans)
+        self._value = value
+        self._last_point: Optional[Tuple[int, int]] = None
+        # Покрытые участки строк: y -> отсортированные границы [начало, конец, ...]
+        self._covered: Dict[int, List[int]] = {}
+        self._painted = 0
+    
+    @property
+    def grid(self) -> 'Grid':
+        """Сетка штриха"""
+        return self._grid
+    
+    @property
+    def last_point(self) -> Optional[Tuple[int, int]]:
+        """Последняя точка штриха (None - перо поднято)"""
+        return self._last_point
+    
+    @property
+    def painted(self) -> int:
+        """Количество ячеек, закрашенных штрихом"""
+        return self._painted
+    
+    def move_to(self, x: int, y: int) -> int:
+        """
+        Нанести отпечаток в точке, не соединяя ее с предыдущей
+        
+        Args:
+            x, y: координаты в сетке
+        
+        Returns:
+            Количество закрашенных ячеек
+        """
+        self._last_point = None
+        return self.line_to(x, y)
+    
+    def line_to(self, x: int, y: int) -> int:
+        """
+        Провести штрих от последней точки до (x, y)
+        
+        Args:
+            x, y: координаты в сетке
+        
+        Returns:
+            Количество закрашенных ячеек
+        """
+        last = self._last_point
+        if last == (x, y):
+            return 0
+        
+        points = bresenham_line(last[0], last[1], x, y) if last is not None else iter(((x, y),))
+        if last is not None:
+            next(points)  # начальная точка уже нанесена
+        
+        pieces: List[Tuple[int, int, int]] = []
+        for point_x, point_y in points:
+            for dy, dx, length in self._spans:
+                left = point_x + dx
+                self._cover(point_y + dy, left, left + length, pieces)
+        
+        self._last_point = (x, y)
+        if not pieces:
+            return 0
+        
+        # Новые участки уже в абсолютных координатах - привязка в (0, 0)
+        painted = self._grid.fill_spans(0, 0, pieces, self._value)
+        self._painted += painted
+        return painted
+    
+    def lift(self):
+        """Поднять перо: следующая точка не соединяется с предыдущей"""
+        self._last_point = None
+    
+    def _cover(self, y: int, left: int, right: int, pieces: List[Tuple[int, int, int]]):
+        """
+        Отметить участок [left, right) строки y покрытым
+        
+        Непокрытые части участка добавляются в pieces как (y, x, длина)
+        """
+        bounds = self._covered.get(y)
+        if bounds is None:
+            self._covered[y] = [left, right]
+            pieces.append((y, left, right - left))
+            return
+        
+        low = bisect_left(bounds, left)
+        high = bisect_right(bounds, right)
+        
+        # Нечетное число границ левее точки - точка внутри покрытого участка
+        inside = low % 2 == 1
+        cursor = left
+        for bound in bounds[low:high]:
+            if not inside and bound > cursor:
+                pieces.append((y, cursor, bound - cursor))
+            inside = not inside
+            cursor = bound
+        if not inside and right > cursor:
+            pieces.append((y, cursor, right - cursor))
+        
+        # Объединяем участок с пересекающимися и смежными
+        merged = []
+        if low % 2 == 0:
+            merged.append(left)
+        if high % 2 == 0:
+            merged.append(right)
+        bounds[low:high] = merged
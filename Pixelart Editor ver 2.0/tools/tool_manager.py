@@ -117,7 +117,7 @@ class ToolManager:
         Установить размер текущего инструмента
         
         Args:
-            size: размер (1-5)
+            size: размер (Tool.MIN_SIZE-Tool.MAX_SIZE)
         """
         self.current_tool.size = size
     
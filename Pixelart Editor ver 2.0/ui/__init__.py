@@ -9,18 +9,41 @@
 - Slider: слайдеры для выбора значений
 - ColorPicker: выбор цветов из палитры
 - Toolbar: панель инструментов
+- Viewport: окно просмотра холста (масштаб, панорамирование)
+- get_font, render_text: кэш шрифтов и отрисованного текста
+- GridRenderer, TiledGridRenderer: отрисовка сетки (модели не зависят от pygame)
+- grid_to_surface: изображение сетки в исходном разрешении
+- draw_tool_cursor: курсоры инструментов
+- ProgressIndicator: индикатор фоновой операции
+- ProfilerOverlay: панель статистики кадров
 """
 
 from .button import Button
 from .slider import Slider
 from .color_picker import ColorPicker
 from .toolbar import Toolbar
+from .viewport import Viewport
+from .text_cache import get_font, render_text, clear_text_cache
+from .grid_renderer import GridRenderer, TiledGridRenderer, grid_to_surface
+from .tool_cursors import draw_tool_cursor
+from .progress_indicator import ProgressIndicator
+from .profiler_overlay import ProfilerOverlay
 
 __all__ = [
     'Button',
     'Slider',
     'ColorPicker',
     'Toolbar',
+    'Viewport',
+    'get_font',
+    'render_text',
+    'clear_text_cache',
+    'GridRenderer',
+    'TiledGridRenderer',
+    'grid_to_surface',
+    'draw_tool_cursor',
+    'ProgressIndicator',
+    'ProfilerOverlay',
 ]
 
 __version__ = '1.0.0'
@@ -4,13 +4,27 @@
 """Компонент кнопки"""
 
 import pygame as pg
-from typing import Tuple, Optional, Callable
+from typing import Dict, Tuple, Optional, Callable
+from .text_cache import get_font, render_text
+
+
+# Прозрачность фона кнопки в каждом состоянии
+STATE_ALPHA = {
+    'normal': 100,
+    'hover': 150,
+    'pressed': 255,
+    'disabled': 50,
+}
 
 
 class Button:
     """
     Кнопка пользовательского интерфейса
     Поддерживает различные состояния и события
+    
+    Вид каждого состояния (фон, текст, иконка) собирается один раз.
+    Если известен неизменный фон под кнопкой (set_background), состояние
+    хранится готовой непрозрачной поверхностью и рисуется одним blit
     """
     
     def __init__(self, x: int, y: int, width: int, height: int,
@@ -43,13 +57,23 @@ class Button:
         self._clicked = False
         self._enabled = True
         
-        # Surface и шрифт
-        self._surface = pg.Surface((width, height))
-        self._font = pg.font.SysFont(None, font_size)
-        self._text_surface = self._font.render(text, True, text_color)
+        # Шрифт и иконка
+        self._font = get_font(None, font_size)
+        self._text_surface = render_text(self._font, text, text_color)
+        self._icon: Optional[pg.Surface] = None
+        self._icon_offset = (4, 4)
+        
+        # Готовый вид состояний: полупрозрачный фон и (при известном
+        # фоне под кнопкой) полностью собранная кнопка
+        self._fill_surfaces: Dict[str, pg.Surface] = {}
+        self._background: Optional[pg.Surface] = None
+        self._state_surfaces: Dict[str, pg.Surface] = {}
         
         # Callback функция при клике
         self._on_click: Optional[Callable] = None
+        
+        # Нужно ли перерисовать кнопку
+        self._dirty = True
     
     @property
     def rect(self) -> pg.Rect:
@@ -64,7 +88,9 @@ class Button:
     @clicked.setter
     def clicked(self, value: bool):
         """Установить состояние нажатия"""
-        self._clicked = value
+        if self._clicked != value:
+            self._clicked = value
+            self._dirty = True
     
     @property
     def enabled(self) -> bool:
@@ -74,7 +100,51 @@ class Button:
     @enabled.setter
     def enabled(self, value: bool):
         """Включить/выключить кнопку"""
-        self._enabled = value
+        if self._enabled != value:
+            self._enabled = value
+            self._dirty = True
+    
+    @property
+    def is_dirty(self) -> bool:
+        """Изменилось ли состояние кнопки с последней отрисовки"""
+        return self._dirty
+    
+    @property
+    def state(self) -> str:
+        """Состояние для отрисовки: 'normal', 'hover', 'pressed' или 'disabled'"""
+        if not self._enabled:
+            return 'disabled'
+        if self._clicked:
+            return 'pressed'
+        if self._hovered:
+            return 'hover'
+        return 'normal'
+    
+    def set_icon(self, icon: Optional[pg.Surface], offset: Tuple[int, int] = (4, 4)):
+        """
+        Установить иконку (рисуется поверх фона и текста)
+        
+        Args:
+            icon: поверхность иконки или None
+            offset: смещение иконки от левого верхнего угла кнопки
+        """
+        self._icon = icon
+        self._icon_offset = offset
+        self._state_surfaces = {}
+        self._dirty = True
+    
+    def set_background(self, background: Optional[pg.Surface]):
+        """
+        Указать неизменный фон под кнопкой
+        
+        Args:
+            background: поверхность в координатах экрана (например, статический
+                        слой UI), из которой берется участок под кнопкой; None -
+                        фон неизвестен, полупрозрачный фон накладывается при отрисовке
+        """
+        self._background = background
+        self._state_surfaces = {}
+        self._dirty = True
     
     def set_on_click(self, callback: Callable):
         """Установить callback при клике"""
@@ -89,17 +159,23 @@ class Button:
             mouse_pressed: нажата ли кнопка мыши
         """
         if not self._enabled:
-            self._hovered = False
+            self._set_hovered(False)
             return
         
         # Проверяем наведение
-        self._hovered = self.rect.collidepoint(mouse_pos)
+        self._set_hovered(bool(self.rect.collidepoint(mouse_pos)))
         
         # Обрабатываем клик
         if self._hovered and mouse_pressed:
             if self._on_click:
                 self._on_click()
     
+    def _set_hovered(self, value: bool):
+        """Установить состояние наведения"""
+        if self._hovered != value:
+            self._hovered = value
+            self._dirty = True
+    
     def render(self, screen: pg.Surface):
         """
         Отрисовать кнопку
@@ -107,26 +183,41 @@ class Button:
         Args:
             screen: поверхность для рисования
         """
-        # Определяем прозрачность в зависимости от состояния
-        if not self._enabled:
-            alpha = 50
-        elif self._clicked:
-            alpha = 255
-        elif self._hovered:
-            alpha = 150
+        state = self.state
+        
+        if self._background is None:
+            self._draw_state(screen, (self._x, self._y), state)
         else:
-            alpha = 100
+            surface = self._state_surfaces.get(state)
+            if surface is None:
+                surface = self._background.subsurface(self.rect).copy()
+                self._draw_state(surface, (0, 0), state)
+                self._state_surfaces[state] = surface
+            screen.blit(surface, (self._x, self._y))
         
-        # Рисуем фон кнопки
-        self._surface.fill(self._color)
-        self._surface.set_alpha(alpha)
-        screen.blit(self._surface, (self._x, self._y))
+        self._dirty = False
+    
+    def _draw_state(self, target: pg.Surface, pos: Tuple[int, int], state: str):
+        """Нарисовать фон, текст и иконку состояния в точке pos"""
+        x, y = pos
+        
+        # Фон кнопки (прозрачность зависит от состояния)
+        fill = self._fill_surfaces.get(state)
+        if fill is None:
+            fill = pg.Surface((self._width, self._height))
+            fill.fill(self._color)
+            fill.set_alpha(STATE_ALPHA[state])
+            self._fill_surfaces[state] = fill
+        target.blit(fill, (x, y))
         
-        # Рисуем текст
+        # Текст
         if self._text:
-            text_x = self._x + 15
-            text_y = self._y + (self._height - self._text_surface.get_height()) // 2
-            screen.blit(self._text_surface, (text_x, text_y))
+            text_y = y + (self._height - self._text_surface.get_height()) // 2
+            target.blit(self._text_surface, (x + 15, text_y))
+        
+        # Иконка
+        if self._icon is not None:
+            target.blit(self._icon, (x + self._icon_offset[0], y + self._icon_offset[1]))
     
     def __repr__(self) -> str:
         return f"Button('{self._text}', pos=({self._x},{self._y}), size=({self._width}x{self._height}))"
\ No newline at end of file
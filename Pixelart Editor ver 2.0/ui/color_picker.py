@@ -4,13 +4,18 @@
 """Палитра цветов с отступами"""
 
 import pygame as pg
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 
 
 class ColorPicker:
     """
     Выбор цвета из палитры
     С отступами между цветами и индикатором выбранного цвета
+    
+    Ячейки палитры рисуются один раз на отдельную поверхность,
+    ячейка под курсором вычисляется по номеру столбца и ряда,
+    а индекс цвета ищется по словарю - размер палитры не влияет
+    на скорость отрисовки и выбора
     """
     
     def __init__(self, x: int, y: int, cell_size: int = 20):
@@ -26,36 +31,82 @@ class ColorPicker:
         self._cell_size = cell_size
         self._gap = 5  # Отступ между рядами (как в оригинале)
         self._colors: List[Tuple[int, int, int]] = []
-        self._positions: List[Tuple[int, int]] = []
+        self._index_by_color: Dict[Tuple[int, int, int], int] = {}
+        self._swatches: Optional[pg.Surface] = None
         self._selected_index = 0
         self._cols = 8  # Цветов в ряду
+        self._dirty = True
     
     def set_colors(self, colors: List[Tuple[int, int, int]]):
         """Установить список цветов"""
-        self._colors = colors
-        self._calculate_positions()
+        self._colors = [tuple(color) for color in colors]
+        
+        # При повторах цвета выбирается первое вхождение
+        self._index_by_color = {}
+        for i, color in enumerate(self._colors):
+            self._index_by_color.setdefault(color, i)
+        
+        self._swatches = None
+        self._dirty = True
     
     def set_selected_color(self, color: Tuple[int, int, int]):
         """Установить выбранный цвет (для пипетки)"""
-        try:
-            self._selected_index = self._colors.index(color)
-        except ValueError:
-            # Цвет не в палитре - ничего не делаем
-            pass
+        index = self._index_by_color.get(tuple(color))
+        # Цвет не в палитре - ничего не делаем
+        if index is not None:
+            self._select_index(index)
+    
+    @property
+    def is_dirty(self) -> bool:
+        """Изменился ли выбор с последней отрисовки"""
+        return self._dirty
     
-    def _calculate_positions(self):
-        """Вычислить позиции всех цветов в сетке"""
-        self._positions = []
+    @property
+    def rect(self) -> pg.Rect:
+        """Область, которую занимает палитра вместе с индикатором"""
+        indicator_rect = self._indicator_rect()
+        palette_rect = pg.Rect(self._x, self._y, self._cols * self._cell_size,
+                               indicator_rect.top - self._y)
+        return palette_rect.union(indicator_rect)
+    
+    def _select_index(self, index: int):
+        """Выбрать цвет по индексу и отметить палитру для перерисовки"""
+        if self._selected_index != index:
+            self._selected_index = index
+            self._dirty = True
+    
+    def _cell_position(self, index: int) -> Tuple[int, int]:
+        """Экранная позиция ячейки цвета"""
+        col = index % self._cols
+        row = index // self._cols
         
-        for i, color in enumerate(self._colors):
-            col = i % self._cols
-            row = i // self._cols
-            
-            # Отступ только по вертикали (между рядами)
-            x = self._x + col * self._cell_size  # БЕЗ отступа по горизонтали
-            y = self._y + row * (self._cell_size + self._gap)  # С отступом по вертикали
-            
-            self._positions.append((x, y))
+        # Отступ только по вертикали (между рядами)
+        x = self._x + col * self._cell_size  # БЕЗ отступа по горизонтали
+        y = self._y + row * (self._cell_size + self._gap)  # С отступом по вертикали
+        return x, y
+    
+    def index_at(self, pos: Tuple[int, int]) -> Optional[int]:
+        """
+        Найти ячейку цвета в точке экрана
+        
+        Args:
+            pos: позиция на экране
+        
+        Returns:
+            Индекс цвета или None (вне ячеек и в отступах между рядами)
+        """
+        dx = pos[0] - self._x
+        dy = pos[1] - self._y
+        if dx < 0 or dy < 0:
+            return None
+        
+        col = dx // self._cell_size
+        row, offset = divmod(dy, self._cell_size + self._gap)
+        if col >= self._cols or offset >= self._cell_size:
+            return None
+        
+        index = row * self._cols + col
+        return index if index < len(self._colors) else None
     
     def update(self, mouse_pos: Tuple[int, int], mouse_clicked: bool) -> Optional[Tuple[int, int, int]]:
         """
@@ -71,13 +122,23 @@ class ColorPicker:
         if not mouse_clicked:
             return None
         
-        for i, (x, y) in enumerate(self._positions):
-            rect = pg.Rect(x, y, self._cell_size, self._cell_size)
-            if rect.collidepoint(mouse_pos):
-                self._selected_index = i
-                return self._colors[i]
+        index = self.index_at(mouse_pos)
+        if index is None:
+            return None
         
-        return None
+        self._select_index(index)
+        return self._colors[index]
+    
+    def _build_swatches(self) -> pg.Surface:
+        """Нарисовать все ячейки цветов на прозрачной поверхности"""
+        rows = (len(self._colors) + self._cols - 1) // self._cols
+        step = self._cell_size + self._gap
+        surface = pg.Surface((self._cols * self._cell_size, max(1, rows * step)), pg.SRCALPHA)
+        
+        for i, color in enumerate(self._colors):
+            x, y = self._cell_position(i)
+            surface.fill(color, (x - self._x, y - self._y, self._cell_size, self._cell_size))
+        return surface
     
     def render(self, screen: pg.Surface, current_color: Optional[Tuple[int, int, int]] = None):
         """
@@ -87,20 +148,32 @@ class ColorPicker:
             screen: поверхность для рисования
             current_color: текущий выбранный цвет (для индикатора)
         """
-        # Рисуем все цвета
-        for i, (color, (x, y)) in enumerate(zip(self._colors, self._positions)):
-            # Ячейка цвета
-            rect = pg.Rect(x, y, self._cell_size, self._cell_size)
-            pg.draw.rect(screen, color, rect)
-            
-            # Обводка для выбранного цвета (белая)
-            if i == self._selected_index:
-                pg.draw.rect(screen, (255, 255, 255), rect, 2)
+        # Все цвета - одной готовой поверхностью
+        if self._swatches is None:
+            self._swatches = self._build_swatches()
+        screen.blit(self._swatches, (self._x, self._y))
+        
+        # Обводка для выбранного цвета (белая)
+        if self._selected_index < len(self._colors):
+            x, y = self._cell_position(self._selected_index)
+            pg.draw.rect(screen, (255, 255, 255), (x, y, self._cell_size, self._cell_size), 2)
         
         # Индикатор выбранного цвета ПОД палитрой по центру
         if current_color is None:
             current_color = self._colors[self._selected_index] if self._colors else (0, 0, 0)
         
+        bg_rect = self._indicator_rect()
+        
+        # Серый фон
+        pg.draw.rect(screen, (235, 235, 235), bg_rect)
+        
+        # Цвет (внутри фона с рамкой 5px)
+        pg.draw.rect(screen, current_color, bg_rect.inflate(-10, -10))
+        
+        self._dirty = False
+    
+    def _indicator_rect(self) -> pg.Rect:
+        """Область индикатора выбранного цвета (серый фон с рамкой)"""
         # Вычисляем позицию под палитрой
         rows = (len(self._colors) + self._cols - 1) // self._cols
         palette_height = rows * (self._cell_size + self._gap)
@@ -113,23 +186,13 @@ class ColorPicker:
         indicator_y = self._y + palette_height + 15
         indicator_size = 23
         
-        # Серый фон
-        bg_rect = pg.Rect(
+        # Серый фон шире цвета на 5px с каждой стороны
+        return pg.Rect(
             center_x - indicator_size // 2 - 5,
             indicator_y - 5,
             indicator_size + 10,
             indicator_size + 10
         )
-        pg.draw.rect(screen, (235, 235, 235), bg_rect)
-        
-        # Цвет
-        color_rect = pg.Rect(
-            center_x - indicator_size // 2,
-            indicator_y,
-            indicator_size,
-            indicator_size
-        )
-        pg.draw.rect(screen, current_color, color_rect)
     
     def __repr__(self) -> str:
         return f"ColorPicker(colors={len(self._colors)}, selected={self._selected_index})"
\ No newline at end of file
@@ -0,0 +1,291 @@
+# ========================================
+# ui/grid_renderer.py
+# ========================================
+"""
+Отрисовка сетки средствами pygame
+
+Модели (models.Grid, models.TiledGrid) хранят только цвета и
+прямоугольники изменений и не зависят от pygame. Изображение
+холста и вывод на экран - задача этого адаптера
+"""
+
+from typing import Dict, List, Optional, Set
+import pygame as pg
+from models import Grid, TiledGrid, unpack_rgb
+from models.grid import GridRect
+from models.tiled_grid import TileKey
+
+
+class GridRenderer:
+    """
+    Отрисовка сплошной сетки
+    
+    Изменения переносятся в изображение холста в исходном разрешении
+    (1 ячейка = 1 пиксель), а на экран оно выводится одним
+    масштабированием (ближайший сосед) на каждую измененную область
+    """
+    
+    def __init__(self, grid: Grid):
+        """
+        Инициализация адаптера
+        
+        Args:
+            grid: сетка для отрисовки
+        """
+        self._grid = grid
+        # Изображение холста, создается при первой отрисовке
+        self._surface: Optional[pg.Surface] = None
+        # Ячеек, выведенных на экран последним вызовом render()
+        self._rendered_cells = 0
+    
+    @staticmethod
+    def for_grid(grid: Grid) -> 'GridRenderer':
+        """
+        Создать адаптер подходящего типа
+        
+        Args:
+            grid: сетка (Grid или TiledGrid)
+        
+        Returns:
+            GridRenderer или TiledGridRenderer
+        """
+        if isinstance(grid, TiledGrid):
+            return TiledGridRenderer(grid)
+        return GridRenderer(grid)
+    
+    @property
+    def grid(self) -> Grid:
+        """Отрисовываемая сетка"""
+        return self._grid
+    
+    @property
+    def rendered_cells(self) -> int:
+        """Сколько ячеек вывел на экран последний вызов render()"""
+        return self._rendered_cells
+    
+    @property
+    def surface(self) -> pg.Surface:
+        """
+        Изображение холста в исходном разрешении (1 ячейка = 1 пиксель)
+        
+        Готовый источник для экспорта и миниатюр, не зависящий от экрана.
+        Прямоугольники изменений сетки при этом не сбрасываются
+        """
+        self._sync(self._grid.dirty_rects)
+        return self._surface
+    
+    def render(self, screen: pg.Surface, offset_x: int = 0, offset_y: int = 0,
+               full: bool = False, cell_size: Optional[int] = None,
+               visible_rect: Optional[GridRect] = None) -> List[pg.Rect]:
+        """
+        Отрисовать измененные ячейки сетки
+        
+        Ячейки вне visible_rect не посещаются, поэтому стоимость отрисовки
+        зависит от размера окна, а не от размера холста
+        
+        При full (сдвиг и масштаб окна просмотра, первый кадр) видимая
+        часть выводится из уже готового изображения холста: в него
+        переносятся только изменения, а состояние сетки не трогается.
+        Содержимое целиком сбрасывает сама сетка (mark_all_dirty)
+        
+        Args:
+            screen: поверхность для рисования
+            offset_x: экранная позиция ячейки (0, 0) по X
+            offset_y: экранная позиция ячейки (0, 0) по Y
+            full: перерисовать всю видимую часть, а не только изменения
+            cell_size: масштаб (пикселей на ячейку), по умолчанию cell_size сетки
+            visible_rect: видимые ячейки (x, y, width, height), по умолчанию все
+        
+        Returns:
+            Список перерисованных областей экрана (для pg.display.update)
+        """
+        grid = self._grid
+        if cell_size is None:
+            cell_size = grid.cell_size
+        if visible_rect is None:
+            visible_rect = (0, 0, grid.width, grid.height)
+        
+        dirty_rects = grid.pop_dirty_rects()
+        self._sync(dirty_rects)
+        if full:
+            dirty_rects = [visible_rect]
+        
+        updated = []
+        cells = 0
+        for rect in dirty_rects:
+            rect = _intersect_rects(rect, visible_rect)
+            if rect is not None:
+                updated.append(self._render_rect(screen, rect, offset_x, offset_y, cell_size))
+                cells += rect[2] * rect[3]
+        self._rendered_cells = cells
+        return updated
+    
+    def _sync(self, rects: List[GridRect]):
+        """
+        Перенести цвета из буфера пикселей в изображение холста
+        
+        Args:
+            rects: прямоугольники ячеек (x, y, width, height)
+        """
+        grid = self._grid
+        width = grid.width
+        if self._surface is None:
+            self._surface = pg.Surface((width, grid.height), 0, 32)
+            rects = [(0, 0, width, grid.height)]
+        
+        pixels = grid.pixels
+        surface = self._surface
+        
+        # Формат 0x00RRGGBB совпадает с форматом поверхности -
+        # копируем строки буфера напрямую, без поэлементных вызовов
+        if (surface.get_masks()[:3] == (0xFF0000, 0xFF00, 0xFF)
+                and surface.get_pitch() == width * 4):
+            buffer = surface.get_buffer()
+            for rect_x, rect_y, rect_w, rect_h in rects:
+                for y in range(rect_y, rect_y + rect_h):
+                    start = y * width + rect_x
+                    buffer.write(pixels[start:start + rect_w].tobytes(), start * 4)
+            del buffer
+            return
+        
+        set_at = surface.set_at
+        for rect_x, rect_y, rect_w, rect_h in rects:
+            for y in range(rect_y, rect_y + rect_h):
+                row = y * width
+                for x in range(rect_x, rect_x + rect_w):
+                    set_at((x, y), unpack_rgb(pixels[row + x]))
+    
+    def _render_rect(self, screen: pg.Surface, rect: GridRect,
+                     offset_x: int, offset_y: int, cell_size: int) -> pg.Rect:
+        """
+        Отрисовать прямоугольник ячеек
+        
+        Returns:
+            Перерисованная область экрана
+        """
+        rect_x, rect_y, rect_w, rect_h = rect
+        area = self._surface.subsurface(rect)
+        scaled = pg.transform.scale(area, (rect_w * cell_size, rect_h * cell_size))
+        return screen.blit(scaled, (offset_x + rect_x * cell_size, offset_y + rect_y * cell_size))
+    
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._grid})"
+
+
+class TiledGridRenderer(GridRenderer):
+    """
+    Отрисовка разреженной сетки
+    
+    У каждого закрашенного тайла свое изображение; оно обновляется,
+    только если тайл попал в прямоугольник изменений
+    """
+    
+    def __init__(self, grid: TiledGrid):
+        super().__init__(grid)
+        self._tile_surfaces: Dict[TileKey, pg.Surface] = {}
+        self._stale_tiles: Set[TileKey] = set()
+    
+    @property
+    def surface(self) -> pg.Surface:
+        """
+        Изображение холста в исходном разрешении (1 ячейка = 1 пиксель)
+        
+        Собирается из изображений тайлов при каждом обращении
+        """
+        grid = self._grid
+        self._sync(grid.dirty_rects)
+        
+        surface = pg.Surface((grid.width, grid.height), 0, 32)
+        surface.fill(grid.background_color)
+        size = grid.tile_size
+        for key, _ in grid.iter_tiles():
+            surface.blit(self._get_tile_surface(key), (key[0] * size, key[1] * size))
+        return surface
+    
+    def _sync(self, rects: List[GridRect]):
+        """Отметить тайлы, пересекающие прямоугольники изменений, устаревшими"""
+        size = self._grid.tile_size
+        for rect_x, rect_y, rect_w, rect_h in rects:
+            for tile_y in range(rect_y // size, (rect_y + rect_h - 1) // size + 1):
+                for tile_x in range(rect_x // size, (rect_x + rect_w - 1) // size + 1):
+                    self._stale_tiles.add((tile_x, tile_y))
+    
+    def _get_tile_surface(self, key: TileKey) -> pg.Surface:
+        """Получить изображение тайла, обновив его при необходимости"""
+        size = self._grid.tile_size
+        surface = self._tile_surfaces.get(key)
+        if surface is None:
+            surface = pg.Surface((size, size), 0, 32)
+            self._tile_surfaces[key] = surface
+            self._stale_tiles.add(key)
+        
+        if key in self._stale_tiles:
+            tile = self._grid.get_tile(*key)
+            if (surface.get_masks()[:3] == (0xFF0000, 0xFF00, 0xFF)
+                    and surface.get_pitch() == size * 4):
+                buffer = surface.get_buffer()
+                buffer.write(tile.tobytes(), 0)
+                del buffer
+            else:
+                for index, value in enumerate(tile):
+                    surface.set_at((index % size, index // size), unpack_rgb(value))
+            self._stale_tiles.discard(key)
+        
+        return surface
+    
+    def _render_rect(self, screen: pg.Surface, rect: GridRect,
+                     offset_x: int, offset_y: int, cell_size: int) -> pg.Rect:
+        """Отрисовать прямоугольник ячеек по тайлам (только пересекающие его тайлы)"""
+        grid = self._grid
+        cell = cell_size
+        size = grid.tile_size
+        rect_x, rect_y, rect_w, rect_h = rect
+        
+        for tile_y in range(rect_y // size, (rect_y + rect_h - 1) // size + 1):
+            for tile_x in range(rect_x // size, (rect_x + rect_w - 1) // size + 1):
+                # Пересечение прямоугольника с тайлом
+                left = max(rect_x, tile_x * size)
+                top = max(rect_y, tile_y * size)
+                right = min(rect_x + rect_w, (tile_x + 1) * size)
+                bottom = min(rect_y + rect_h, (tile_y + 1) * size)
+                dest = pg.Rect(offset_x + left * cell, offset_y + top * cell,
+                               (right - left) * cell, (bottom - top) * cell)
+                
+                if grid.get_tile(tile_x, tile_y) is None:
+                    # Тайл очищен - его изображение больше не нужно
+                    self._tile_surfaces.pop((tile_x, tile_y), None)
+                    screen.fill(grid.background_color, dest)
+                    continue
+                
+                area = self._get_tile_surface((tile_x, tile_y)).subsurface(
+                    (left - tile_x * size, top - tile_y * size, right - left, bottom - top))
+                screen.blit(pg.transform.scale(area, dest.size), dest)
+        
+        return pg.Rect(offset_x + rect_x * cell, offset_y + rect_y * cell,
+                       rect_w * cell, rect_h * cell).clip(screen.get_clip())
+
+
+def grid_to_surface(grid: Grid) -> pg.Surface:
+    """
+    Изображение сетки в исходном разрешении (1 ячейка = 1 пиксель)
+    
+    Собирается заново, не затрагивая отрисовку на экране
+    
+    Args:
+        grid: сетка
+    
+    Returns:
+        Новая поверхность width x height
+    """
+    return GridRenderer.for_grid(grid).surface
+
+
+def _intersect_rects(first: GridRect, second: GridRect) -> Optional[GridRect]:
+    """Пересечение двух прямоугольников или None, если они не пересекаются"""
+    left = max(first[0], second[0])
+    top = max(first[1], second[1])
+    right = min(first[0] + first[2], second[0] + second[2])
+    bottom = min(first[1] + first[3], second[1] + second[3])
+    if right <= left or bottom <= top:
+        return None
+    return (left, top, right - left, bottom - top)
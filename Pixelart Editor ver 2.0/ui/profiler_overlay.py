@@ -0,0 +1,136 @@
+# ========================================
+# ui/profiler_overlay.py
+# ========================================
+"""Панель статистики кадров поверх холста"""
+
+import pygame as pg
+from typing import List, Optional, TYPE_CHECKING
+from .text_cache import get_font
+
+if TYPE_CHECKING:
+    from core.frame_profiler import FrameStats
+
+
+class ProfilerOverlay:
+    """
+    Полупрозрачная панель с временем кадра, перцентилями, числом
+    выведенных ячеек и фазами последнего кадра
+    
+    Панель рисуется поверх холста, поэтому перед отрисовкой кадра
+    под ней восстанавливается сохраненный участок экрана (clear),
+    а после - сохраняется новый и рисуется панель (render)
+    """
+    
+    PADDING = 6
+    LINE_HEIGHT = 16
+    # Строк фаз на панели (самые долгие)
+    MAX_PHASES = 8
+    
+    def __init__(self, x: int, y: int, width: int = 240,
+                 color: tuple = (255, 255, 255), background: tuple = (0, 0, 0, 170)):
+        """
+        Инициализация панели (скрыта)
+        
+        Args:
+            x, y: позиция левого верхнего угла
+            width: ширина
+            color: цвет текста
+            background: цвет фона (RGBA)
+        """
+        self._x = x
+        self._y = y
+        self._width = width
+        self._color = color
+        self._background = background
+        self._visible = False
+        self._font = get_font(None, 20)
+        # Участок экрана под панелью и его положение
+        self._under: Optional[pg.Surface] = None
+        self._under_rect: Optional[pg.Rect] = None
+    
+    @property
+    def visible(self) -> bool:
+        """Показывается ли панель"""
+        return self._visible
+    
+    @property
+    def is_dirty(self) -> bool:
+        """Панель включили или выключили, а экран еще не обновлен"""
+        return self._visible != (self._under_rect is not None)
+    
+    def toggle(self) -> bool:
+        """
+        Показать или скрыть панель
+        
+        Returns:
+            Новое состояние видимости
+        """
+        self._visible = not self._visible
+        return self._visible
+    
+    def clear(self, screen: pg.Surface) -> Optional[pg.Rect]:
+        """
+        Восстановить экран под панелью
+        
+        Args:
+            screen: поверхность, на которой рисовалась панель
+        
+        Returns:
+            Восстановленная область или None, если панели не было
+        """
+        rect = self._under_rect
+        if rect is None:
+            return None
+        screen.blit(self._under, rect)
+        self._under = None
+        self._under_rect = None
+        return rect
+    
+    def render(self, screen: pg.Surface, stats: Optional['FrameStats']) -> Optional[pg.Rect]:
+        """
+        Нарисовать панель (участок под ней сохраняется для clear)
+        
+        Args:
+            screen: поверхность для рисования
+            stats: статистика кадров (None - кадров еще не было)
+        
+        Returns:
+            Область панели или None, если панель скрыта
+        """
+        if not self._visible:
+            return None
+        
+        lines = self._format(stats)
+        height = self.PADDING * 2 + self.LINE_HEIGHT * len(lines)
+        rect = pg.Rect(self._x, self._y, self._width, height).clip(screen.get_rect())
+        
+        self._under = screen.subsurface(rect).copy()
+        self._under_rect = rect
+        
+        panel = pg.Surface(rect.size, pg.SRCALPHA)
+        panel.fill(self._background)
+        # Числа меняются каждый кадр - текст не кэшируется
+        # (иначе он вытеснял бы из кэша подписи UI)
+        for i, line in enumerate(lines):
+            text = self._font.render(line, True, self._color)
+            panel.blit(text, (self.PADDING, self.PADDING + i * self.LINE_HEIGHT))
+        screen.blit(panel, rect)
+        return rect
+    
+    def _format(self, stats: Optional['FrameStats']) -> List[str]:
+        """Строки панели"""
+        if stats is None:
+            return ["Профиль кадров: нет данных"]
+        
+        lines = [
+            f"Кадр: {stats.last * 1000:.2f} мс (среднее {stats.average * 1000:.2f})",
+            f"p50 {stats.p50 * 1000:.2f}  p95 {stats.p95 * 1000:.2f}  p99 {stats.p99 * 1000:.2f} мс",
+            f"Ячеек в кадре: {stats.cells}  (кадров: {stats.frames})",
+        ]
+        phases = sorted(stats.phases, key=lambda phase: phase[1], reverse=True)
+        for name, seconds in phases[:self.MAX_PHASES]:
+            lines.append(f"  {name}: {seconds * 1000:.2f} мс")
+        return lines
+    
+    def __repr__(self) -> str:
+        return f"ProfilerOverlay(visible={self._visible})"
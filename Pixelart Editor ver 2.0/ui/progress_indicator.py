@@ -0,0 +1,108 @@
+# ========================================
+# ui/progress_indicator.py
+# ========================================
+"""Индикатор фоновой операции"""
+
+import pygame as pg
+from typing import Optional, Tuple
+from .text_cache import get_font, render_text
+
+
+class ProgressIndicator:
+    """
+    Индикатор операции неизвестной длительности (сохранение, загрузка)
+    
+    Показывает подпись и бегущий по полосе блок. Перерисовка нужна,
+    только когда блок сдвинулся на следующий шаг
+    """
+    
+    # Шагов анимации в секунду и число положений блока
+    STEPS_PER_SECOND = 12
+    STEP_COUNT = 16
+    
+    def __init__(self, x: int, y: int, width: int, height: int,
+                 color: Tuple[int, int, int] = (70, 130, 220),
+                 background: Tuple[int, int, int] = (255, 255, 255)):
+        """
+        Инициализация индикатора
+        
+        Args:
+            x, y: позиция
+            width, height: размеры
+            color: цвет полосы
+            background: цвет фона
+        """
+        self._rect = pg.Rect(x, y, width, height)
+        self._color = color
+        self._background = background
+        self._label: Optional[str] = None
+        self._step = 0
+        self._dirty = False
+        self._font = get_font(None, 30)
+    
+    @property
+    def rect(self) -> pg.Rect:
+        """Область индикатора"""
+        return self._rect
+    
+    @property
+    def active(self) -> bool:
+        """Показывается ли индикатор"""
+        return self._label is not None
+    
+    @property
+    def is_dirty(self) -> bool:
+        """Изменился ли вид с последней отрисовки"""
+        return self._dirty
+    
+    def start(self, label: str):
+        """
+        Показать индикатор
+        
+        Args:
+            label: подпись (название операции)
+        """
+        if label != self._label:
+            self._label = label
+            self._step = 0
+            self._dirty = True
+    
+    def stop(self):
+        """Скрыть индикатор (область перерисовывает владелец)"""
+        self._label = None
+        self._dirty = False
+    
+    def update(self, elapsed: float):
+        """
+        Продвинуть анимацию
+        
+        Args:
+            elapsed: сколько секунд идет операция
+        """
+        step = int(elapsed * self.STEPS_PER_SECOND) % self.STEP_COUNT
+        if self.active and step != self._step:
+            self._step = step
+            self._dirty = True
+    
+    def render(self, screen: pg.Surface):
+        """Отрисовать индикатор"""
+        if not self.active:
+            return
+        
+        rect = self._rect
+        pg.draw.rect(screen, self._background, rect)
+        
+        label_surface = render_text(self._font, f"{self._label}...", (0, 0, 0))
+        screen.blit(label_surface, (rect.x + 10, rect.y + 10))
+        
+        # Полоса внизу и бегущий по ней блок
+        bar = pg.Rect(rect.x + 4, rect.bottom - 8, rect.width - 8, 4)
+        pg.draw.rect(screen, (220, 220, 220), bar)
+        block_width = bar.width // 4
+        offset = (bar.width - block_width) * self._step // (self.STEP_COUNT - 1)
+        pg.draw.rect(screen, self._color, (bar.x + offset, bar.y, block_width, bar.height))
+        
+        self._dirty = False
+    
+    def __repr__(self) -> str:
+        return f"ProgressIndicator(label={self._label!r}, step={self._step})"
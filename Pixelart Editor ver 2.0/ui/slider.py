@@ -5,6 +5,7 @@
 
 import pygame as pg
 from typing import Tuple
+from .text_cache import get_font, render_text
 
 
 class Slider:
@@ -45,9 +46,10 @@ class Slider:
         self._draw_x = x  # x - это уже позиция отрисовки
         
         self._dragging = False
+        self._dirty = True
         
         # Шрифт (УВЕЛИЧЕН как в оригинале)
-        self._font = pg.font.SysFont(None, 25)  # Было 20
+        self._font = get_font(None, 25)  # Было 20
     
     @property
     def value(self) -> int:
@@ -57,7 +59,23 @@ class Slider:
     @value.setter
     def value(self, val: int):
         """Установить значение (с ограничением)"""
-        self._value = max(self._min_value, min(self._max_value, val))
+        self._set_value(max(self._min_value, min(self._max_value, val)))
+    
+    @property
+    def is_dirty(self) -> bool:
+        """Изменилось ли значение с последней отрисовки"""
+        return self._dirty
+    
+    @property
+    def rect(self) -> pg.Rect:
+        """Область, которую занимает слайдер при отрисовке"""
+        return pg.Rect(self._draw_x - 95, self._y - 30, 168, 60)
+    
+    def _set_value(self, val: int):
+        """Установить значение и отметить слайдер для перерисовки"""
+        if self._value != val:
+            self._value = val
+            self._dirty = True
     
     def _calculate_slider_position(self) -> int:
         """Вычислить позицию ползунка на основе значения"""
@@ -90,7 +108,7 @@ class Slider:
             self._dragging = True
         
         if self._dragging and mouse_pressed:
-            self._value = self._calculate_value_from_position(mouse_pos[0])
+            self._set_value(self._calculate_value_from_position(mouse_pos[0]))
         
         if not mouse_pressed:
             self._dragging = False
@@ -98,8 +116,7 @@ class Slider:
     def render(self, screen: pg.Surface):
         """Отрисовать слайдер (в стиле оригинала)"""
         # Фон - серый прямоугольник (УВЕЛИЧЕН)
-        bg_rect = pg.Rect(self._draw_x - 95, self._y - 30, 168, 60)  # Было 148
-        pg.draw.rect(screen, (190, 190, 190), bg_rect)
+        pg.draw.rect(screen, (190, 190, 190), self.rect)  # Было 148
         
         # Трек слайдера
         track_y = self._y + self._height // 3
@@ -111,7 +128,7 @@ class Slider:
         pg.draw.rect(screen, (220, 220, 220), value_box)
         
         # Значение - текст крупнее
-        value_surface = self._font.render(str(self._value), True, (30, 30, 30))
+        value_surface = render_text(self._font, str(self._value), (30, 30, 30))
         screen.blit(value_surface, (self._draw_x - 83, self._y + 5))
         
         # Ползунок
@@ -121,8 +138,10 @@ class Slider:
         
         # Подпись
         if self._label:
-            label_surface = self._font.render(self._label, True, (30, 30, 30))
+            label_surface = render_text(self._font, self._label, (30, 30, 30))
             screen.blit(label_surface, (self._draw_x - 90, self._y - 25))
+        
+        self._dirty = False
     
     def __repr__(self) -> str:
         return f"Slider('{self._label}', value={self._value}, range=[{self._min_value}, {self._max_value}])"
\ No newline at end of file
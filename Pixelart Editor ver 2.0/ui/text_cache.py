@@ -0,0 +1,80 @@
+# ========================================
+# ui/text_cache.py
+# ========================================
+"""Кэш шрифтов и отрисованного текста"""
+
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import pygame as pg
+
+
+# Сколько отрисованных надписей хранить (вытесняются давно не использованные)
+MAX_CACHED_TEXTS = 512
+
+# Шрифты: (имя, размер) -> шрифт
+_FONTS: Dict[Tuple[Optional[str], int], pg.font.Font] = {}
+
+# Надписи: (шрифт, текст, цвет, сглаживание) -> поверхность
+_TEXTS: 'OrderedDict[tuple, pg.Surface]' = OrderedDict()
+
+
+def get_font(name: Optional[str], size: int) -> pg.font.Font:
+    """
+    Получить системный шрифт (создается один раз)
+    
+    Шрифт по умолчанию загружается напрямую: SysFont при первом
+    вызове перечисляет все шрифты системы (fc-list, реестр), что
+    заметно задерживает первый кадр
+    
+    Args:
+        name: название шрифта (None - шрифт по умолчанию)
+        size: размер шрифта
+    
+    Returns:
+        Шрифт pygame
+    """
+    key = (name, size)
+    font = _FONTS.get(key)
+    if font is None:
+        font = pg.font.SysFont(name, size) if name else pg.font.Font(None, size)
+        _FONTS[key] = font
+    return font
+
+
+def render_text(font: pg.font.Font, text: str, color: Tuple[int, int, int],
+                antialias: bool = True) -> pg.Surface:
+    """
+    Отрисовать надпись (повторные вызовы берут готовую поверхность)
+    
+    Поверхность общая для всех вызовов - рисовать на ней нельзя
+    
+    Args:
+        font: шрифт
+        text: текст
+        color: цвет текста
+        antialias: сглаживание
+    
+    Returns:
+        Поверхность с надписью
+    """
+    key = (font, text, tuple(color), antialias)
+    surface = _TEXTS.get(key)
+    if surface is not None:
+        _TEXTS.move_to_end(key)
+        return surface
+    
+    surface = font.render(text, antialias, color)
+    _TEXTS[key] = surface
+    if len(_TEXTS) > MAX_CACHED_TEXTS:
+        _TEXTS.popitem(last=False)
+    return surface
+
+
+def clear_text_cache():
+    """Очистить кэш надписей (шрифты сохраняются)"""
+    _TEXTS.clear()
+
+
+def get_text_cache_size() -> int:
+    """Количество надписей в кэше"""
+    return len(_TEXTS)
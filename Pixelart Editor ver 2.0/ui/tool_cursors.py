@@ -0,0 +1,49 @@
+# ========================================
+# ui/tool_cursors.py
+# ========================================
+"""
+Курсоры инструментов
+
+Инструменты (пакет tools) не зависят от pygame, поэтому их
+курсоры рисуются здесь - по имени инструмента
+"""
+
+from typing import Tuple, TYPE_CHECKING
+import pygame as pg
+
+if TYPE_CHECKING:
+    from tools import Tool
+
+
+# Цвет курсора ластика (не зависит от текущего цвета)
+ERASER_CURSOR_COLOR = (50, 50, 50)
+
+
+def draw_tool_cursor(screen: pg.Surface, tool: 'Tool', pos: Tuple[int, int],
+                     color: Tuple[int, int, int]):
+    """
+    Отрисовать курсор инструмента
+    
+    Args:
+        screen: поверхность для рисования
+        tool: инструмент
+        pos: позиция курсора (в пикселях)
+        color: цвет курсора
+    """
+    x, y = pos
+    name = tool.name
+    if name == "Brush":
+        # Круг по размеру кисти
+        pg.draw.circle(screen, color, pos, tool.size * 8, 1)
+    elif name == "Eraser":
+        pg.draw.circle(screen, ERASER_CURSOR_COLOR, pos, tool.size * 8, 1)
+    elif name == "Fill":
+        # Простой крестик как индикатор
+        size = 10
+        pg.draw.line(screen, color, (x - size, y), (x + size, y), 2)
+        pg.draw.line(screen, color, (x, y - size), (x, y + size), 2)
+    elif name == "EyeDropper":
+        # Круг с крестиком внутри
+        pg.draw.circle(screen, color, pos, 8, 1)
+        pg.draw.line(screen, color, (x - 4, y), (x + 4, y), 1)
+        pg.draw.line(screen, color, (x, y - 4), (x, y + 4), 1)
@@ -6,6 +6,7 @@
 import pygame as pg
 from typing import List, Optional, Callable, Tuple  # ← ДОБАВЛЕНО Tuple
 from .button import Button
+from .text_cache import get_font, render_text
 
 
 class Toolbar:
@@ -25,8 +26,8 @@ class Toolbar:
         self._y = y
         self._title = title
         self._buttons: List[Button] = []
-        self._font = pg.font.SysFont(None, 25)
-        self._title_surface = self._font.render(title, True, (50, 50, 50))
+        self._font = get_font(None, 25)
+        self._title_surface = render_text(self._font, title, (50, 50, 50))
     
     def add_button(self, button: Button):
         """Добавить кнопку на панель"""
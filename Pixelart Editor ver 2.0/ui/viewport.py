@@ -0,0 +1,189 @@
+# ========================================
+# ui/viewport.py
+# ========================================
+"""Окно просмотра холста (масштаб и панорамирование)"""
+
+from typing import Sequence, Tuple
+
+
+class Viewport:
+    """
+    Камера холста - преобразует координаты экрана в координаты сетки и обратно
+    
+    Хранит масштаб (пикселей экрана на ячейку) и сдвиг холста внутри
+    области просмотра. Одно и то же преобразование используется
+    и для отрисовки, и для ввода
+    """
+    
+    # Допустимые уровни масштаба (пикселей на ячейку)
+    ZOOM_LEVELS = (1, 2, 3, 4, 6, 8, 12, 16, 24, 32, 48, 64)
+    
+    def __init__(self, area: Tuple[int, int, int, int],
+                 grid_width: int, grid_height: int, zoom: int = 12,
+                 zoom_levels: Sequence[int] = ZOOM_LEVELS):
+        """
+        Инициализация окна просмотра
+        
+        Args:
+            area: область экрана под холст (x, y, width, height)
+            grid_width, grid_height: размеры сетки в ячейках
+            zoom: желаемый начальный масштаб (уменьшается, если холст не помещается)
+            zoom_levels: допустимые уровни масштаба по возрастанию
+        """
+        self._area = tuple(area)
+        self._grid_width = grid_width
+        self._grid_height = grid_height
+        self._zoom_levels = tuple(zoom_levels)
+        
+        # Экранная позиция ячейки (0, 0) относительно левого верхнего угла области
+        self._scroll_x = 0
+        self._scroll_y = 0
+        
+        # Начальный масштаб: не больше желаемого и так, чтобы холст помещался
+        area_w, area_h = self._area[2], self._area[3]
+        fitting = [level for level in self._zoom_levels
+                   if level <= zoom and grid_width * level <= area_w and grid_height * level <= area_h]
+        self._zoom = fitting[-1] if fitting else self._zoom_levels[0]
+        
+        self._changed = True
+    
+    @property
+    def area(self) -> Tuple[int, int, int, int]:
+        """Область экрана под холст (x, y, width, height)"""
+        return self._area
+    
+    @property
+    def zoom(self) -> int:
+        """Текущий масштаб (пикселей экрана на ячейку)"""
+        return self._zoom
+    
+    @property
+    def origin(self) -> Tuple[int, int]:
+        """Экранные координаты левого верхнего угла ячейки (0, 0)"""
+        return (self._area[0] + self._scroll_x, self._area[1] + self._scroll_y)
+    
+    @property
+    def changed(self) -> bool:
+        """Изменились ли масштаб или сдвиг с последней отрисовки"""
+        return self._changed
+    
+    def pop_changed(self) -> bool:
+        """Забрать флаг изменения и сбросить его"""
+        changed = self._changed
+        self._changed = False
+        return changed
+    
+    def contains(self, pixel_x: int, pixel_y: int) -> bool:
+        """Находится ли точка экрана внутри области просмотра"""
+        x, y, width, height = self._area
+        return x <= pixel_x < x + width and y <= pixel_y < y + height
+    
+    def screen_to_grid(self, pixel_x: int, pixel_y: int) -> Tuple[int, int]:
+        """
+        Преобразовать координаты экрана в координаты сетки
+        
+        Returns:
+            Координаты ячейки (могут быть вне сетки)
+        """
+        origin_x, origin_y = self.origin
+        return ((pixel_x - origin_x) // self._zoom, (pixel_y - origin_y) // self._zoom)
+    
+    def grid_to_screen(self, grid_x: int, grid_y: int) -> Tuple[int, int]:
+        """Экранные координаты левого верхнего угла ячейки"""
+        origin_x, origin_y = self.origin
+        return (origin_x + grid_x * self._zoom, origin_y + grid_y * self._zoom)
+    
+    def visible_cells(self) -> Tuple[int, int, int, int]:
+        """
+        Прямоугольник ячеек, попадающих в область просмотра
+        
+        Returns:
+            (x, y, width, height) в ячейках; нулевой размер если холст не виден
+        """
+        zoom = self._zoom
+        area_w, area_h = self._area[2], self._area[3]
+        left = max(0, -self._scroll_x // zoom)
+        top = max(0, -self._scroll_y // zoom)
+        right = min(self._grid_width, -(-(area_w - self._scroll_x) // zoom))
+        bottom = min(self._grid_height, -(-(area_h - self._scroll_y) // zoom))
+        return (left, top, max(0, right - left), max(0, bottom - top))
+    
+    def set_zoom(self, zoom: int, anchor: Tuple[int, int] = None):
+        """
+        Установить масштаб, сохраняя точку под якорем на месте
+        
+        Args:
+            zoom: новый масштаб (пикселей на ячейку)
+            anchor: точка экрана, которая не должна сдвинуться (по умолчанию центр)
+        """
+        if zoom == self._zoom:
+            return
+        
+        x, y, width, height = self._area
+        if anchor is None:
+            anchor = (x + width // 2, y + height // 2)
+        
+        # Позиция якоря в координатах сетки (с дробной частью)
+        local_x = anchor[0] - x
+        local_y = anchor[1] - y
+        grid_x = (local_x - self._scroll_x) / self._zoom
+        grid_y = (local_y - self._scroll_y) / self._zoom
+        
+        self._zoom = zoom
+        self._scroll_x = int(round(local_x - grid_x * zoom))
+        self._scroll_y = int(round(local_y - grid_y * zoom))
+        self._clamp_scroll()
+        self._changed = True
+    
+    def zoom_in(self, anchor: Tuple[int, int] = None):
+        """Увеличить масштаб на один уровень"""
+        larger = [level for level in self._zoom_levels if level > self._zoom]
+        if larger:
+            self.set_zoom(larger[0], anchor)
+    
+    def zoom_out(self, anchor: Tuple[int, int] = None):
+        """Уменьшить масштаб на один уровень"""
+        smaller = [level for level in self._zoom_levels if level < self._zoom]
+        if smaller:
+            self.set_zoom(smaller[-1], anchor)
+    
+    def pan(self, dx: int, dy: int):
+        """
+        Сдвинуть холст
+        
+        Args:
+            dx, dy: сдвиг в пикселях экрана
+        """
+        if dx == 0 and dy == 0:
+            return
+        
+        old_scroll = (self._scroll_x, self._scroll_y)
+        self._scroll_x += dx
+        self._scroll_y += dy
+        self._clamp_scroll()
+        
+        if (self._scroll_x, self._scroll_y) != old_scroll:
+            self._changed = True
+    
+    def reset(self):
+        """Вернуть холст в левый верхний угол области"""
+        self._scroll_x = 0
+        self._scroll_y = 0
+        self._changed = True
+    
+    def _clamp_scroll(self):
+        """Не дать увести холст целиком за пределы области просмотра"""
+        area_w, area_h = self._area[2], self._area[3]
+        canvas_w = self._grid_width * self._zoom
+        canvas_h = self._grid_height * self._zoom
+        
+        # Допускается сдвиг не больше чем на половину области за край холста
+        margin_x = area_w // 2
+        margin_y = area_h // 2
+        self._scroll_x = max(min(0, area_w - canvas_w) - margin_x,
+                             min(max(0, area_w - canvas_w) + margin_x, self._scroll_x))
+        self._scroll_y = max(min(0, area_h - canvas_h) - margin_y,
+                             min(max(0, area_h - canvas_h) + margin_y, self._scroll_y))
+    
+    def __repr__(self) -> str:
+        return f"Viewport(zoom={self._zoom}, origin={self.origin})"
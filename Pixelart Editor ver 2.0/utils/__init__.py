@@ -6,8 +6,11 @@
 
 Содержит вспомогательные функции и классы:
 - Vector2D: работа с 2D координатами
-- math_utils: математические функции (remap, clamp, lerp и др.)
+- math_utils: математические функции (remap, clamp, lerp, bresenham_line и др.)
 - file_utils: работа с файлами (save, load, export)
+- project_file: бинарный формат проекта (.pxp)
+- background_worker: фоновый поток для диалогов и работы с файлами
+- input_recording: запись ввода для воспроизведения сеанса (.pxr)
 """
 
 from .vector2d import Vector2D
@@ -17,7 +20,8 @@ from .math_utils import (
     lerp,
     normalize,
     distance,
-    sign
+    sign,
+    bresenham_line
 )
 from .file_utils import (
     save_grid_to_file,
@@ -27,6 +31,21 @@ from .file_utils import (
     save_file_dialog,
     get_filename_from_path
 )
+from .project_file import (
+    PROJECT_EXTENSION,
+    ProjectImage,
+    save_project_file,
+    load_project_file,
+    is_project_file
+)
+from .background_worker import BackgroundWorker, TaskResult
+from .input_recording import (
+    InputRecording,
+    RecordedEvent,
+    RecordedFrame,
+    save_recording,
+    load_recording
+)
 
 __all__ = [
     # Vector2D
@@ -39,6 +58,7 @@ __all__ = [
     'normalize',
     'distance',
     'sign',
+    'bresenham_line',
     
     # File utilities
     'save_grid_to_file',
@@ -47,6 +67,24 @@ __all__ = [
     'open_file_dialog',
     'save_file_dialog',
     'get_filename_from_path',
+    
+    # Project file format
+    'PROJECT_EXTENSION',
+    'ProjectImage',
+    'save_project_file',
+    'load_project_file',
+    'is_project_file',
+    
+    # Background tasks
+    'BackgroundWorker',
+    'TaskResult',
+    
+    # Input recording
+    'InputRecording',
+    'RecordedEvent',
+    'RecordedFrame',
+    'save_recording',
+    'load_recording',
 ]
 
 __version__ = '1.0.0'
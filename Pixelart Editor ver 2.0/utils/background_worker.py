@@ -0,0 +1,158 @@
+# ========================================
+# utils/background_worker.py
+# ========================================
+"""
+Фоновый поток для долгих операций (диалоги, чтение и запись файлов)
+
+Задачи выполняются по одной в порядке постановки, а результаты
+забираются главным циклом через очередь (poll), поэтому отрисовка
+не останавливается. Задача не должна трогать данные, с которыми
+работает главный поток, - ей передается готовый снимок
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, List, NamedTuple, Optional
+
+
+class TaskResult(NamedTuple):
+    """Результат фоновой задачи"""
+    name: str
+    value: Any
+    error: Optional[BaseException]
+    
+    @property
+    def ok(self) -> bool:
+        """Задача завершилась без исключения"""
+        return self.error is None
+
+
+class BackgroundWorker:
+    """
+    Один фоновый поток, выполняющий задачи по очереди
+    
+    Поток создается при первой задаче и завершается вместе
+    с программой (daemon) или вызовом shutdown()
+    """
+    
+    def __init__(self, name: str = "background-worker"):
+        """
+        Инициализация
+        
+        Args:
+            name: имя потока (для отладки)
+        """
+        self._name = name
+        self._tasks: 'queue.Queue' = queue.Queue()
+        self._results: 'queue.Queue[TaskResult]' = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        # Поставленные, но еще не забранные через poll() задачи
+        # (список меняет только главный поток)
+        self._pending: List[str] = []
+        self._started_at: Optional[float] = None
+    
+    @property
+    def busy(self) -> bool:
+        """Есть незавершенные или не забранные задачи"""
+        return bool(self._pending)
+    
+    @property
+    def current_task(self) -> Optional[str]:
+        """Имя самой ранней незавершенной задачи (None - очередь пуста)"""
+        return self._pending[0] if self._pending else None
+    
+    @property
+    def elapsed(self) -> float:
+        """Сколько секунд выполняется текущая задача (0 - очередь пуста)"""
+        if not self._pending or self._started_at is None:
+            return 0.0
+        return time.perf_counter() - self._started_at
+    
+    def submit(self, name: str, func: Callable[..., Any], *args, **kwargs):
+        """
+        Поставить задачу в очередь
+        
+        Args:
+            name: имя задачи (попадает в TaskResult)
+            func: функция, выполняемая в фоновом потоке
+            *args, **kwargs: ее аргументы
+        """
+        if not self._pending:
+            self._started_at = time.perf_counter()
+        self._pending.append(name)
+        self._tasks.put((name, func, args, kwargs))
+        
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+            self._thread.start()
+    
+    def poll(self) -> List[TaskResult]:
+        """
+        Забрать результаты завершенных задач (не блокирует)
+        
+        Returns:
+            Результаты в порядке завершения
+        """
+        results = []
+        while True:
+            try:
+                result = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._finish(result)
+            results.append(result)
+        return results
+    
+    def wait(self, timeout: Optional[float] = None) -> List[TaskResult]:
+        """
+        Дождаться завершения всех задач
+        
+        Args:
+            timeout: предельное время ожидания в секундах (None - без предела)
+        
+        Returns:
+            Результаты всех задач, завершившихся за время ожидания
+        """
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        results = []
+        while self._pending:
+            remaining = None if deadline is None else deadline - time.perf_counter()
+            if remaining is not None and remaining <= 0:
+                break
+            try:
+                result = self._results.get(timeout=remaining)
+            except queue.Empty:
+                break
+            self._finish(result)
+            results.append(result)
+        return results
+    
+    def shutdown(self):
+        """Остановить поток после уже поставленных задач"""
+        if self._thread is not None and self._thread.is_alive():
+            self._tasks.put(None)
+            self._thread.join()
+        self._thread = None
+    
+    def _finish(self, result: TaskResult):
+        """Учесть забранный результат"""
+        self._pending.remove(result.name)
+        self._started_at = time.perf_counter() if self._pending else None
+    
+    def _run(self):
+        """Цикл фонового потока"""
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                return
+            
+            name, func, args, kwargs = task
+            try:
+                result = TaskResult(name, func(*args, **kwargs), None)
+            except Exception as error:
+                result = TaskResult(name, None, error)
+            self._results.put(result)
+    
+    def __repr__(self) -> str:
+        return f"BackgroundWorker(pending={self._pending})"
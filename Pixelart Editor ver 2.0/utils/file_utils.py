@@ -1,12 +1,17 @@
 # ========================================
 # utils/file_utils.py
 # ========================================
-"""Утилиты для работы с файлами"""
+"""
+Утилиты для работы с файлами
 
-from typing import List, Tuple, Optional
-import pygame as pg
-from tkinter import Tk
-from tkinter.filedialog import askopenfilename, asksaveasfilename
+pygame и tkinter импортируются только внутри функций, которым они
+нужны: чтение и запись проектов работают без них
+"""
+
+from typing import List, Tuple, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pygame as pg
 
 
 def save_grid_to_file(grid_state: List[List[Tuple[int, int, int]]], 
@@ -89,33 +94,36 @@ def load_grid_from_file(filepath: str,
         return None
 
 
-def export_to_png(screen: pg.Surface, 
-                  region: Tuple[int, int, int, int],
-                  filepath: str) -> bool:
+def export_to_png(image: 'pg.Surface', filepath: str, scale: int = 1) -> bool:
     """
-    Экспортировать область экрана в PNG файл
+    Экспортировать изображение холста в PNG файл
+    
+    Увеличение выполняется целиком одним вызовом pg.transform.scale
+    (ближайший сосед - пиксели остаются четкими). Экран не нужен,
+    работает и без окна
     
     Args:
-        screen: поверхность Pygame
-        region: (x, y, width, height) область для экспорта
+        image: изображение холста в исходном разрешении (1 ячейка = 1 пиксель)
         filepath: путь для сохранения
+        scale: целый масштаб (пикселей PNG на ячейку)
     
     Returns:
         True если успешно экспортировано
     """
+    import pygame as pg
+    
     try:
         # Добавляем расширение если его нет
         if not filepath.endswith('.png'):
             filepath = filepath + '.png'
         
-        x, y, width, height = region
-        
-        # Создаем surface для экспорта
-        export_surface = pg.Surface((width, height))
-        export_surface.blit(screen, (0, 0), region)
+        scale = max(1, int(scale))
+        if scale > 1:
+            width, height = image.get_size()
+            image = pg.transform.scale(image, (width * scale, height * scale))
         
         # Сохраняем
-        pg.image.save(export_surface, filepath)
+        pg.image.save(image, filepath)
         
         return True
     except Exception as e:
@@ -139,6 +147,9 @@ def open_file_dialog(file_types: List[Tuple[str, str]] = None) -> Optional[str]:
     if file_types is None:
         file_types = [("Text files", "*.txt")]
     
+    from tkinter import Tk
+    from tkinter.filedialog import askopenfilename
+    
     window = Tk()
     window.withdraw()  # Скрываем основное окно
     
@@ -168,6 +179,9 @@ def save_file_dialog(file_types: List[Tuple[str, str]] = None) -> Optional[str]:
     if file_types is None:
         file_types = [("Text files", "*.txt")]
     
+    from tkinter import Tk
+    from tkinter.filedialog import asksaveasfilename
+    
     window = Tk()
     window.withdraw()
     
@@ -0,0 +1,193 @@
+# ========================================
+# utils/input_recording.py
+# ========================================
+"""
+Запись ввода (.pxr) для точного воспроизведения сеанса
+
+Записываются кадры главного цикла: время, положение мыши и события
+ввода кадра. Воспроизведение подает те же события в те же кадры,
+поэтому холст получается тем же, что и при записи
+
+Структура файла (все числа little-endian):
+    Заголовок (20 байт):
+        magic        4s   b'PXRC'
+        version      B    версия формата
+        reserved     3x
+        width        I    ширина сетки при записи
+        height       I    высота сетки при записи
+        frame_count  I    число кадров
+    Данные (сжаты zlib), для каждого кадра:
+        time         I    время кадра в миллисекундах
+        mouse_x      i    положение мыши
+        mouse_y      i
+        event_count  H    число событий
+        события: kind (B) и четыре поля a, b, c, d (i)
+
+Модуль не зависит от pygame: события хранятся в собственной
+кодировке (EVENT_*), преобразование - в controllers.input_controller
+"""
+
+import struct
+import zlib
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+
+# Сигнатура и версия формата
+RECORDING_MAGIC = b'PXRC'
+RECORDING_VERSION = 1
+RECORDING_EXTENSION = '.pxr'
+
+# Виды событий и значения полей a, b, c, d
+EVENT_QUIT = 0          # -
+EVENT_MOUSE_DOWN = 1    # x, y, кнопка
+EVENT_MOUSE_UP = 2      # x, y, кнопка
+EVENT_MOUSE_MOTION = 3  # x, y, смещение по x, смещение по y
+EVENT_MOUSE_WHEEL = 4   # прокрутка по x, по y
+EVENT_KEY_DOWN = 5      # клавиша, модификаторы
+EVENT_KEY_UP = 6        # клавиша, модификаторы
+
+_HEADER = struct.Struct('<4sB3xIII')
+_FRAME = struct.Struct('<IiiH')
+_EVENT = struct.Struct('<Biiii')
+
+
+class RecordedEvent(NamedTuple):
+    """Событие ввода (значения полей зависят от вида, см. EVENT_*)"""
+    kind: int
+    a: int = 0
+    b: int = 0
+    c: int = 0
+    d: int = 0
+
+
+class RecordedFrame(NamedTuple):
+    """
+    Кадр записи
+    
+    Attributes:
+        time: время кадра в миллисекундах от запуска
+        mouse_pos: положение мыши
+        events: события кадра по порядку
+    """
+    time: int
+    mouse_pos: Tuple[int, int]
+    events: Tuple[RecordedEvent, ...]
+
+
+class InputRecording:
+    """Последовательность кадров ввода"""
+    
+    def __init__(self, grid_width: int, grid_height: int,
+                 frames: Optional[List[RecordedFrame]] = None):
+        """
+        Инициализация записи
+        
+        Args:
+            grid_width, grid_height: размеры сетки при записи
+            frames: готовые кадры (при загрузке)
+        """
+        self._grid_size = (grid_width, grid_height)
+        self._frames: List[RecordedFrame] = frames if frames is not None else []
+    
+    @property
+    def grid_size(self) -> Tuple[int, int]:
+        """Размеры сетки при записи"""
+        return self._grid_size
+    
+    @property
+    def frames(self) -> List[RecordedFrame]:
+        """Кадры записи"""
+        return self._frames
+    
+    @property
+    def event_count(self) -> int:
+        """Всего событий во всех кадрах"""
+        return sum(len(frame.events) for frame in self._frames)
+    
+    def add_frame(self, time: int, mouse_pos: Tuple[int, int], events: Iterable[RecordedEvent]):
+        """
+        Добавить кадр
+        
+        Args:
+            time: время кадра в миллисекундах
+            mouse_pos: положение мыши
+            events: события кадра
+        """
+        self._frames.append(RecordedFrame(time, tuple(mouse_pos), tuple(events)))
+    
+    def __len__(self) -> int:
+        return len(self._frames)
+    
+    def __repr__(self) -> str:
+        return f"InputRecording(frames={len(self._frames)}, grid={self._grid_size})"
+
+
+def save_recording(recording: InputRecording, filepath: str) -> bool:
+    """
+    Сохранить запись ввода
+    
+    Args:
+        recording: запись
+        filepath: путь к файлу (расширение .pxr добавляется при отсутствии)
+    
+    Returns:
+        True если успешно сохранено
+    """
+    try:
+        if not filepath.endswith(RECORDING_EXTENSION):
+            filepath = filepath + RECORDING_EXTENSION
+        
+        chunks = []
+        for frame in recording.frames:
+            chunks.append(_FRAME.pack(frame.time, frame.mouse_pos[0], frame.mouse_pos[1],
+                                      len(frame.events)))
+            chunks.extend(_EVENT.pack(*event) for event in frame.events)
+        
+        width, height = recording.grid_size
+        with open(filepath, 'wb') as file:
+            file.write(_HEADER.pack(RECORDING_MAGIC, RECORDING_VERSION, width, height,
+                                    len(recording.frames)))
+            file.write(zlib.compress(b''.join(chunks)))
+        return True
+    except Exception as e:
+        print(f"Ошибка сохранения записи: {e}")
+        return False
+
+
+def load_recording(filepath: str) -> Optional[InputRecording]:
+    """
+    Загрузить запись ввода
+    
+    Args:
+        filepath: путь к файлу
+    
+    Returns:
+        Запись или None при ошибке
+    """
+    try:
+        with open(filepath, 'rb') as file:
+            data = file.read()
+        
+        magic, version, width, height, frame_count = _HEADER.unpack_from(data, 0)
+        if magic != RECORDING_MAGIC:
+            raise ValueError("файл не является записью ввода Pixelart Editor")
+        if version > RECORDING_VERSION:
+            raise ValueError(f"неподдерживаемая версия формата: {version}")
+        
+        body = zlib.decompress(data[_HEADER.size:])
+        frames = []
+        offset = 0
+        for _ in range(frame_count):
+            time, mouse_x, mouse_y, event_count = _FRAME.unpack_from(body, offset)
+            offset += _FRAME.size
+            events = tuple(RecordedEvent(*fields) for fields in
+                           _EVENT.iter_unpack(body[offset:offset + event_count * _EVENT.size]))
+            offset += event_count * _EVENT.size
+            frames.append(RecordedFrame(time, (mouse_x, mouse_y), events))
+        
+        if offset != len(body):
+            raise ValueError("размер данных не совпадает с заголовком")
+        return InputRecording(width, height, frames)
+    except Exception as e:
+        print(f"Ошибка загрузки записи: {e}")
+        return None
@@ -3,7 +3,7 @@
 # ========================================
 """Математические утилиты"""
 
-from typing import Union
+from typing import Iterator, Tuple, Union
 
 
 def remap(value: float, 
@@ -148,4 +148,41 @@ def sign(value: float) -> int:
         return 1
     elif value < 0:
         return -1
-    return 0
\ No newline at end of file
+    return 0
+
+
+def bresenham_line(x0: int, y0: int, x1: int, y1: int) -> Iterator[Tuple[int, int]]:
+    """
+    Получить ячейки отрезка (алгоритм Брезенхэма)
+    
+    Соседние ячейки отрезка соприкасаются стороной или углом,
+    поэтому линия получается без разрывов
+    
+    Args:
+        x0, y0: начальная ячейка
+        x1, y1: конечная ячейка
+    
+    Returns:
+        Итератор ячеек (x, y) от начальной до конечной включительно
+    
+    Example:
+        >>> list(bresenham_line(0, 0, 3, 1))
+        [(0, 0), (1, 0), (2, 1), (3, 1)]
+    """
+    dx = abs(x1 - x0)
+    dy = -abs(y1 - y0)
+    step_x = 1 if x0 < x1 else -1
+    step_y = 1 if y0 < y1 else -1
+    error = dx + dy
+    
+    while True:
+        yield x0, y0
+        if x0 == x1 and y0 == y1:
+            return
+        doubled = 2 * error
+        if doubled >= dy:
+            error += dy
+            x0 += step_x
+        if doubled <= dx:
+            error += dx
+            y0 += step_y
@@ -0,0 +1,297 @@
+# ========================================
+# utils/project_file.py
+# ========================================
+"""
+Бинарный формат проекта (.pxp)
+
+Структура файла (все числа little-endian):
+    Заголовок (24 байта):
+        magic        4s   b'PXPJ'
+        version      B    версия формата
+        encoding     B    0 - цвета 0xRRGGBB (uint32), 1 - индексы палитры (uint8)
+        compression  B    0 - без сжатия, 1 - zlib
+        reserved     B
+        width        I    ширина в ячейках
+        height       I    высота в ячейках
+        palette_size I    количество цветов палитры
+        tile_size    I    0 - сплошной буфер, иначе размер тайла
+    Палитра: palette_size * uint32 (0xRRGGBB)
+    Данные:
+        tile_size == 0: один блок со всеми ячейками (по строкам)
+        tile_size > 0:  tile_count (uint32), затем для каждого тайла
+                        tile_x, tile_y, длина блока (uint32) и блок
+
+Блок - ячейки в выбранной кодировке, сжатые выбранным методом.
+Загрузка: одно чтение файла, распаковка блока и копирование в массив;
+индексы палитры разворачиваются в цвета побайтовыми таблицами
+(bytes.translate), без обращения к палитре на каждую ячейку.
+Сохранение с палитрой ищет индекс каждой ячейки в словаре
+"""
+
+import struct
+import sys
+import zlib
+from array import array
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+# Сигнатура и версия формата
+PROJECT_MAGIC = b'PXPJ'
+PROJECT_VERSION = 1
+PROJECT_EXTENSION = '.pxp'
+
+# Кодировки ячеек
+ENCODING_RGB = 0
+ENCODING_INDEXED = 1
+
+# Методы сжатия
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+
+# Палитра используется, если различных цветов не больше
+MAX_PALETTE_SIZE = 256
+
+_HEADER = struct.Struct('<4sBBBBIIII')
+_TILE_HEADER = struct.Struct('<III')
+
+# Тип массива цветов (совпадает с PIXEL_TYPECODE сетки)
+_PIXEL_TYPECODE = 'I'
+_SWAP_BYTES = sys.byteorder != 'little'
+
+# Координаты тайла (tile_x, tile_y)
+TileKey = Tuple[int, int]
+
+
+class ProjectImage(NamedTuple):
+    """
+    Содержимое файла проекта
+    
+    Attributes:
+        width, height: размеры в ячейках
+        pixels: плоский буфер цветов 0xRRGGBB (для сплошного файла)
+        tiles: тайлы {(tile_x, tile_y): цвета} (для файла из тайлов)
+        tile_size: размер тайла (0 для сплошного файла)
+    """
+    width: int
+    height: int
+    pixels: Optional[array] = None
+    tiles: Optional[Dict[TileKey, array]] = None
+    tile_size: int = 0
+    
+    def to_pixels(self, width: int, height: int, background: int) -> array:
+        """
+        Получить плоский буфер заданного размера
+        
+        Лишние ячейки обрезаются, недостающие заполняются фоном
+        
+        Args:
+            width, height: размеры сетки
+            background: упакованный цвет фона
+        
+        Returns:
+            Массив из width * height цветов
+        """
+        if self.tiles is None and (width, height) == (self.width, self.height):
+            return array(_PIXEL_TYPECODE, self.pixels)
+        
+        result = array(_PIXEL_TYPECODE, [background]) * (width * height)
+        copy_width = min(width, self.width)
+        
+        if self.tiles is None:
+            for y in range(min(height, self.height)):
+                source = y * self.width
+                target = y * width
+                result[target:target + copy_width] = self.pixels[source:source + copy_width]
+            return result
+        
+        size = self.tile_size
+        for (tile_x, tile_y), tile in self.tiles.items():
+            left = tile_x * size
+            count = min(size, copy_width - left)
+            if count <= 0:
+                continue
+            for row in range(min(size, height - tile_y * size, self.height - tile_y * size)):
+                target = (tile_y * size + row) * width + left
+                result[target:target + count] = tile[row * size:row * size + count]
+        return result
+
+
+def save_project_file(filepath: str, width: int, height: int,
+                      pixels: Optional[array] = None,
+                      tiles: Optional[Dict[TileKey, array]] = None,
+                      tile_size: int = 0, compress: bool = True) -> bool:
+    """
+    Сохранить проект в бинарный файл
+    
+    Args:
+        filepath: путь к файлу (расширение .pxp добавляется при отсутствии)
+        width, height: размеры в ячейках
+        pixels: плоский буфер цветов 0xRRGGBB по строкам
+        tiles: тайлы {(tile_x, tile_y): цвета} вместо pixels
+        tile_size: размер тайла (обязателен вместе с tiles)
+        compress: сжимать данные zlib
+    
+    Returns:
+        True если успешно сохранено
+    """
+    try:
+        if not filepath.endswith(PROJECT_EXTENSION):
+            filepath = filepath + PROJECT_EXTENSION
+        
+        chunks = list(tiles.values()) if tiles is not None else [pixels]
+        palette = _build_palette(chunks)
+        encoding = ENCODING_INDEXED if palette is not None else ENCODING_RGB
+        compression = COMPRESSION_ZLIB if compress else COMPRESSION_NONE
+        
+        with open(filepath, 'wb') as file:
+            file.write(_HEADER.pack(PROJECT_MAGIC, PROJECT_VERSION, encoding, compression, 0,
+                                    width, height, len(palette or ()),
+                                    tile_size if tiles is not None else 0))
+            if palette is not None:
+                file.write(_to_bytes(array(_PIXEL_TYPECODE, palette)))
+            
+            if tiles is None:
+                file.write(_encode_block(pixels, palette, compression))
+            else:
+                file.write(struct.pack('<I', len(tiles)))
+                for (tile_x, tile_y), tile in sorted(tiles.items(), key=lambda item: (item[0][1], item[0][0])):
+                    block = _encode_block(tile, palette, compression)
+                    file.write(_TILE_HEADER.pack(tile_x, tile_y, len(block)))
+                    file.write(block)
+        
+        return True
+    except Exception as e:
+        print(f"Ошибка сохранения файла: {e}")
+        return False
+
+
+def load_project_file(filepath: str) -> Optional[ProjectImage]:
+    """
+    Загрузить проект из бинарного файла
+    
+    Args:
+        filepath: путь к файлу
+    
+    Returns:
+        Содержимое проекта или None при ошибке
+    """
+    try:
+        with open(filepath, 'rb') as file:
+            data = file.read()
+        
+        (magic, version, encoding, compression, _,
+         width, height, palette_size, tile_size) = _HEADER.unpack_from(data, 0)
+        if magic != PROJECT_MAGIC:
+            raise ValueError("файл не является проектом Pixelart Editor")
+        if version > PROJECT_VERSION:
+            raise ValueError(f"неподдерживаемая версия формата: {version}")
+        
+        offset = _HEADER.size
+        palette = None
+        if palette_size:
+            palette = _from_bytes(data[offset:offset + palette_size * 4])
+            offset += palette_size * 4
+        
+        if tile_size == 0:
+            pixels = _decode_block(data[offset:], encoding, compression, palette)
+            if len(pixels) != width * height:
+                raise ValueError("размер данных не совпадает с заголовком")
+            return ProjectImage(width, height, pixels=pixels)
+        
+        tiles: Dict[TileKey, array] = {}
+        (tile_count,) = struct.unpack_from('<I', data, offset)
+        offset += 4
+        for _ in range(tile_count):
+            tile_x, tile_y, length = _TILE_HEADER.unpack_from(data, offset)
+            offset += _TILE_HEADER.size
+            tile = _decode_block(data[offset:offset + length], encoding, compression, palette)
+            if len(tile) != tile_size * tile_size:
+                raise ValueError("размер тайла не совпадает с заголовком")
+            tiles[(tile_x, tile_y)] = tile
+            offset += length
+        return ProjectImage(width, height, tiles=tiles, tile_size=tile_size)
+    except Exception as e:
+        print(f"Ошибка загрузки файла: {e}")
+        return None
+
+
+def is_project_file(filepath: str) -> bool:
+    """Проверить сигнатуру бинарного файла проекта"""
+    try:
+        with open(filepath, 'rb') as file:
+            return file.read(len(PROJECT_MAGIC)) == PROJECT_MAGIC
+    except OSError:
+        return False
+
+
+def _build_palette(chunks: Iterable[array]) -> Optional[List[int]]:
+    """Собрать палитру, если различных цветов не больше MAX_PALETTE_SIZE"""
+    colors = set()
+    for chunk in chunks:
+        colors.update(chunk)
+        if len(colors) > MAX_PALETTE_SIZE:
+            return None
+    return sorted(colors)
+
+
+def _encode_block(pixels: array, palette: Optional[List[int]], compression: int) -> bytes:
+    """Закодировать ячейки (цвета или индексы палитры) и сжать"""
+    if palette is not None:
+        index = {color: i for i, color in enumerate(palette)}
+        raw = bytes(map(index.__getitem__, pixels))
+    else:
+        raw = _to_bytes(pixels)
+    
+    if compression == COMPRESSION_ZLIB:
+        return zlib.compress(raw)
+    return raw
+
+
+def _decode_block(block: bytes, encoding: int, compression: int,
+                  palette: Optional[array]) -> array:
+    """Распаковать блок в массив цветов"""
+    if compression == COMPRESSION_ZLIB:
+        block = zlib.decompress(block)
+    elif compression != COMPRESSION_NONE:
+        raise ValueError(f"неизвестный метод сжатия: {compression}")
+    
+    if encoding == ENCODING_RGB:
+        return _from_bytes(block)
+    if encoding == ENCODING_INDEXED:
+        return _expand_indices(block, palette)
+    raise ValueError(f"неизвестная кодировка: {encoding}")
+
+
+def _expand_indices(block: bytes, palette: Optional[array]) -> array:
+    """
+    Развернуть индексы палитры в цвета
+    
+    Каждый байт цвета (little-endian) получается отдельной таблицей
+    bytes.translate и раскладывается в буфер через шаг 4
+    """
+    if block and (palette is None or max(block) >= len(palette)):
+        raise ValueError("индекс вне палитры")
+    
+    data = bytearray(len(block) * 4)
+    for shift in range(4):
+        table = bytes((color >> (shift * 8)) & 0xFF for color in palette or ())
+        if any(table):
+            data[shift::4] = block.translate(table.ljust(256, b'\0'))
+    return _from_bytes(data)
+
+
+def _to_bytes(pixels: array) -> bytes:
+    """Массив цветов в байты little-endian"""
+    if _SWAP_BYTES:
+        pixels = array(_PIXEL_TYPECODE, pixels)
+        pixels.byteswap()
+    return pixels.tobytes()
+
+
+def _from_bytes(data: bytes) -> array:
+    """Байты little-endian в массив цветов"""
+    pixels = array(_PIXEL_TYPECODE)
+    pixels.frombytes(data)
+    if _SWAP_BYTES:
+        pixels.byteswap()
+    return pixels